@@ -0,0 +1,230 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from starlette.datastructures import MutableHeaders
+from observability.diagnostics import timed_phase
+from observability.metrics import REGISTRY, MetricsRegistry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+# Server-sent events must reach the client frame by frame; a compressor
+# would hold them back between flushes and proxies may buffer encoded streams.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+# gzip 4 from benchmarks/compression.py: about 8x on list pages at half the
+# CPU of level 6, which saves only 5% more. brotli 4 and zstd 3 are the
+# usual on-the-fly levels for those codecs.
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 4}
+
+
+class Compressor(ABC):
+    """Incremental compressor: ``flush`` ends a chunk, ``finish`` ends the stream."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        pass
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        pass
+
+
+class GzipCompressor(Compressor):
+    def __init__(self, level: int):
+        # wbits 16 + 15 writes the gzip header and trailer.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(Compressor):
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor(Compressor):
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Content-coding -> compressor factory, for the codecs importable here.
+CODECS: Dict[str, Callable[[int], Compressor]] = {"gzip": GzipCompressor}
+if brotli is not None:
+    CODECS["br"] = BrotliCompressor
+if zstandard is not None:
+    CODECS["zstd"] = ZstdCompressor
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def negotiate(accept_encoding: str, codecs: Sequence[str]) -> Optional[str]:
+    """Pick the client's most preferred coding among ``codecs``; ties go to ``codecs`` order."""
+    weights = _parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    best: Optional[Tuple[float, int]] = None
+    chosen = None
+    for rank, codec in enumerate(codecs):
+        weight = weights.get(codec, wildcard)
+        if weight > 0 and (best is None or (weight, -rank) > best):
+            best, chosen = (weight, -rank), codec
+    return chosen
+
+
+class CompressionMiddleware:
+    """Pure ASGI response compression negotiated from ``Accept-Encoding``.
+
+    Codecs are tried in ``codecs`` order (zstd, brotli and gzip by default;
+    brotli and zstd only when their packages are installed). Only JSON,
+    NDJSON and text bodies are compressed. A response sent in one piece is
+    compressed only when it is at least ``minimum_size`` bytes. Streaming
+    responses, such as the exports, are compressed chunk by chunk: every
+    chunk is flushed, so the client receives data as the server produces it.
+    ETags are left alone because they version the document, not its bytes;
+    ``Vary: Accept-Encoding`` keeps shared caches apart.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        minimum_size: int = 1024,
+        codecs: Sequence[str] = ("zstd", "br", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+        registry: MetricsRegistry = REGISTRY
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = [codec for codec in codecs if codec in CODECS]
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+        self.input_bytes = registry.counter(
+            "http_compression_input_bytes_total", "Response bytes before compression.", ("codec",)
+        )
+        self.output_bytes = registry.counter(
+            "http_compression_output_bytes_total", "Response bytes after compression.", ("codec",)
+        )
+
+    def _accept_encoding(self, scope: Dict[str, Any]) -> str:
+        return ",".join(value.decode("latin-1") for name, value in scope["headers"] if name == b"accept-encoding")
+
+    def _compressible(self, start: Dict[str, Any], body: bytes, more_body: bool) -> bool:
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        headers = MutableHeaders(raw=start["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES) or content_type.startswith(UNCOMPRESSED_TYPES):
+            return False
+        return more_body or len(body) >= self.minimum_size
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not self.codecs:
+            await self.app(scope, receive, send)
+            return
+        codec = negotiate(self._accept_encoding(scope), self.codecs)
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Dict[str, Any]] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+        sizes: List[int] = [0, 0]
+
+        async def send_compressed(message: Dict[str, Any]) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress.
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not self._compressible(start, body, more_body):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = CODECS[codec](self.levels[codec])
+                headers = MutableHeaders(raw=list(start["headers"]))
+                del headers["content-length"]
+                headers["content-encoding"] = codec
+                headers.add_vary_header("Accept-Encoding")
+                with timed_phase("compress"):
+                    data = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+                if not more_body:
+                    headers["content-length"] = str(len(data))
+                await send({**start, "headers": headers.raw})
+            else:
+                with timed_phase("compress"):
+                    data = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            sizes[0] += len(body)
+            sizes[1] += len(data)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        try:
+            await self.app(scope, receive, send_compressed)
+        finally:
+            if compressor is not None:
+                self.input_bytes.labels(codec).inc(sizes[0])
+                self.output_bytes.labels(codec).inc(sizes[1])
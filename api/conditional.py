@@ -0,0 +1,99 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Union
+from fastapi import Request, Response
+from api.responses import entity_response
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def entity_etag(id: int, updated_at: datetime) -> str:
+    # Strong and reversible: If-Match can be turned back into the exact
+    # updated_at value for a conditional UPDATE.
+    return f'"{id}-{(_as_utc(updated_at) - EPOCH) // _MICROSECOND}"'
+
+
+def collection_etag(table: str, version: Union[int, str], request: Request) -> str:
+    # The same table version yields different pages for different queries.
+    query = hashlib.blake2s(request.url.query.encode(), digest_size=8).hexdigest()
+    return f'"{table}-{version}-{query}"'
+
+
+def _parse_etags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def entity_headers(entity: Any) -> Dict[str, str]:
+    return validator_headers(entity_etag(entity.id, entity.updated_at), entity.updated_at)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match uses weak comparison and takes precedence over
+        # If-Modified-Since (RFC 9110, 13.2.2).
+        tags = _parse_etags(if_none_match)
+        return "*" in tags or etag in {_opaque(tag) for tag in tags}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def expected_versions(request: Request, id: int) -> Optional[List[datetime]]:
+    """Translate ``If-Match`` into the ``updated_at`` values a write may replace.
+
+    Returns ``None`` when the request is unconditional (no header or ``*``).
+    Tags that are weak, malformed or belong to another id never match, so
+    an empty list means the precondition cannot succeed.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return None
+    tags = _parse_etags(if_match)
+    if "*" in tags:
+        return None
+
+    versions = []
+    for tag in tags:
+        if not (tag.startswith('"') and tag.endswith('"')):
+            continue
+        tag_id, _, micros = tag[1:-1].partition("-")
+        if tag_id == str(id) and micros.isdigit():
+            versions.append(EPOCH + int(micros) * _MICROSECOND)
+    return versions
+
+
+def conditional_entity(request: Request, entity: Any) -> Response:
+    headers = entity_headers(entity)
+    if is_not_modified(request, headers["ETag"], entity.updated_at):
+        return Response(status_code=304, headers=headers)
+    return entity_response(entity, headers=headers)
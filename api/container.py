@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from repositories.async_repository import AsyncChangeRepository, AsyncSearchRepository
+from repositories.connection_pool import ConnectionPool
+from repositories.cached_repository import CachedRepository
+from repositories.sqlite_settings import StorageSettings
+from repositories.organisation_repository import OrganisationRepository
+from repositories.employee_repository import EmployeeRepository
+from repositories.search_repository import SearchRepository
+from repositories.change_repository import ChangeRepository
+from services.organisation_service import OrganisationService
+from services.employee_service import EmployeeService
+from services.async_organisation_service import AsyncOrganisationService
+from services.async_employee_service import AsyncEmployeeService
+from services.async_search_service import AsyncSearchService
+from services.async_change_service import AsyncChangeService
+from services.events import EventBus, PublishingRepository
+
+
+class ServiceContainer:
+    """Application-scoped repositories and services.
+
+    Built once per process (normally from the FastAPI lifespan in
+    ``main.py``), so the schema bootstrap in the repository constructors runs
+    a single time and every request shares the same instances.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 5,
+        pool_timeout: float = 30.0,
+        settings: Optional[StorageSettings] = None,
+        serialize_writes: bool = True,
+        cache_enabled: bool = False,
+        cache_max_entries: int = 1024,
+        cache_ttl_seconds: float = 30.0,
+        metrics_enabled: bool = False,
+        slow_query_ms: Optional[float] = None,
+        events_queue_size: int = 1000,
+        events_max_subscribers: int = 100
+    ):
+        self.pool = ConnectionPool(
+            db_path,
+            size=pool_size,
+            timeout=pool_timeout,
+            settings=settings,
+            serialize_writes=serialize_writes,
+            instrumented=metrics_enabled,
+            slow_query_seconds=slow_query_ms / 1000 if slow_query_ms is not None else None
+        )
+        self.organisation_repository = OrganisationRepository(db_path, pool=self.pool)
+        self.employee_repository = EmployeeRepository(db_path, pool=self.pool)
+        self.search_repository = SearchRepository(db_path, pool=self.pool)
+        self.change_repository = ChangeRepository(db_path, pool=self.pool)
+        if cache_enabled:
+            self.organisation_repository = CachedRepository(
+                self.organisation_repository, cache_max_entries, cache_ttl_seconds
+            )
+            self.employee_repository = CachedRepository(
+                self.employee_repository, cache_max_entries, cache_ttl_seconds
+            )
+        self.event_bus = EventBus(events_queue_size, events_max_subscribers)
+        # Both the sync and the async services write through these, so each
+        # write is published exactly once.
+        organisations = PublishingRepository(self.organisation_repository, self.event_bus, 'organisation')
+        employees = PublishingRepository(
+            self.employee_repository, self.event_bus, 'employee', self.employee_repository.organisation_ids
+        )
+        self.organisation_service = OrganisationService(organisations)
+        self.employee_service = EmployeeService(employees)
+        # One worker per pooled connection: async routes never queue on the
+        # pool, only on this executor.
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sqlite")
+        self.async_organisation_service = AsyncOrganisationService(self.organisation_service, self.executor)
+        self.async_employee_service = AsyncEmployeeService(self.employee_service, self.executor)
+        self.async_search_service = AsyncSearchService(
+            AsyncSearchRepository(self.search_repository, self.executor)
+        )
+        self.async_change_service = AsyncChangeService(
+            AsyncChangeRepository(self.change_repository, self.executor)
+        )
+
+    def close(self) -> None:
+        self.event_bus.close()
+        self.executor.shutdown(wait=True)
+        self.pool.close()
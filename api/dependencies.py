@@ -1,14 +1,100 @@
-from repositories.organisation_repository import OrganisationRepository
-from repositories.employee_repository import EmployeeRepository
+import threading
+from typing import Optional
+from repositories.connection_pool import ConnectionPool
 from services.organisation_service import OrganisationService
 from services.employee_service import EmployeeService
+from services.async_organisation_service import AsyncOrganisationService
+from services.async_employee_service import AsyncEmployeeService
+from services.async_search_service import AsyncSearchService
+from services.async_change_service import AsyncChangeService
+from services.events import EventBus
+from repositories.sqlite_settings import StorageSettings
+from api.config import (
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_SERIALIZE_WRITES,
+    DB_JOURNAL_MODE,
+    DB_SYNCHRONOUS,
+    DB_CACHE_SIZE,
+    DB_MMAP_SIZE,
+    DB_BUSY_TIMEOUT_MS,
+    DB_TEMP_STORE,
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    METRICS_ENABLED,
+    SLOW_QUERY_MS,
+    EVENTS_QUEUE_SIZE,
+    EVENTS_MAX_SUBSCRIBERS,
+)
+from api.container import ServiceContainer
 
-DB_PATH = "organisations.db"
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+def init_container() -> ServiceContainer:
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = ServiceContainer(
+                DB_PATH,
+                pool_size=DB_POOL_SIZE,
+                pool_timeout=DB_POOL_TIMEOUT,
+                settings=StorageSettings(
+                    journal_mode=DB_JOURNAL_MODE,
+                    synchronous=DB_SYNCHRONOUS,
+                    cache_size=DB_CACHE_SIZE,
+                    mmap_size=DB_MMAP_SIZE,
+                    busy_timeout=DB_BUSY_TIMEOUT_MS,
+                    temp_store=DB_TEMP_STORE
+                ),
+                serialize_writes=DB_SERIALIZE_WRITES,
+                cache_enabled=CACHE_ENABLED,
+                cache_max_entries=CACHE_MAX_ENTRIES,
+                cache_ttl_seconds=CACHE_TTL_SECONDS,
+                metrics_enabled=METRICS_ENABLED,
+                slow_query_ms=SLOW_QUERY_MS,
+                events_queue_size=EVENTS_QUEUE_SIZE,
+                events_max_subscribers=EVENTS_MAX_SUBSCRIBERS
+            )
+        return _container
+
+def close_container() -> None:
+    global _container
+    with _container_lock:
+        if _container is not None:
+            _container.close()
+            _container = None
+
+def get_container() -> ServiceContainer:
+    container = _container
+    if container is None:
+        container = init_container()
+    return container
+
+def get_connection_pool() -> ConnectionPool:
+    return get_container().pool
 
 def get_organisation_service() -> OrganisationService:
-    repository = OrganisationRepository(DB_PATH)
-    return OrganisationService(repository)
+    return get_container().organisation_service
 
 def get_employee_service() -> EmployeeService:
-    repository = EmployeeRepository(DB_PATH)
-    return EmployeeService(repository)
+    return get_container().employee_service
+
+# Declared async so FastAPI resolves them on the event loop instead of
+# spending a thread-pool hop on an attribute lookup.
+async def get_async_organisation_service() -> AsyncOrganisationService:
+    return get_container().async_organisation_service
+
+async def get_async_employee_service() -> AsyncEmployeeService:
+    return get_container().async_employee_service
+
+async def get_async_search_service() -> AsyncSearchService:
+    return get_container().async_search_service
+
+async def get_async_change_service() -> AsyncChangeService:
+    return get_container().async_change_service
+
+async def get_event_bus() -> EventBus:
+    return get_container().event_bus
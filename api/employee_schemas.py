@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
+from api.schemas import BulkResultResponse
 
 class EmployeeBase(BaseModel):
     name: str
@@ -27,3 +28,41 @@ class EmployeeResponse(EmployeeBase):
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
+
+class RangeCount(BaseModel):
+    start: int
+    end: int
+    count: int
+
+class AgeStats(BaseModel):
+    min: Optional[int] = None
+    max: Optional[int] = None
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    histogram: List[RangeCount]
+
+class LocationCount(BaseModel):
+    location: str
+    count: int
+
+class OrganisationHeadcount(BaseModel):
+    organisation_id: int
+    count: int
+
+class EmployeeStatsResponse(BaseModel):
+    count: int
+    age: AgeStats
+    birth_cohorts: List[RangeCount]
+    by_location: List[LocationCount]
+    by_organisation: List[OrganisationHeadcount]
+
+class EmployeeBulkUpdate(EmployeeUpdate):
+    id: int
+
+class EmployeeBulkRequest(BaseModel):
+    create: List[EmployeeCreate] = Field(default_factory=list)
+    update: List[EmployeeBulkUpdate] = Field(default_factory=list)
+
+class EmployeeBulkResponse(BaseModel):
+    create: BulkResultResponse
+    update: BulkResultResponse
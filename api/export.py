@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, Iterable, Iterator, List, Sequence
+from fastapi.responses import StreamingResponse
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def ndjson_chunks(batches: Iterable[List[Any]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(json.dumps(item.to_dict()) + "\n" for item in batch)
+
+
+def csv_chunks(batches: Iterable[List[Any]], fieldnames: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for batch in batches:
+        for item in batch:
+            row = item.to_dict()
+            for name, value in row.items():
+                if isinstance(value, list):
+                    row[name] = json.dumps(value)
+            writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    batches: Iterable[List[Any]],
+    export_format: ExportFormat,
+    fieldnames: Sequence[str],
+    filename: str
+) -> StreamingResponse:
+    if export_format == ExportFormat.csv:
+        body = csv_chunks(batches, fieldnames)
+    else:
+        body = ndjson_chunks(batches)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response
+from api.responses import json_array_response
+
+NEXT_CURSOR_HEADER = "X-Next-After-Id"
+NEXT_OFFSET_HEADER = "X-Next-Offset"
+NEXT_SINCE_HEADER = "X-Next-Since"
+
+
+def _parse_names(value: Optional[str], allowed: Sequence[str], parameter: str) -> Optional[List[str]]:
+    if value is None:
+        return None
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {parameter} parameter; allowed {parameter} are: {', '.join(allowed)}"
+        )
+    return requested
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    return _parse_names(fields, allowed, "fields")
+
+
+def parse_include(include: Optional[str], allowed: Sequence[str]) -> List[str]:
+    return _parse_names(include, allowed, "include") or []
+
+
+def parse_types(types: Optional[str], allowed: Sequence[str]) -> List[str]:
+    return _parse_names(types, allowed, "type") or list(allowed)
+
+
+def parse_ids(ids: Optional[str], max_count: int) -> Optional[List[int]]:
+    if ids is None:
+        return None
+    try:
+        parsed = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not parsed or len(parsed) > max_count:
+        raise HTTPException(status_code=400, detail=f"ids must list between 1 and {max_count} ids")
+    return parsed
+
+
+def paginated_response(
+    rows: List[Tuple[int, str]],
+    limit: int,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    headers = dict(extra_headers or {})
+    if len(rows) == limit and rows:
+        headers[NEXT_CURSOR_HEADER] = str(rows[-1][0])
+    return json_array_response((document for _, document in rows), headers)
+
+
+def offset_paginated_response(
+    documents: List[str],
+    limit: int,
+    offset: int,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    headers = dict(extra_headers or {})
+    if len(documents) == limit:
+        headers[NEXT_OFFSET_HEADER] = str(offset + limit)
+    return json_array_response(documents, headers)
+
+
+def change_feed_response(
+    rows: List[Tuple[int, str]],
+    latest_seq: int,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    # Always set so a client can store it and resume. An empty page means
+    # nothing matched up to latest_seq, read before the page, so a filtered
+    # feed skips ahead instead of rescanning other types' changes.
+    headers = {**(extra_headers or {}), NEXT_SINCE_HEADER: str(rows[-1][0] if rows else latest_seq)}
+    return json_array_response((document for _, document in rows), headers)
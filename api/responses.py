@@ -0,0 +1,55 @@
+from typing import Any, Dict, Iterable, Optional
+import orjson
+from fastapi.responses import Response
+from models.base import Entity
+from observability.diagnostics import timed_phase
+
+
+class RawJSONResponse(Response):
+    """Response whose body is JSON text that has already been rendered.
+
+    Used for list endpoints where SQLite builds each document with
+    ``json_object``; FastAPI neither validates nor re-encodes it.
+    """
+
+    media_type = "application/json"
+
+
+def _entity_fields(value: Any) -> Dict[str, Any]:
+    if isinstance(value, Entity):
+        return {name: getattr(value, name) for name in value.FIELDS}
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+class EntityJSONResponse(Response):
+    """Serialises an entity straight to JSON bytes with orjson.
+
+    UTC timestamps are written with a ``Z`` suffix, matching what the
+    ``response_model`` serialisation produced before.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with timed_phase("serialise"):
+            return orjson.dumps(content, default=_entity_fields, option=orjson.OPT_UTC_Z)
+
+
+def json_array_response(documents: Iterable[str], headers: Optional[Dict[str, str]] = None) -> RawJSONResponse:
+    with timed_phase("serialise"):
+        return RawJSONResponse("[" + ",".join(documents) + "]", headers=headers)
+
+
+def extend_document(document: str, extra: Dict[str, Any]) -> str:
+    # Appends keys to a rendered JSON object without re-parsing it.
+    return document[:-1] + "," + orjson.dumps(extra).decode()[1:]
+
+
+def entity_response(
+    entity: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> EntityJSONResponse:
+    # Returning a Response bypasses response_model validation; the model is
+    # still used for the OpenAPI schema.
+    return EntityJSONResponse(entity, status_code=status_code, headers=headers)
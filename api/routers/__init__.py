@@ -1,5 +1,9 @@
 from .organisation_router import router as organisation_router
 from .employee_router import router as employee_router
 from .health_router import router as health_router
+from .metrics_router import router as metrics_router
+from .search_router import router as search_router
+from .changes_router import router as changes_router
+from .events_router import router as events_router
 
-__all__ = ["organisation_router", "employee_router", "health_router"]
+__all__ = ["organisation_router", "employee_router", "health_router", "metrics_router", "search_router", "changes_router", "events_router"]
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query, Request
+from typing import List, Optional
+from api.schemas import ChangeResponse
+from api.dependencies import get_async_change_service
+from api.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from api.conditional import collection_etag, is_not_modified, not_modified_response, validator_headers
+from api.pagination import change_feed_response, parse_types
+from repositories.change_repository import CHANGE_KINDS
+from services.async_change_service import AsyncChangeService
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=List[ChangeResponse])
+async def get_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="X-Next-Since from the previous page; 0 starts from the beginning"),
+    type: Optional[str] = Query(None, description="Comma-separated change types: organisation, employee"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: AsyncChangeService = Depends(get_async_change_service)
+):
+    kinds = parse_types(type, CHANGE_KINDS)
+    latest_seq = await service.get_latest_seq()
+    etag = collection_etag('changes', latest_seq, request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    rows = await service.get_changes_json(since, kinds, limit)
+    return change_feed_response(rows, latest_seq, validator_headers(etag))
@@ -1,15 +1,167 @@
-from fastapi import APIRouter, Depends
-from typing import List
-from api.employee_schemas import EmployeeResponse
-from api.dependencies import get_employee_service
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from datetime import datetime
+from typing import List, Optional
+from api.employee_schemas import (
+    EmployeeUpdate,
+    EmployeeResponse,
+    EmployeeBulkRequest,
+    EmployeeBulkResponse,
+    EmployeeStatsResponse,
+)
+from api.schemas import BulkDeleteRequest, BulkResultResponse
+from api.dependencies import get_employee_service, get_async_employee_service
+from api.config import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    BULK_CHUNK_SIZE,
+    MAX_BULK_CHUNK_SIZE,
+)
+from api.conditional import (
+    collection_etag,
+    conditional_entity,
+    entity_headers,
+    expected_versions,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from api.responses import entity_response
+from api.export import ExportFormat, export_response
+from api.pagination import parse_fields, paginated_response
+from repositories.demographics import DemographicsQuery
+from repositories.query import PageQuery
 from services.employee_service import EmployeeService
+from services.async_employee_service import AsyncEmployeeService
 
 router = APIRouter(prefix="/employee", tags=["employees"])
 
 
 @router.get("", response_model=List[EmployeeResponse])
-def get_employees(
+async def get_employees(
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    name_prefix: Optional[str] = None,
+    last_name_prefix: Optional[str] = None,
+    location: Optional[str] = None,
+    organisation_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    selected = parse_fields(fields, list(EmployeeResponse.model_fields))
+    etag = collection_etag('employees', await service.get_employees_version(), request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    rows = await service.query_employees_json(PageQuery(
+        after_id=after_id,
+        limit=limit,
+        filters={
+            'name_prefix': name_prefix,
+            'last_name_prefix': last_name_prefix,
+            'location': location,
+            'organisation_id': organisation_id,
+            'created_after': created_after,
+            'created_before': created_before,
+        },
+        fields=selected
+    ))
+    return paginated_response(rows, limit, validator_headers(etag))
+
+
+@router.get("/export")
+def export_employees(
+    format: ExportFormat = ExportFormat.ndjson,
     service: EmployeeService = Depends(get_employee_service)
 ):
-    employees = service.get_all_employees()
-    return [employee.to_dict() for employee in employees]
+    return export_response(
+        service.iter_employee_batches(EXPORT_BATCH_SIZE),
+        format,
+        list(EmployeeResponse.model_fields),
+        "employees"
+    )
+
+
+@router.get("/stats", response_model=EmployeeStatsResponse)
+async def get_employee_stats(
+    request: Request,
+    organisation_id: Optional[int] = None,
+    age_bucket: int = Query(10, ge=1, le=100, description="Width of the age histogram buckets in years"),
+    cohort_years: int = Query(10, ge=1, le=100, description="Width of the birth-year cohorts"),
+    top: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Locations and organisations to list"),
+    service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    etag = collection_etag('employees', await service.get_employees_version(), request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    stats = await service.get_employee_demographics(DemographicsQuery(
+        age_bucket=age_bucket,
+        cohort_years=cohort_years,
+        top=top,
+        organisation_id=organisation_id
+    ))
+    return entity_response(stats, headers=validator_headers(etag))
+
+
+@router.put("/bulk", response_model=EmployeeBulkResponse)
+async def bulk_upsert_employees(
+    request: EmployeeBulkRequest,
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_CHUNK_SIZE),
+    service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    created = await service.create_employees(
+        [item.model_dump() for item in request.create],
+        chunk_size
+    )
+    updated = await service.update_employees(
+        [(item.id, item.model_dump(exclude={'id'})) for item in request.update],
+        chunk_size
+    )
+    return EmployeeBulkResponse(
+        create=BulkResultResponse.from_result(created),
+        update=BulkResultResponse.from_result(updated)
+    )
+
+
+@router.delete("/bulk", response_model=BulkResultResponse)
+async def bulk_delete_employees(
+    request: BulkDeleteRequest,
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_CHUNK_SIZE),
+    service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    deleted = await service.delete_employees(request.ids, chunk_size)
+    return BulkResultResponse.from_result(deleted)
+
+
+@router.get("/{id}", response_model=EmployeeResponse)
+async def get_employee(
+    id: int,
+    request: Request,
+    service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    employee = await service.get_employee_by_id(id)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return conditional_entity(request, employee)
+
+
+@router.put("/{id}", response_model=EmployeeResponse)
+async def update_employee(
+    id: int,
+    employee: EmployeeUpdate,
+    request: Request,
+    service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    expected = expected_versions(request, id)
+    updated_employee = await service.update_employee(
+        id=id,
+        **employee.model_dump(),
+        expected_updated_at=expected
+    )
+    if not updated_employee:
+        if expected is not None and await service.get_employee_by_id(id):
+            raise HTTPException(status_code=412, detail="Employee has been modified")
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return entity_response(updated_employee, headers=entity_headers(updated_employee))
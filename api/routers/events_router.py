@@ -0,0 +1,65 @@
+from typing import AsyncIterator, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from api.config import EVENTS_HEARTBEAT_SECONDS
+from api.dependencies import get_event_bus
+from api.pagination import parse_types
+from services.events import EVENT_TYPES, EntityEvent, EventBus, Subscription, TooManySubscribersError
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Sent first so the response starts at once, and tells clients how soon to reconnect.
+STREAM_PREAMBLE = "retry: 5000\n\n"
+KEEP_ALIVE = ": keep-alive\n\n"
+OVERFLOW = "event: overflow\ndata: {}\n\n"
+
+
+def sse_frame(event: EntityEvent) -> str:
+    data = orjson.dumps({
+        "type": event.type,
+        "op": event.op,
+        "id": event.id,
+        "organisation_id": event.organisation_id,
+        "previous_organisation_id": event.previous_organisation_id,
+    })
+    return f"data: {data.decode()}\n\n"
+
+
+async def event_stream(subscription: Subscription, heartbeat: float) -> AsyncIterator[str]:
+    """Server-sent events for a subscription, one chunk per batch of queued events."""
+    yield STREAM_PREAMBLE
+    while True:
+        events = await subscription.next_batch(heartbeat)
+        if events:
+            yield "".join(sse_frame(event) for event in events)
+        elif subscription.overflowed:
+            # The client fell behind; it should catch up from /changes and reconnect.
+            yield OVERFLOW
+            return
+        elif subscription.closed:
+            return
+        else:
+            yield KEEP_ALIVE
+
+
+@router.get("")
+async def stream_events(
+    type: Optional[str] = Query(None, description="Comma-separated event types: organisation, employee"),
+    organisation_id: Optional[int] = Query(None, description="Only events for this organisation and its employees"),
+    bus: EventBus = Depends(get_event_bus)
+):
+    types = parse_types(type, EVENT_TYPES)
+    try:
+        subscription = bus.subscribe(types, organisation_id)
+    except TooManySubscribersError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return StreamingResponse(
+        event_stream(subscription, EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Runs however the stream ends, including a client disconnecting
+        # before the first chunk.
+        background=BackgroundTask(bus.unsubscribe, subscription)
+    )
@@ -0,0 +1,67 @@
+from typing import Dict, List, Sequence, Tuple
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from api.container import ServiceContainer
+from api.dependencies import get_container
+from observability.metrics import CONTENT_TYPE, REGISTRY, format_family
+from repositories.cached_repository import CachedRepository
+
+router = APIRouter(prefix="/metrics", tags=["health"])
+
+# (stats field, metric name, type, help) for the stats snapshots taken at scrape time.
+StatsMetric = Tuple[str, str, str, str]
+
+POOL_METRICS: Sequence[StatsMetric] = (
+    ('size', 'sqlite_pool_size', 'gauge', 'Maximum pooled connections.'),
+    ('open_connections', 'sqlite_pool_open_connections', 'gauge', 'Open pooled connections.'),
+    ('idle_connections', 'sqlite_pool_idle_connections', 'gauge', 'Idle pooled connections.'),
+    ('in_use', 'sqlite_pool_in_use', 'gauge', 'Checked out connections.'),
+    ('checkouts', 'sqlite_pool_checkouts_total', 'counter', 'Connection checkouts.'),
+    ('exhausted', 'sqlite_pool_exhausted_total', 'counter', 'Checkouts that had to wait for a connection.'),
+    ('timeouts', 'sqlite_pool_timeouts_total', 'counter', 'Checkouts that timed out.'),
+    ('discarded', 'sqlite_pool_discarded_total', 'counter', 'Connections discarded after a failed health check.'),
+    ('total_wait_seconds', 'sqlite_pool_wait_seconds_total', 'counter', 'Time spent waiting for a connection.'),
+    ('max_wait_seconds', 'sqlite_pool_max_wait_seconds', 'gauge', 'Longest wait for a connection.'),
+    ('writes', 'sqlite_pool_writes_total', 'counter', 'Write transactions admitted by the write queue.'),
+    ('queued_writers', 'sqlite_pool_queued_writers', 'gauge', 'Writers waiting for the write lock.'),
+    ('total_write_wait_seconds', 'sqlite_pool_write_wait_seconds_total', 'counter', 'Time writers spent queued.'),
+)
+
+CACHE_METRICS: Sequence[StatsMetric] = (
+    ('hits', 'entity_cache_hits_total', 'counter', 'get_by_id cache hits.'),
+    ('misses', 'entity_cache_misses_total', 'counter', 'get_by_id cache misses.'),
+    ('evictions', 'entity_cache_evictions_total', 'counter', 'Entries evicted by the LRU bound.'),
+    ('expirations', 'entity_cache_expirations_total', 'counter', 'Entries dropped after their TTL.'),
+    ('invalidations', 'entity_cache_invalidations_total', 'counter', 'Entries invalidated by writes.'),
+    ('size', 'entity_cache_entries', 'gauge', 'Cached entities.'),
+    ('max_entries', 'entity_cache_max_entries', 'gauge', 'Cache capacity.'),
+)
+
+
+def _render_stats(metrics: Sequence[StatsMetric], snapshots: List[Tuple[Dict[str, str], dict]]) -> str:
+    if not snapshots:
+        return ""
+    return "".join(
+        format_family(name, kind, documentation, [(name, labels, stats[field]) for labels, stats in snapshots])
+        for field, name, kind, documentation in metrics
+    )
+
+
+def render_container_metrics(container: ServiceContainer) -> str:
+    caches = [
+        ({'table': table}, repository.stats().to_dict())
+        for table, repository in (
+            ('organisations', container.organisation_repository),
+            ('employees', container.employee_repository),
+        )
+        if isinstance(repository, CachedRepository)
+    ]
+    return (
+        _render_stats(POOL_METRICS, [({}, container.pool.stats().to_dict())])
+        + _render_stats(CACHE_METRICS, caches)
+    )
+
+
+@router.get("", response_class=PlainTextResponse)
+def metrics(container: ServiceContainer = Depends(get_container)):
+    return PlainTextResponse(REGISTRY.render() + render_container_metrics(container), media_type=CONTENT_TYPE)
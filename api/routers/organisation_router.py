@@ -1,69 +1,267 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from api.schemas import OrganisationCreate, OrganisationUpdate, OrganisationResponse
-from api.dependencies import get_organisation_service
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from api.schemas import (
+    OrganisationCreate,
+    OrganisationUpdate,
+    OrganisationResponse,
+    OrganisationDetailResponse,
+    OrganisationListResponse,
+    EmployeeCountResponse,
+    OrganisationBulkRequest,
+    OrganisationBulkResponse,
+    BulkDeleteRequest,
+    BulkResultResponse,
+    TagMode,
+    TagCountResponse,
+)
+from api.dependencies import (
+    get_organisation_service,
+    get_async_organisation_service,
+    get_async_employee_service,
+)
+from api.config import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    BULK_CHUNK_SIZE,
+    MAX_BULK_CHUNK_SIZE,
+)
+from api.conditional import (
+    collection_etag,
+    conditional_entity,
+    entity_etag,
+    entity_headers,
+    expected_versions,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from api.responses import entity_response, extend_document
+from api.export import ExportFormat, export_response
+from api.employee_schemas import EmployeeResponse
+from api.pagination import parse_fields, parse_ids, parse_include, paginated_response
+from repositories.query import PageQuery
 from services.organisation_service import OrganisationService
+from services.async_organisation_service import AsyncOrganisationService
+from services.async_employee_service import AsyncEmployeeService
 
 router = APIRouter(prefix="/organisation", tags=["organisations"])
 
+INCLUDES = ('employee_count', 'summary')
 
-@router.get("", response_model=List[OrganisationResponse])
-def get_organisations(
+
+def _extras(summary: Dict[str, Any], includes: List[str]) -> Dict[str, Any]:
+    extras: Dict[str, Any] = {}
+    if 'employee_count' in includes:
+        extras['employee_count'] = summary['employee_count']
+    if 'summary' in includes:
+        extras['summary'] = summary
+    return extras
+
+
+@router.get("", response_model=List[OrganisationListResponse])
+async def get_organisations(
+    request: Request,
+    ids: Optional[str] = Query(None, description="Comma-separated organisation ids"),
+    include: Optional[str] = Query(None, description="Comma-separated extras: employee_count, summary"),
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    name_prefix: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    tag_mode: TagMode = TagMode.all,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    service: AsyncOrganisationService = Depends(get_async_organisation_service),
+    employee_service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    selected = parse_fields(fields, list(OrganisationResponse.model_fields))
+    includes = parse_include(include, INCLUDES)
+    version = str(await service.get_organisations_version())
+    if includes:
+        version += f".{await employee_service.get_employees_version()}"
+    etag = collection_etag('organisations', version, request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    rows = await service.query_organisations_json(PageQuery(
+        after_id=after_id,
+        limit=limit,
+        filters={
+            'ids': parse_ids(ids, MAX_PAGE_SIZE),
+            'name_prefix': name_prefix,
+            'tags_all' if tag_mode == TagMode.all else 'tags_any': tag,
+            'created_after': created_after,
+            'created_before': created_before,
+        },
+        fields=selected
+    ))
+    if includes:
+        # One summary lookup for the whole page serves both extras.
+        summaries = await employee_service.get_organisation_summaries([id for id, _ in rows])
+        rows = [(id, extend_document(document, _extras(summaries[id], includes))) for id, document in rows]
+    return paginated_response(rows, limit, validator_headers(etag))
+
+
+@router.get("/tags", response_model=List[TagCountResponse])
+async def get_tag_counts(
+    limit: Optional[int] = Query(None, ge=1),
+    service: AsyncOrganisationService = Depends(get_async_organisation_service)
+):
+    return [{"tag": tag, "count": count} for tag, count in await service.get_tag_counts(limit)]
+
+
+@router.get("/export")
+def export_organisations(
+    format: ExportFormat = ExportFormat.ndjson,
     service: OrganisationService = Depends(get_organisation_service)
 ):
-    organisations = service.get_all_organisations()
-    return [org.to_dict() for org in organisations]
+    return export_response(
+        service.iter_organisation_batches(EXPORT_BATCH_SIZE),
+        format,
+        list(OrganisationResponse.model_fields),
+        "organisations"
+    )
+
+
+@router.put("/bulk", response_model=OrganisationBulkResponse)
+async def bulk_upsert_organisations(
+    request: OrganisationBulkRequest,
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_CHUNK_SIZE),
+    service: AsyncOrganisationService = Depends(get_async_organisation_service)
+):
+    created = await service.create_organisations(
+        [item.model_dump() for item in request.create],
+        chunk_size
+    )
+    updated = await service.update_organisations(
+        [(item.id, item.model_dump(exclude={'id'})) for item in request.update],
+        chunk_size
+    )
+    return OrganisationBulkResponse(
+        create=BulkResultResponse.from_result(created),
+        update=BulkResultResponse.from_result(updated)
+    )
+
+
+@router.delete("/bulk", response_model=BulkResultResponse)
+async def bulk_delete_organisations(
+    request: BulkDeleteRequest,
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_CHUNK_SIZE),
+    service: AsyncOrganisationService = Depends(get_async_organisation_service)
+):
+    deleted = await service.delete_organisations(request.ids, chunk_size)
+    return BulkResultResponse.from_result(deleted)
 
 
-@router.get("/{id}", response_model=OrganisationResponse)
-def get_organisation(
+@router.get("/{id}", response_model=OrganisationDetailResponse)
+async def get_organisation(
     id: int,
-    service: OrganisationService = Depends(get_organisation_service)
+    request: Request,
+    include: Optional[str] = Query(None, description="Comma-separated extras: summary"),
+    service: AsyncOrganisationService = Depends(get_async_organisation_service),
+    employee_service: AsyncEmployeeService = Depends(get_async_employee_service)
 ):
-    org = service.get_organisation_by_id(id)
+    includes = parse_include(include, ('summary',))
+    org = await service.get_organisation_by_id(id)
     if not org:
         raise HTTPException(status_code=404, detail="Organisation not found")
-    return org.to_dict()
+    if not includes:
+        return conditional_entity(request, org)
+    # The summary changes with the employees, so the entity ETag alone is not enough.
+    entity_version = entity_etag(org.id, org.updated_at)[1:-1]
+    etag = collection_etag('organisation', f"{entity_version}.{await employee_service.get_employees_version()}", request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    summaries = await employee_service.get_organisation_summaries([id])
+    document = {name: getattr(org, name) for name in org.FIELDS}
+    return entity_response({**document, 'summary': summaries[id]}, headers=validator_headers(etag))
+
+
+@router.get("/{id}/employees", response_model=List[EmployeeResponse])
+async def get_organisation_employees(
+    id: int,
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    service: AsyncOrganisationService = Depends(get_async_organisation_service),
+    employee_service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    selected = parse_fields(fields, list(EmployeeResponse.model_fields))
+    if not await service.get_organisation_by_id(id):
+        raise HTTPException(status_code=404, detail="Organisation not found")
+    etag = collection_etag('employees', await employee_service.get_employees_version(), request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    rows = await employee_service.query_employees_json(PageQuery(
+        after_id=after_id,
+        limit=limit,
+        filters={'organisation_id': id},
+        fields=selected
+    ))
+    return paginated_response(rows, limit, validator_headers(etag))
+
+
+@router.get("/{id}/employee-count", response_model=EmployeeCountResponse)
+async def get_organisation_employee_count(
+    id: int,
+    service: AsyncOrganisationService = Depends(get_async_organisation_service),
+    employee_service: AsyncEmployeeService = Depends(get_async_employee_service)
+):
+    if not await service.get_organisation_by_id(id):
+        raise HTTPException(status_code=404, detail="Organisation not found")
+    counts = await employee_service.count_employees_by_organisation([id])
+    return {"organisation_id": id, "employee_count": counts[id]}
 
 
 @router.put("", response_model=OrganisationResponse, status_code=201)
-def create_organisation(
+async def create_organisation(
     org: OrganisationCreate,
-    service: OrganisationService = Depends(get_organisation_service)
+    service: AsyncOrganisationService = Depends(get_async_organisation_service)
 ):
-    created_org = service.create_organisation(
+    created_org = await service.create_organisation(
         name=org.name,
         details=org.details,
         tags=org.tags,
         url=org.url
     )
-    return created_org.to_dict()
+    return entity_response(created_org, status_code=201, headers=entity_headers(created_org))
 
 
 @router.put("/{id}", response_model=OrganisationResponse)
-def update_organisation(
+async def update_organisation(
     id: int,
     org: OrganisationUpdate,
-    service: OrganisationService = Depends(get_organisation_service)
+    request: Request,
+    service: AsyncOrganisationService = Depends(get_async_organisation_service)
 ):
-    updated_org = service.update_organisation(
+    expected = expected_versions(request, id)
+    updated_org = await service.update_organisation(
         id=id,
         name=org.name,
         details=org.details,
         tags=org.tags,
-        url=org.url
+        url=org.url,
+        expected_updated_at=expected
     )
     if not updated_org:
+        if expected is not None and await service.get_organisation_by_id(id):
+            raise HTTPException(status_code=412, detail="Organisation has been modified")
         raise HTTPException(status_code=404, detail="Organisation not found")
-    return updated_org.to_dict()
+    return entity_response(updated_org, headers=entity_headers(updated_org))
 
 
 @router.delete("/{id}")
-def delete_organisation(
+async def delete_organisation(
     id: int,
-    service: OrganisationService = Depends(get_organisation_service)
+    request: Request,
+    service: AsyncOrganisationService = Depends(get_async_organisation_service)
 ):
-    deleted = service.delete_organisation(id)
+    expected = expected_versions(request, id)
+    deleted = await service.delete_organisation(id, expected)
     if not deleted:
+        if expected is not None and await service.get_organisation_by_id(id):
+            raise HTTPException(status_code=412, detail="Organisation has been modified")
         raise HTTPException(status_code=204, detail="Organisation not found")
     return {"message": "Organisation deleted successfully"}
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import List, Optional
+from api.schemas import SearchHitResponse
+from api.dependencies import get_async_search_service
+from api.config import DEFAULT_SEARCH_LIMIT, MAX_PAGE_SIZE, MAX_SEARCH_OFFSET
+from api.conditional import collection_etag, is_not_modified, not_modified_response, validator_headers
+from api.pagination import offset_paginated_response, parse_types
+from repositories.search_repository import SEARCH_KINDS
+from services.async_search_service import AsyncSearchService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=List[SearchHitResponse])
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find; each matches as a prefix"),
+    type: Optional[str] = Query(None, description="Comma-separated result types: organisation, employee"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    service: AsyncSearchService = Depends(get_async_search_service)
+):
+    kinds = parse_types(type, SEARCH_KINDS)
+    etag = collection_etag('search', await service.get_search_version(), request)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    try:
+        documents = await service.search_json(q, kinds, limit, offset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return offset_paginated_response(documents, limit, offset, validator_headers(etag))
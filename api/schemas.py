@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from enum import Enum
+from repositories.bulk import BulkResult
 
 class OrganisationBase(BaseModel):
     name: str
@@ -23,3 +25,73 @@ class OrganisationResponse(OrganisationBase):
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
+
+class OrganisationSummaryResponse(BaseModel):
+    employee_count: int
+    average_age: Optional[float] = None
+    last_updated_at: Optional[datetime] = None
+
+class OrganisationDetailResponse(OrganisationResponse):
+    summary: Optional[OrganisationSummaryResponse] = None
+
+class OrganisationListResponse(OrganisationDetailResponse):
+    employee_count: Optional[int] = None
+
+class EmployeeCountResponse(BaseModel):
+    organisation_id: int
+    employee_count: int
+
+class SearchHitResponse(BaseModel):
+    type: str
+    id: int
+    title: str
+    snippet: str
+    score: float
+
+class ChangeResponse(BaseModel):
+    seq: int
+    type: str
+    id: int
+    op: str
+    # The entity as the list endpoints render it; null for deletes.
+    data: Optional[Dict[str, Any]] = None
+
+class TagMode(str, Enum):
+    all = "all"
+    any = "any"
+
+class TagCountResponse(BaseModel):
+    tag: str
+    count: int
+
+class OrganisationBulkUpdate(OrganisationUpdate):
+    id: int
+
+class OrganisationBulkRequest(BaseModel):
+    create: List[OrganisationCreate] = Field(default_factory=list)
+    update: List[OrganisationBulkUpdate] = Field(default_factory=list)
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int]
+
+class BulkItemResponse(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResultResponse(BaseModel):
+    succeeded: int = 0
+    failed: int = 0
+    items: List[BulkItemResponse] = Field(default_factory=list)
+    
+    @classmethod
+    def from_result(cls, result: BulkResult) -> "BulkResultResponse":
+        return cls(
+            succeeded=len(result.succeeded),
+            failed=len(result.failed),
+            items=[BulkItemResponse(index=item.index, id=item.id, error=item.error) for item in result.items]
+        )
+
+class OrganisationBulkResponse(BaseModel):
+    create: BulkResultResponse
+    update: BulkResultResponse
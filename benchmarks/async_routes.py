@@ -0,0 +1,121 @@
+"""
+Sync vs async route throughput and latency at increasing client concurrency.
+
+Usage:
+    python -m benchmarks.async_routes [--clients 1 64 512] [--requests 4000] [--pool-size 5]
+
+Builds two minimal apps over the same ServiceContainer: one with sync ``def``
+routes calling the sync services (the pre-async path, where every request
+holds one of Starlette's worker threads for its whole duration) and one with
+``async def`` routes awaiting the executor-backed async services. Each app
+serves ``GET /organisation/{id}`` and ``GET /organisation?limit=50``, driven
+in-process through httpx's ASGI transport by N concurrent clients. Requests/s
+and p50/p99 latency are printed per configuration.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from api.container import ServiceContainer
+from repositories.query import PageQuery
+
+
+def build_sync_app(container: ServiceContainer) -> FastAPI:
+    app = FastAPI()
+    service = container.organisation_service
+
+    @app.get("/organisation/{id}")
+    def get_organisation(id: int):
+        return service.get_organisation_by_id(id).to_dict()
+
+    @app.get("/organisation")
+    def get_organisations(limit: int = 50):
+        return [org.to_dict() for org in service.query_organisations(PageQuery(limit=limit))]
+
+    return app
+
+
+def build_async_app(container: ServiceContainer) -> FastAPI:
+    app = FastAPI()
+    service = container.async_organisation_service
+
+    @app.get("/organisation/{id}")
+    async def get_organisation(id: int):
+        return (await service.get_organisation_by_id(id)).to_dict()
+
+    @app.get("/organisation")
+    async def get_organisations(limit: int = 50):
+        return [org.to_dict() for org in await service.query_organisations(PageQuery(limit=limit))]
+
+    return app
+
+
+async def drive(app: FastAPI, clients: int, requests: int, ids: List[int]) -> Dict[str, float]:
+    latencies: List[float] = []
+    remaining = [requests]
+    transport = httpx.ASGITransport(app=app)
+
+    async def client_loop(http: httpx.AsyncClient, rng: random.Random) -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            url = "/organisation?limit=50" if rng.random() < 0.2 else f"/organisation/{rng.choice(ids)}"
+            started = time.perf_counter()
+            response = await http.get(url)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(http, random.Random(seed)) for seed in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 64, 512])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--pool-size", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    container = ServiceContainer(path, pool_size=args.pool_size)
+    try:
+        container.organisation_service.create_organisations(
+            [{"name": f"Org {i}", "tags": ["bench", f"t{i % 10}"]} for i in range(2000)]
+        )
+        ids = [org.id for org in container.organisation_service.get_all_organisations()]
+        apps = {"sync def": build_sync_app(container), "async def": build_async_app(container)}
+
+        print(f"{'routes':<10} {'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        for clients in args.clients:
+            for name, app in apps.items():
+                result = asyncio.run(drive(app, clients, args.requests, ids))
+                print(
+                    f"{name:<10} {clients:>8} {result['requests_per_second']:>10.0f} "
+                    f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f}"
+                )
+    finally:
+        container.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
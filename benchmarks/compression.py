@@ -0,0 +1,89 @@
+"""
+Bytes on the wire and CPU cost per response compression codec and level.
+
+Usage:
+    python -m benchmarks.compression [--db bench.db] [--repeat 5]
+
+Builds real response bodies from the synthetic dataset (see
+``benchmarks.dataset``): list pages of organisations and employees as the
+list endpoints render them, and the organisation NDJSON export split into
+the same batches the streaming export sends. Each body is compressed through
+the middleware's own compressors, flushing after every chunk as the
+middleware does. The table reports compressed size, ratio, and compression
+time and throughput for the best of --repeat runs. Codecs whose packages
+(brotli, zstandard) are not installed are skipped.
+"""
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from api.compression import CODECS
+from api.export import ndjson_chunks
+from api.responses import json_array_response
+from benchmarks.dataset import DatasetSpec, ensure_dataset
+from repositories.employee_repository import EmployeeRepository
+from repositories.organisation_repository import OrganisationRepository
+from repositories.query import PageQuery
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 6, 11), "zstd": (1, 3, 9, 19)}
+
+
+def list_body(repository, limit: int) -> List[bytes]:
+    rows = repository.query_json(PageQuery(limit=limit))
+    return [json_array_response(document for _, document in rows).body]
+
+
+def payloads(db_path: str) -> Dict[str, List[bytes]]:
+    organisations = OrganisationRepository(db_path)
+    employees = EmployeeRepository(db_path)
+    return {
+        "organisations x100": list_body(organisations, 100),
+        "organisations x1000": list_body(organisations, 1000),
+        "employees x100": list_body(employees, 100),
+        "employees x1000": list_body(employees, 1000),
+        "organisation export": [chunk.encode() for chunk in ndjson_chunks(organisations.iter_batches(1000))],
+    }
+
+
+def compress_chunks(codec: str, level: int, chunks: List[bytes]) -> int:
+    compressor = CODECS[codec](level)
+    size = 0
+    for chunk in chunks[:-1]:
+        size += len(compressor.compress(chunk)) + len(compressor.flush())
+    return size + len(compressor.compress(chunks[-1])) + len(compressor.finish())
+
+
+def measure(codec: str, level: int, chunks: List[bytes], repeat: int) -> Tuple[int, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = compress_chunks(codec, level, chunks)
+        best = min(best, time.perf_counter() - started)
+    return size, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ensure_dataset(args.db, DatasetSpec(), verbose=True)
+    skipped = sorted(set(LEVELS) - set(CODECS))
+    if skipped:
+        print(f"Not installed, skipped: {', '.join(skipped)}")
+    print(f"{'payload':<22} {'codec':<8} {'bytes':>11} {'ratio':>7} {'ms':>9} {'MB/s':>8}")
+    for name, chunks in payloads(args.db).items():
+        original = sum(len(chunk) for chunk in chunks)
+        print(f"{name:<22} {'identity':<8} {original:>11,} {1.0:>7.2f} {0.0:>9.2f} {'-':>8}")
+        for codec in (codec for codec in LEVELS if codec in CODECS):
+            for level in LEVELS[codec]:
+                size, seconds = measure(codec, level, chunks, args.repeat)
+                print(
+                    f"{'':<22} {f'{codec}-{level}':<8} {size:>11,} {original / size:>7.2f} "
+                    f"{seconds * 1000:>9.2f} {original / seconds / 1e6:>8.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
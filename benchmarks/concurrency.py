@@ -0,0 +1,89 @@
+"""
+Concurrent read/write load against OrganisationRepository.
+
+Usage:
+    python -m benchmarks.concurrency [--readers 8] [--writers 4] [--seconds 3]
+
+Runs the same thread mix against a rollback-journal configuration without the
+writer queue (the pre-WAL behaviour) and against the default WAL settings
+with writes serialised through the pool's WriteQueue, then prints operations
+per second and lock errors for each.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict
+
+from models.entity import Organisation
+from repositories.connection_pool import ConnectionPool
+from repositories.organisation_repository import OrganisationRepository
+from repositories.query import PageQuery
+from repositories.sqlite_settings import StorageSettings
+
+CONFIGURATIONS = {
+    "rollback journal": (StorageSettings(journal_mode="DELETE", synchronous="FULL"), False),
+    "WAL + writer queue": (StorageSettings(), True),
+}
+
+
+def run(settings: StorageSettings, serialize_writes: bool, readers: int, writers: int, seconds: float) -> Dict[str, float]:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    pool = ConnectionPool(path, size=readers + writers, settings=settings, serialize_writes=serialize_writes)
+    repository = OrganisationRepository(path, pool=pool)
+    repository.create_many([Organisation(name=f"Seed {i}", tags=["seed"]) for i in range(1000)])
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def record(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def reader() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                repository.query(PageQuery(limit=50, filters={"name_prefix": "Seed 1"}))
+                record("reads")
+            except sqlite3.OperationalError:
+                record("errors")
+
+    def writer() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                repository.create(Organisation(name="Load", tags=["load"]))
+                record("writes")
+            except sqlite3.OperationalError:
+                record("errors")
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+    return {key: value / seconds if key != "errors" else value for key, value in counts.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'configuration':<20} {'reads/s':>10} {'writes/s':>10} {'lock errors':>12}")
+    for name, (settings, serialize_writes) in CONFIGURATIONS.items():
+        result = run(settings, serialize_writes, args.readers, args.writers, args.seconds)
+        print(f"{name:<20} {result['reads']:>10.0f} {result['writes']:>10.0f} {result['errors']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
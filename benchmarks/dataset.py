@@ -0,0 +1,172 @@
+"""
+Deterministic synthetic dataset for benchmarks and load tests.
+
+Usage:
+    python -m benchmarks.dataset [--db bench.db] [--organisations 10000] [--employees 1000000] [--seed 42]
+
+Every row is derived from --seed, so two runs with the same arguments produce
+identical databases (including timestamps). Organisation sizes are skewed: a
+few organisations hold many employees and most hold a handful, which is what
+makes organisation-scoped queries interesting. The database is created through
+the normal migrations, so indexes and triggers match production. An existing
+file generated with the same parameters is reused.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+
+from repositories.employee_repository import EmployeeRepository
+from repositories.migrations import migrate
+
+GENERATOR_VERSION = 1
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+FIRST_NAMES = (
+    "Alice", "Bob", "Carol", "David", "Emma", "Farah", "George", "Hana", "Ivan", "Julia",
+    "Kenji", "Laura", "Mohammed", "Nina", "Oscar", "Priya", "Quentin", "Rosa", "Samuel", "Tara",
+)
+LAST_NAMES = (
+    "Anderson", "Brown", "Chen", "Dubois", "Evans", "Fischer", "Garcia", "Hughes", "Ito", "Jones",
+    "Khan", "Lopez", "Miller", "Novak", "O'Brien", "Patel", "Quinn", "Rossi", "Smith", "Taylor",
+    "Ueda", "Veldt", "Walker", "Xu", "Young", "Zimmerman",
+)
+LOCATIONS = (
+    "London", "Paris", "Berlin", "New York", "San Francisco", "Seattle", "Tokyo", "Sydney",
+    "Toronto", "Madrid", "Amsterdam", "Singapore",
+)
+TAGS = (
+    "technology", "finance", "healthcare", "retail", "energy", "education", "logistics", "media",
+    "enterprise", "startup", "nonprofit", "government", "ai", "cloud", "security", "consulting",
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    organisations: int = 10_000
+    employees: int = 1_000_000
+    seed: int = 42
+    version: int = GENERATOR_VERSION
+
+
+def _timestamp(minutes: int) -> str:
+    return (EPOCH + timedelta(minutes=minutes)).isoformat()
+
+
+def organisation_rows(spec: DatasetSpec) -> Iterator[Tuple]:
+    rng = random.Random(f"{spec.seed}-organisations")
+    for i in range(spec.organisations):
+        created = _timestamp(i * 7)
+        updated = created if rng.random() < 0.7 else _timestamp(i * 7 + rng.randrange(1, 500_000))
+        tags = rng.sample(TAGS, rng.randrange(0, 5))
+        yield (
+            created,
+            f"Synthetic organisation {i:05d} providing {rng.choice(TAGS)} services",
+            f"{rng.choice(LAST_NAMES)} {rng.choice(('Group', 'Labs', 'Partners', 'Systems', 'Holdings'))} {i}",
+            json.dumps(tags),
+            updated,
+            f"https://org{i}.example.com",
+        )
+
+
+def employee_rows(spec: DatasetSpec) -> Iterator[Tuple]:
+    rng = random.Random(f"{spec.seed}-employees")
+    for i in range(spec.employees):
+        age = rng.randrange(18, 67)
+        created = _timestamp(i // 2)
+        updated = created if rng.random() < 0.8 else _timestamp(i // 2 + rng.randrange(1, 200_000))
+        yield (
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            age,
+            (date(2024, 1, 1) - timedelta(days=age * 365 + rng.randrange(365))).isoformat(),
+            rng.choice(LOCATIONS),
+            # Squaring a uniform draw skews employees towards low organisation ids.
+            1 + int(spec.organisations * rng.random() ** 2),
+            created,
+            updated,
+        )
+
+
+def _stored_spec(conn: sqlite3.Connection) -> Optional[DatasetSpec]:
+    """The spec a file was generated with; raises if it is not a benchmark dataset."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if "benchmark_dataset" not in tables:
+        if tables - {"sqlite_sequence"}:
+            raise RuntimeError("Refusing to overwrite a database that was not generated by benchmarks.dataset")
+        return None
+    stored = dict(conn.execute("SELECT key, value FROM benchmark_dataset").fetchall())
+    return DatasetSpec(**stored) if set(stored) == set(asdict(DatasetSpec())) else None
+
+
+def _insert_chunked(conn: sqlite3.Connection, sql: str, rows: Iterator[Tuple], chunk_size: int = 20_000) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            conn.executemany(sql, chunk)
+            chunk.clear()
+    if chunk:
+        conn.executemany(sql, chunk)
+
+
+def ensure_dataset(path: str, spec: DatasetSpec = DatasetSpec(), verbose: bool = False) -> bool:
+    """Create the dataset at ``path`` unless it already holds ``spec``; returns True if generated."""
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        try:
+            if _stored_spec(conn) == spec:
+                return False
+        finally:
+            conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        migrate(conn)
+        conn.execute("PRAGMA journal_mode = WAL")
+        # Safe to relax: a crash mid-generation just means regenerating.
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+        _insert_chunked(conn, """
+            INSERT INTO organisations (created_at, details, name, tags, updated_at, url)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, organisation_rows(spec))
+        _insert_chunked(conn, EmployeeRepository.INSERT_SQL, employee_rows(spec))
+        conn.execute("CREATE TABLE benchmark_dataset (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.executemany("INSERT INTO benchmark_dataset (key, value) VALUES (?, ?)", asdict(spec).items())
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    if verbose:
+        print(
+            f"Generated {spec.organisations} organisations and {spec.employees} employees "
+            f"in {time.perf_counter() - started:.1f}s at {path}"
+        )
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--organisations", type=int, default=DatasetSpec.organisations)
+    parser.add_argument("--employees", type=int, default=DatasetSpec.employees)
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    args = parser.parse_args()
+
+    spec = DatasetSpec(args.organisations, args.employees, args.seed)
+    if not ensure_dataset(args.db, spec, verbose=True):
+        print(f"{args.db} already holds {spec}")
+
+
+if __name__ == "__main__":
+    main()
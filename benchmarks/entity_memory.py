@@ -0,0 +1,158 @@
+"""
+Memory and get_all() time for eager dataclass entities vs slotted lazy ones.
+
+Usage:
+    python -m benchmarks.entity_memory [--rows 100000]
+
+Seeds --rows employees and organisations, then loads each table twice: once
+into replicas of the previous ``@dataclass`` entities with every date,
+timestamp and tag list decoded up front, and once through the repository's
+``get_all()`` (slotted entities, decoded on first access). Retained memory is measured with tracemalloc and
+reported per row and extrapolated to 1M rows; load time is the best of three.
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, List, Optional
+
+from models.employee import Employee
+from models.entity import Organisation
+from repositories.employee_repository import EmployeeRepository
+from repositories.organisation_repository import OrganisationRepository
+
+
+@dataclass
+class LegacyEmployee:
+    name: str
+    last_name: str
+    age: int
+    date_of_birth: date
+    location: str
+    organisation_id: int
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass
+class LegacyOrganisation:
+    name: str
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    details: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    url: Optional[str] = None
+
+
+def legacy_get_all_organisations(repository: OrganisationRepository) -> List[LegacyOrganisation]:
+    with repository._get_connection() as conn:
+        rows = conn.execute("SELECT * FROM organisations").fetchall()
+        return [
+            LegacyOrganisation(
+                id=row['id'],
+                name=row['name'],
+                created_at=datetime.fromisoformat(row['created_at']),
+                updated_at=datetime.fromisoformat(row['updated_at']),
+                details=row['details'],
+                tags=json.loads(row['tags']) if row['tags'] else [],
+                url=row['url']
+            )
+            for row in rows
+        ]
+
+
+def legacy_get_all_employees(repository: EmployeeRepository) -> List[LegacyEmployee]:
+    with repository._get_connection() as conn:
+        rows = conn.execute("SELECT * FROM employees").fetchall()
+        return [
+            LegacyEmployee(
+                id=row['id'],
+                name=row['name'],
+                last_name=row['last_name'],
+                age=row['age'],
+                date_of_birth=date.fromisoformat(row['date_of_birth']),
+                location=row['location'],
+                organisation_id=row['organisation_id'],
+                created_at=datetime.fromisoformat(row['created_at']),
+                updated_at=datetime.fromisoformat(row['updated_at'])
+            )
+            for row in rows
+        ]
+
+
+def retained_bytes(load: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    entities = load()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return retained
+
+
+def best_time(load: Callable[[], list]) -> float:
+    timings = []
+    for _ in range(3):
+        gc.collect()
+        started = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        employees = EmployeeRepository(path)
+        organisations = OrganisationRepository(path)
+        employees.create_many([
+            Employee(
+                name=f"Name {i}",
+                last_name=f"Surname {i % 1000}",
+                age=20 + i % 45,
+                date_of_birth=date(1960 + i % 45, 1 + i % 12, 1 + i % 28),
+                location=("London", "Paris", "Berlin")[i % 3],
+                organisation_id=1 + i % 100
+            )
+            for i in range(args.rows)
+        ], chunk_size=5000)
+        organisations.create_many([
+            Organisation(
+                name=f"Organisation {i}",
+                details="Seeded for the entity memory benchmark",
+                tags=["bench", f"group-{i % 20}", "memory"],
+                url=f"https://org{i}.example.com"
+            )
+            for i in range(args.rows)
+        ], chunk_size=5000)
+
+        loaders = {
+            "employees, eager dataclass": lambda: legacy_get_all_employees(employees),
+            "employees, slotted lazy": employees.get_all,
+            "organisations, eager dataclass": lambda: legacy_get_all_organisations(organisations),
+            "organisations, slotted lazy": organisations.get_all,
+        }
+        print(f"{'entities':<32} {'bytes/row':>10} {'MB per 1M':>10} {'get_all s':>10}")
+        for name, load in loaders.items():
+            per_row = retained_bytes(load) / args.rows
+            print(f"{name:<32} {per_row:>10.0f} {per_row * 1_000_000 / 2**20:>10.0f} {best_time(load):>10.3f}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
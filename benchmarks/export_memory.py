@@ -0,0 +1,73 @@
+"""
+Peak memory of a full organisation export, buffered vs streamed.
+
+Usage:
+    python -m benchmarks.export_memory [ROWS ...]
+
+The buffered path mirrors the list endpoint (get_all -> to_dict -> one JSON
+body); the streamed path is what GET /organisation/export sends. The
+streamed peak should stay flat as the row count grows.
+"""
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from api.export import ndjson_chunks
+from repositories.organisation_repository import OrganisationRepository
+
+DEFAULT_ROWS = [1_000, 10_000, 50_000]
+
+
+def populate(repository: OrganisationRepository, rows: int) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    with repository._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO organisations (created_at, details, name, tags, updated_at, url) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (now, f"Details for organisation {i} " * 4, f"Organisation {i}",
+                 json.dumps(["benchmark", f"tag{i % 50}"]), now, f"https://org{i}.example.com")
+                for i in range(rows)
+            )
+        )
+
+
+def buffered_export(repository: OrganisationRepository) -> None:
+    body = json.dumps([org.to_dict() for org in repository.get_all()])
+    assert body
+
+
+def streamed_export(repository: OrganisationRepository) -> None:
+    for chunk in ndjson_chunks(repository.iter_batches(1000)):
+        assert chunk
+
+
+def peak_kib(run: Callable[[OrganisationRepository], None], repository: OrganisationRepository) -> float:
+    tracemalloc.start()
+    run(repository)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(row_counts: List[int]) -> None:
+    print(f"{'rows':>10} {'buffered KiB':>14} {'streamed KiB':>14}")
+    for rows in row_counts:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            repository = OrganisationRepository(path)
+            populate(repository, rows)
+            buffered = peak_kib(buffered_export, repository)
+            streamed = peak_kib(streamed_export, repository)
+            print(f"{rows:>10} {buffered:>14.0f} {streamed:>14.0f}")
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_ROWS)
@@ -0,0 +1,195 @@
+"""
+In-process HTTP load test against the FastAPI app on the synthetic dataset.
+
+Usage:
+    python -m benchmarks.load [--db bench.db] [--clients 32] [--requests 3000]
+                              [--scenario NAME ...] [--save-baseline] [--fail-on-regression]
+
+Generates (or reuses) the deterministic dataset from ``benchmarks.dataset``,
+points the application at it and drives each scenario with --clients
+concurrent clients through httpx's ASGI transport, so no server process or
+network is involved. Each scenario reports requests/s, p50/p99 latency and the
+process's peak RSS so far. Peak RSS includes database pages SQLite has
+memory-mapped (DB_MMAP_SIZE), counted once per pooled connection, so
+scenarios that touch many pages show growth that is not Python heap.
+
+Results are compared with the stored baseline (benchmarks/baselines/load.json
+by default) when it was recorded with the same dataset and client count:
+throughput lower, or latency/RSS higher, than the baseline by more than
+--tolerance is flagged as a regression. --save-baseline replaces the baseline
+with this run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.dataset import LAST_NAMES, DatasetSpec, ensure_dataset
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "load.json")
+
+# name -> builds a request path from an rng and the dataset spec
+SCENARIOS: Dict[str, Callable[[random.Random, DatasetSpec], str]] = {
+    "get_organisation": lambda rng, spec: f"/api/v1/organisation/{rng.randint(1, spec.organisations)}",
+    "list_organisations": lambda rng, spec: (
+        f"/api/v1/organisation?limit=100&after_id={rng.randint(0, spec.organisations - 100)}"
+    ),
+    "list_organisations_by_tag": lambda rng, spec: (
+        f"/api/v1/organisation?limit=50&tag={rng.choice(('ai', 'cloud', 'finance', 'retail'))}"
+    ),
+    "get_employee": lambda rng, spec: f"/api/v1/employee/{rng.randint(1, spec.employees)}",
+    "list_employees": lambda rng, spec: (
+        f"/api/v1/employee?limit=100&after_id={rng.randint(0, spec.employees - 100)}"
+    ),
+    "organisation_employees": lambda rng, spec: (
+        f"/api/v1/organisation/{rng.randint(1, spec.organisations)}/employees?limit=50"
+    ),
+    "search": lambda rng, spec: f"/api/v1/search?q={rng.choice(LAST_NAMES)[:4]}+{rng.randrange(spec.organisations)}",
+}
+
+# Metric -> direction in which a change is a regression.
+HIGHER_IS_BETTER = {"requests_per_second": True, "p50_ms": False, "p99_ms": False, "peak_rss_mb": False}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def summarise(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run_scenario(
+    app: Callable,
+    build_path: Callable[[random.Random, DatasetSpec], str],
+    spec: DatasetSpec,
+    clients: int,
+    requests: int,
+    warmup: int = 200
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        warmup_rng = random.Random("warmup")
+        for _ in range(warmup):
+            (await http.get(build_path(warmup_rng, spec))).raise_for_status()
+
+        remaining = [requests]
+
+        async def client_loop(rng: random.Random) -> None:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                path = build_path(rng, spec)
+                started = time.perf_counter()
+                response = await http.get(path)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(random.Random(seed)) for seed in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return summarise(latencies, elapsed)
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def regressions(current: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    flagged = []
+    for metric, higher_is_better in HIGHER_IS_BETTER.items():
+        if metric not in baseline or not baseline[metric]:
+            continue
+        change = current[metric] / baseline[metric] - 1
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            flagged.append(f"{metric} {baseline[metric]:.1f} -> {current[metric]:.1f} ({change:+.0%})")
+    return flagged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--organisations", type=int, default=DatasetSpec.organisations)
+    parser.add_argument("--employees", type=int, default=DatasetSpec.employees)
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=3000, help="measured requests per scenario")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(args.organisations, args.employees, args.seed)
+    ensure_dataset(args.db, spec, verbose=True)
+    # The application reads its configuration at import time.
+    os.environ["DB_PATH"] = args.db
+    from main import app
+    from api.dependencies import close_container
+
+    baseline = load_baseline(args.baseline)
+    comparable = (
+        baseline is not None
+        and baseline.get("dataset") == asdict(spec)
+        and baseline.get("clients") == args.clients
+    )
+    if baseline is not None and not comparable:
+        print(f"Baseline {args.baseline} was recorded with another dataset or client count; not comparing.")
+
+    results: Dict[str, Dict[str, float]] = {}
+    flagged: Dict[str, List[str]] = {}
+    print(f"{'scenario':<26} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}  baseline")
+    try:
+        for name in args.scenario:
+            result = asyncio.run(run_scenario(app, SCENARIOS[name], spec, args.clients, args.requests))
+            results[name] = result
+            previous = baseline["results"].get(name) if comparable else None
+            if previous is None:
+                verdict = "-"
+            else:
+                flagged[name] = regressions(result, previous, args.tolerance)
+                verdict = "REGRESSION: " + "; ".join(flagged[name]) if flagged[name] else "ok"
+            print(
+                f"{name:<26} {result['requests_per_second']:>9.0f} {result['p50_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['peak_rss_mb']:>12.0f}  {verdict}"
+            )
+    finally:
+        close_container()
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        merged = dict(baseline["results"]) if comparable else {}
+        merged.update(results)
+        with open(args.baseline, "w") as handle:
+            json.dump({"dataset": asdict(spec), "clients": args.clients, "results": merged}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    if args.fail_on_regression and any(flagged.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
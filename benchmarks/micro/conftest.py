@@ -0,0 +1,28 @@
+import os
+import pytest
+from benchmarks.dataset import DatasetSpec, ensure_dataset
+from repositories.employee_repository import EmployeeRepository
+from repositories.organisation_repository import OrganisationRepository
+
+# Override with BENCH_DB / BENCH_ORGANISATIONS / BENCH_EMPLOYEES for a smaller or shared dataset.
+SPEC = DatasetSpec(
+    organisations=int(os.getenv("BENCH_ORGANISATIONS", DatasetSpec.organisations)),
+    employees=int(os.getenv("BENCH_EMPLOYEES", DatasetSpec.employees)),
+)
+
+
+@pytest.fixture(scope="session")
+def dataset_path():
+    path = os.getenv("BENCH_DB", "bench.db")
+    ensure_dataset(path, SPEC, verbose=True)
+    return path
+
+
+@pytest.fixture(scope="session")
+def organisation_repository(dataset_path):
+    return OrganisationRepository(dataset_path)
+
+
+@pytest.fixture(scope="session")
+def employee_repository(dataset_path):
+    return EmployeeRepository(dataset_path)
@@ -0,0 +1,50 @@
+import itertools
+import pytest
+from repositories.query import PageQuery
+from benchmarks.micro.conftest import SPEC
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _cycle(stop: int, step: int):
+    # Walk the id space so each round reads different rows, not one cached page.
+    return itertools.cycle(range(1, stop, step))
+
+
+def test_get_organisation_by_id(benchmark, organisation_repository):
+    ids = _cycle(SPEC.organisations, 97)
+    benchmark(lambda: organisation_repository.get_by_id(next(ids)))
+
+
+def test_get_employee_by_id(benchmark, employee_repository):
+    ids = _cycle(SPEC.employees, 7919)
+    benchmark(lambda: employee_repository.get_by_id(next(ids)))
+
+
+def test_organisation_page(benchmark, organisation_repository):
+    cursors = _cycle(SPEC.organisations - 100, 997)
+    benchmark(lambda: organisation_repository.query(PageQuery(after_id=next(cursors), limit=100)))
+
+
+def test_organisation_page_by_tag(benchmark, organisation_repository):
+    benchmark(organisation_repository.query, PageQuery(limit=50, filters={"tag": "ai"}))
+
+
+def test_employee_page_json(benchmark, employee_repository):
+    cursors = _cycle(SPEC.employees - 100, 99991)
+    benchmark(lambda: employee_repository.query_json(PageQuery(after_id=next(cursors), limit=100)))
+
+
+def test_employees_of_organisation_json(benchmark, employee_repository):
+    organisations = _cycle(SPEC.organisations, 37)
+    benchmark(lambda: employee_repository.query_json(
+        PageQuery(limit=50, filters={"organisation_id": next(organisations)})
+    ))
+
+
+def test_employee_counts_for_a_page_of_organisations(benchmark, employee_repository):
+    benchmark(employee_repository.count_by_organisation, list(range(1, 101)))
+
+
+def test_tag_counts(benchmark, organisation_repository):
+    benchmark(organisation_repository.tag_counts)
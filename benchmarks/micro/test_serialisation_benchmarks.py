@@ -0,0 +1,33 @@
+import pytest
+from typing import List
+from pydantic import TypeAdapter
+from api.employee_schemas import EmployeeResponse
+from api.responses import entity_response, json_array_response
+from repositories.query import PageQuery
+
+pytest.importorskip("pytest_benchmark")
+
+EMPLOYEE_LIST = TypeAdapter(List[EmployeeResponse])
+
+
+@pytest.fixture(scope="module")
+def employee_page(employee_repository):
+    return employee_repository.query(PageQuery(limit=1000))
+
+
+@pytest.fixture(scope="module")
+def employee_documents(employee_repository):
+    return [document for _, document in employee_repository.query_json(PageQuery(limit=1000))]
+
+
+def test_sql_rendered_list_1000(benchmark, employee_documents):
+    benchmark(lambda: json_array_response(employee_documents).body)
+
+
+def test_pydantic_list_1000(benchmark, employee_page):
+    benchmark(lambda: EMPLOYEE_LIST.dump_json(EMPLOYEE_LIST.validate_python([e.to_dict() for e in employee_page])))
+
+
+def test_orjson_entity(benchmark, employee_page):
+    employee = employee_page[0]
+    benchmark(lambda: entity_response(employee).body)
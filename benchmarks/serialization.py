@@ -0,0 +1,84 @@
+"""
+List response serialisation cost per entity count.
+
+Usage:
+    python -m benchmarks.serialization [--counts 10 100 1000 10000] [--repeat 5]
+
+Compares the previous list path (rows -> Organisation -> to_dict -> Pydantic
+validation against List[OrganisationResponse] -> JSON) with the current one
+(SQLite renders each row with json_object and the documents are joined into
+the response body). Both include the database query; the best of --repeat
+runs is reported.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from api.responses import json_array_response
+from api.schemas import OrganisationResponse
+from models.entity import Organisation
+from repositories.organisation_repository import OrganisationRepository
+from repositories.query import PageQuery
+
+LIST_ADAPTER = TypeAdapter(List[OrganisationResponse])
+
+
+def model_path(repository: OrganisationRepository, limit: int) -> bytes:
+    content = [org.to_dict() for org in repository.query(PageQuery(limit=limit))]
+    validated = LIST_ADAPTER.validate_python(content)
+    return json.dumps(LIST_ADAPTER.dump_python(validated, mode="json")).encode()
+
+
+def sql_json_path(repository: OrganisationRepository, limit: int) -> bytes:
+    rows = repository.query_json(PageQuery(limit=limit))
+    return json_array_response(document for _, document in rows).body
+
+
+def best_of(function: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        repository = OrganisationRepository(path)
+        repository.create_many([
+            Organisation(
+                name=f"Organisation {i}",
+                details="Seeded for the serialisation benchmark",
+                tags=["bench", f"group-{i % 20}"],
+                url=f"https://org{i}.example.com"
+            )
+            for i in range(max(args.counts))
+        ])
+
+        print(f"{'entities':>9} {'model ms':>10} {'sql json ms':>12} {'speedup':>8}")
+        for count in args.counts:
+            assert json.loads(model_path(repository, count)) == json.loads(sql_json_path(repository, count))
+            before = best_of(lambda: model_path(repository, count), args.repeat)
+            after = best_of(lambda: sql_json_path(repository, count), args.repeat)
+            print(f"{count:>9} {before * 1000:>10.2f} {after * 1000:>12.2f} {before / after:>7.1f}x")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Check the per-organisation employee summaries against the employees table.
+
+Usage:
+    python check_summaries.py
+    python check_summaries.py --rebuild
+
+Recounts every organisation's employees and lists the organisations whose
+row in ``organisation_summaries`` disagrees. The table is kept up to date by
+triggers, so a mismatch means it was written to directly or the triggers
+were dropped. ``--rebuild`` recomputes the whole table in the same
+transaction. Exits with status 1 if mismatches were found and not rebuilt.
+"""
+import argparse
+import sys
+
+from api.config import DB_PATH
+from repositories.employee_repository import EmployeeRepository
+
+MAX_LISTED = 20
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="recompute the table if it is inconsistent")
+    args = parser.parse_args()
+
+    mismatched = EmployeeRepository(args.db).verify_summaries(rebuild=args.rebuild)
+    if not mismatched:
+        print("Organisation summaries are consistent")
+        return 0
+    listed = ", ".join(str(organisation_id) for organisation_id in mismatched[:MAX_LISTED])
+    more = f" and {len(mismatched) - MAX_LISTED:,} more" if len(mismatched) > MAX_LISTED else ""
+    print(f"{len(mismatched):,} inconsistent organisation summaries: {listed}{more}")
+    if args.rebuild:
+        print("Rebuilt organisation summaries")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Bulk import organisations or employees from CSV or NDJSON.
+
+Usage:
+    python import_data.py organisations orgs.csv
+    python import_data.py employees employees.ndjson.gz --chunk-size 100000
+
+CSV files need a header row; NDJSON files (``.ndjson``, ``.jsonl``) hold
+one object per line. Either may be gzip-compressed. Columns match the export
+endpoints, so an export can be imported again as-is: ``id``, ``created_at``
+and ``updated_at`` are optional, and organisation ``tags`` are a JSON list.
+Unknown columns are ignored.
+
+    python import_data.py --resume
+
+restores the indexes and triggers that an interrupted import dropped. Run
+it only when no import is running: a running import owns them until it ends.
+"""
+import argparse
+import sys
+
+from api.config import DB_PATH
+from repositories.bulk_import import TARGETS, BulkImporter, BulkImportError, ImportStats
+
+
+def print_progress(stats: ImportStats) -> None:
+    sys.stderr.write(f"\r{stats.inserted:>12,} rows  {stats.rows_per_second:>10,.0f} rows/s  {stats.failed:,} failed")
+    sys.stderr.flush()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("table", nargs="?", choices=sorted(TARGETS))
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per transaction")
+    parser.add_argument("--keep-indexes", action="store_true", help="do not drop indexes during the load")
+    parser.add_argument("--strict", action="store_true", help="abort on the first invalid row")
+    parser.add_argument("--resume", action="store_true", help="finish an interrupted import and exit")
+    args = parser.parse_args()
+
+    importer = BulkImporter(args.db, args.chunk_size, drop_indexes=not args.keep_indexes, strict=args.strict)
+    if args.resume:
+        restored = importer.resume()
+        print(f"Restored {restored} deferred statements" if restored else "No interrupted import to resume")
+        return 0
+    if args.table is None or args.path is None:
+        parser.error("table and path are required unless --resume is given")
+    try:
+        stats = importer.import_file(args.table, args.path, args.format, progress=print_progress)
+    except (BulkImportError, OSError) as exc:
+        sys.stderr.write(f"\nImport failed: {exc}\n")
+        return 1
+    sys.stderr.write("\n")
+    print(
+        f"Imported {stats.inserted:,} of {stats.read:,} {args.table} in {stats.seconds:.1f}s "
+        f"({stats.rows_per_second:,.0f} rows/s); {stats.failed:,} failed"
+    )
+    for line, message in stats.errors:
+        print(f"  line {line}: {message}")
+    if stats.failed > len(stats.errors):
+        print(f"  ... and {stats.failed - len(stats.errors):,} more")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers import organisation_router, employee_router, health_router
-from api.config import APP_VERSION, API_VERSION, API_PREFIX
+from api.routers import organisation_router, employee_router, health_router, metrics_router, search_router, changes_router, events_router
+from api.config import (
+    APP_VERSION,
+    API_VERSION,
+    API_PREFIX,
+    COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_CODECS,
+    METRICS_ENABLED,
+    SERVER_TIMING_ENABLED,
+    PROFILING_ENABLED,
+    PROFILE_DIR,
+)
+from api.compression import CompressionMiddleware
+from api.dependencies import init_container, close_container
+from api.pagination import NEXT_CURSOR_HEADER, NEXT_OFFSET_HEADER, NEXT_SINCE_HEADER
+from observability.middleware import DiagnosticsMiddleware, MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.container = init_container()
+    yield
+    close_container()
 
-app = FastAPI(title="Organisation API", version=APP_VERSION)
+
+app = FastAPI(title="Organisation API", version=APP_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,11 +35,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", NEXT_CURSOR_HEADER, NEXT_OFFSET_HEADER, NEXT_SINCE_HEADER, "Server-Timing", "X-Profile-File"],
 )
 
+# Inside the diagnostics and metrics middleware, so Server-Timing includes
+# compression and response sizes are bytes on the wire.
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE, codecs=COMPRESSION_CODECS)
+
+app.add_middleware(
+    DiagnosticsMiddleware,
+    server_timing=SERVER_TIMING_ENABLED,
+    profiling=PROFILING_ENABLED,
+    profile_dir=PROFILE_DIR,
+)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(organisation_router, prefix=API_PREFIX)
 app.include_router(employee_router, prefix=API_PREFIX)
 app.include_router(health_router, prefix=API_PREFIX)
+app.include_router(metrics_router, prefix=API_PREFIX)
+app.include_router(search_router, prefix=API_PREFIX)
+app.include_router(changes_router, prefix=API_PREFIX)
+app.include_router(events_router, prefix=API_PREFIX)
 
 
 @app.get("/")
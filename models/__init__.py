@@ -1,3 +1,4 @@
+from .base import Entity
 from .entity import Organisation
 
-__all__ = ['Organisation']
+__all__ = ['Entity', 'Organisation']
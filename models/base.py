@@ -0,0 +1,22 @@
+from typing import Any, Tuple
+
+class Entity:
+    """Base for slotted entities.
+
+    Subclasses list their public attributes in ``FIELDS`` (in ``to_dict``
+    order). Expensive attributes are stored in their encoded form (ISO
+    strings, JSON text) and decoded on first access by the subclass.
+    """
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{self.__class__.__name__}({values})"
@@ -1,28 +1,110 @@
-from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import Optional
+from typing import Optional, Union
+from models.base import Entity
 
-@dataclass
-class Employee:
-    name: str
-    last_name: str
-    age: int
-    date_of_birth: date
-    location: str
-    organisation_id: int
-    id: Optional[int] = None
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
+class Employee(Entity):
+    __slots__ = (
+        'id', 'name', 'last_name', 'age', '_date_of_birth', 'location',
+        'organisation_id', '_created_at', '_updated_at'
+    )
+    FIELDS = (
+        'id', 'name', 'last_name', 'age', 'date_of_birth', 'location',
+        'organisation_id', 'created_at', 'updated_at'
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        last_name: str,
+        age: int,
+        date_of_birth: date,
+        location: str,
+        organisation_id: int,
+        id: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.name = name
+        self.last_name = last_name
+        self.age = age
+        self._date_of_birth: Union[date, str, None] = date_of_birth
+        self.location = location
+        self.organisation_id = organisation_id
+        self._created_at: Union[datetime, str, None] = created_at
+        self._updated_at: Union[datetime, str, None] = updated_at
+    
+    @classmethod
+    def from_encoded(
+        cls,
+        id: Optional[int] = None,
+        name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        age: Optional[int] = None,
+        date_of_birth: Optional[str] = None,
+        location: Optional[str] = None,
+        organisation_id: Optional[int] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None
+    ) -> 'Employee':
+        """Build from stored values; dates are decoded on first access."""
+        employee = cls.__new__(cls)
+        employee.id = id
+        employee.name = name
+        employee.last_name = last_name
+        employee.age = age
+        employee._date_of_birth = date_of_birth
+        employee.location = location
+        employee.organisation_id = organisation_id
+        employee._created_at = created_at
+        # Rows that were never updated carry two equal strings; keep one.
+        employee._updated_at = created_at if updated_at == created_at else updated_at
+        return employee
+    
+    @property
+    def date_of_birth(self) -> Optional[date]:
+        value = self._date_of_birth
+        if value.__class__ is str:
+            value = self._date_of_birth = date.fromisoformat(value)
+        return value
+    
+    @date_of_birth.setter
+    def date_of_birth(self, value: Optional[date]) -> None:
+        self._date_of_birth = value
+    
+    @property
+    def created_at(self) -> Optional[datetime]:
+        value = self._created_at
+        if value.__class__ is str:
+            value = self._created_at = datetime.fromisoformat(value)
+        return value
+    
+    @created_at.setter
+    def created_at(self, value: Optional[datetime]) -> None:
+        self._created_at = value
+    
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        value = self._updated_at
+        if value.__class__ is str:
+            value = self._updated_at = datetime.fromisoformat(value)
+        return value
+    
+    @updated_at.setter
+    def updated_at(self, value: Optional[datetime]) -> None:
+        self._updated_at = value
     
     def to_dict(self) -> dict:
+        # Undecoded values are already in isoformat() form.
+        date_of_birth, created_at, updated_at = self._date_of_birth, self._created_at, self._updated_at
         return {
             'id': self.id,
             'name': self.name,
             'last_name': self.last_name,
             'age': self.age,
-            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
+            'date_of_birth': date_of_birth.isoformat() if isinstance(date_of_birth, date) else date_of_birth,
             'location': self.location,
             'organisation_id': self.organisation_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+            'updated_at': updated_at.isoformat() if isinstance(updated_at, datetime) else updated_at,
         }
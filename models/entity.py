@@ -1,23 +1,94 @@
-from dataclasses import dataclass, field
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
+from models.base import Entity
 
-@dataclass
-class Organisation:
-    name: str
-    id: Optional[int] = None
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
-    details: Optional[str] = None
-    tags: List[str] = field(default_factory=list)
-    url: Optional[str] = None
+class Organisation(Entity):
+    __slots__ = ('id', 'name', '_created_at', '_updated_at', 'details', '_tags', 'url')
+    FIELDS = ('id', 'name', 'created_at', 'updated_at', 'details', 'tags', 'url')
+    
+    def __init__(
+        self,
+        name: str,
+        id: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        details: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        url: Optional[str] = None
+    ):
+        self.id = id
+        self.name = name
+        self._created_at: Union[datetime, str, None] = created_at
+        self._updated_at: Union[datetime, str, None] = updated_at
+        self.details = details
+        self._tags: Union[List[str], str, None] = tags if tags is not None else []
+        self.url = url
+    
+    @classmethod
+    def from_encoded(
+        cls,
+        id: Optional[int] = None,
+        name: Optional[str] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        details: Optional[str] = None,
+        tags: Optional[str] = None,
+        url: Optional[str] = None
+    ) -> 'Organisation':
+        """Build from stored values; timestamps and tags are decoded on first access."""
+        org = cls.__new__(cls)
+        org.id = id
+        org.name = name
+        org._created_at = created_at
+        # Rows that were never updated carry two equal strings; keep one.
+        org._updated_at = created_at if updated_at == created_at else updated_at
+        org.details = details
+        org._tags = tags
+        org.url = url
+        return org
+    
+    @property
+    def created_at(self) -> Optional[datetime]:
+        value = self._created_at
+        if value.__class__ is str:
+            value = self._created_at = datetime.fromisoformat(value)
+        return value
+    
+    @created_at.setter
+    def created_at(self, value: Optional[datetime]) -> None:
+        self._created_at = value
+    
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        value = self._updated_at
+        if value.__class__ is str:
+            value = self._updated_at = datetime.fromisoformat(value)
+        return value
+    
+    @updated_at.setter
+    def updated_at(self, value: Optional[datetime]) -> None:
+        self._updated_at = value
+    
+    @property
+    def tags(self) -> List[str]:
+        value = self._tags
+        if value.__class__ is not list:
+            value = self._tags = json.loads(value) if value else []
+        return value
+    
+    @tags.setter
+    def tags(self, value: List[str]) -> None:
+        self._tags = value
     
     def to_dict(self) -> dict:
+        # Undecoded timestamps are already in isoformat() form.
+        created_at, updated_at = self._created_at, self._updated_at
         return {
             'id': self.id,
             'name': self.name,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+            'updated_at': updated_at.isoformat() if isinstance(updated_at, datetime) else updated_at,
             'details': self.details,
             'tags': self.tags,
             'url': self.url
@@ -0,0 +1,8 @@
+from .metrics import REGISTRY, Counter, Gauge, Histogram, MetricsRegistry
+from .diagnostics import RequestTimings, record_phase, timed_phase
+from .middleware import DiagnosticsMiddleware, MetricsMiddleware
+
+__all__ = [
+    'REGISTRY', 'Counter', 'Gauge', 'Histogram', 'MetricsRegistry', 'MetricsMiddleware',
+    'DiagnosticsMiddleware', 'RequestTimings', 'record_phase', 'timed_phase'
+]
@@ -0,0 +1,114 @@
+import cProfile
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Phases reported in Server-Timing, in display order.
+PHASES = ("queue", "db", "decode", "serialise", "compress")
+
+
+class RequestTimings:
+    """Per-request phase durations, shared with executor threads via contextvars."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        durations = dict(self.durations)
+        # The repository call covers SQL plus turning rows into entities.
+        if "repository" in durations:
+            durations["decode"] = max(0.0, durations.pop("repository") - durations.get("db", 0.0))
+        entries = [f"{phase};dur={durations[phase] * 1000:.2f}" for phase in PHASES if phase in durations]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+class ProfileSession:
+    """One cProfile per thread that worked on the request, merged when dumped."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: List[cProfile.Profile] = []
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def dump(self, path: str) -> None:
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_profile: ContextVar[Optional[ProfileSession]] = ContextVar("request_profile", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+@contextmanager
+def request_diagnostics(profile: Optional[ProfileSession] = None) -> Iterator[RequestTimings]:
+    timings = RequestTimings()
+    timings_token = _timings.set(timings)
+    profile_token = _profile.set(profile)
+    try:
+        yield timings
+    finally:
+        _profile.reset(profile_token)
+        _timings.reset(timings_token)
+
+
+def traced_call(function: Callable[..., Any], args: Sequence[Any], submitted: float) -> Any:
+    """Run ``function`` on an executor thread, attributing its time to the current request.
+
+    Must be called inside a copy of the submitting context so the request's
+    timings and profile session are visible here.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return function(*args)
+    started = time.perf_counter()
+    timings.add("queue", started - submitted)
+    session = _profile.get()
+    profiler = cProfile.Profile() if session is not None else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        return function(*args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            session.add(profiler)
+        timings.add("repository", time.perf_counter() - started)
@@ -0,0 +1,148 @@
+import cProfile
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Set
+from urllib.parse import parse_qsl
+
+from observability.diagnostics import ProfileSession, request_diagnostics
+from observability.metrics import REGISTRY, SIZE_BUCKETS, MetricsRegistry
+
+UNMATCHED_ROUTE = "<unmatched>"
+DEBUG_HEADER = b"x-debug"
+DEBUG_QUERY_PARAMETER = "_debug"
+SERVER_TIMING_HEADER = b"server-timing"
+PROFILE_FILE_HEADER = b"x-profile-file"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, in-flight requests and response sizes.
+
+    Written against raw ASGI rather than ``BaseHTTPMiddleware`` so it adds no
+    extra task or body buffering per request. Requests are labelled with the
+    route template (``/api/v1/organisation/{id}``), never the raw path, to keep
+    label cardinality bounded.
+    """
+
+    def __init__(self, app: Callable, registry: MetricsRegistry = REGISTRY):
+        self.app = app
+        self.requests = registry.counter(
+            "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+        )
+        self.latency = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+        )
+        self.response_size = registry.histogram(
+            "http_response_size_bytes", "HTTP response body size.", ("method", "route"), SIZE_BUCKETS
+        )
+        self.in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message: Dict[str, Any]) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = self.in_flight.labels()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            in_flight.dec()
+            # FastAPI records the matched route in the scope during routing.
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            self.latency.labels(method, template).observe(time.perf_counter() - started)
+            self.response_size.labels(method, template).observe(size)
+            self.requests.labels(method, template, str(status)).inc()
+
+
+class DiagnosticsMiddleware:
+    """Opt-in per-request timing breakdown and profile.
+
+    A request opts in with ``X-Debug: timing`` (or ``?_debug=timing``) to get
+    a ``Server-Timing`` header splitting the time into executor queueing,
+    SQL, row decoding and serialisation. ``profile`` additionally runs the
+    request under cProfile, one profiler per thread that worked on it, and
+    writes the merged stats to ``profile_dir``; the file name is returned in
+    ``X-Profile-File``. Only one request is profiled at a time, and the
+    event-loop profile also sees any other request the loop served meanwhile.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        server_timing: bool = True,
+        profiling: bool = False,
+        profile_dir: str = "profiles"
+    ):
+        self.app = app
+        self.server_timing = server_timing
+        self.profiling = profiling
+        self.profile_dir = profile_dir
+        self._profile_lock = threading.Lock()
+
+    def _requested(self, scope: Dict[str, Any]) -> Set[str]:
+        values = [value.decode("latin-1") for name, value in scope["headers"] if name == DEBUG_HEADER]
+        values += [
+            value for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"))
+            if name == DEBUG_QUERY_PARAMETER
+        ]
+        return {flag.strip().lower() for value in values for flag in value.split(",")}
+
+    def _profile_name(self, scope: Dict[str, Any]) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{time.perf_counter_ns() % 10**6:06d}-{scope['method']}-{slug}.prof"
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not (self.server_timing or self.profiling):
+            await self.app(scope, receive, send)
+            return
+        flags = self._requested(scope)
+        profile = self.profiling and "profile" in flags
+        if not (profile or (self.server_timing and "timing" in flags)):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession() if profile and self._profile_lock.acquire(blocking=False) else None
+        profile_name = self._profile_name(scope) if session is not None else None
+        started = time.perf_counter()
+
+        with request_diagnostics(session) as timings:
+            async def send_with_timing(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((SERVER_TIMING_HEADER, timings.server_timing(time.perf_counter() - started).encode()))
+                    if profile_name is not None:
+                        headers.append((PROFILE_FILE_HEADER, profile_name.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            if session is None:
+                await self.app(scope, receive, send_with_timing)
+                return
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                profiler.disable()
+                session.add(profiler)
+                try:
+                    os.makedirs(self.profile_dir, exist_ok=True)
+                    session.dump(os.path.join(self.profile_dir, profile_name))
+                finally:
+                    self._profile_lock.release()
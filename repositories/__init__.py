@@ -1,4 +1,6 @@
 from .base import IRepository
+from .cached_repository import CachedRepository, CacheStats
+from .connection_pool import ConnectionPool, PoolStats, PoolTimeoutError
 from .organisation_repository import OrganisationRepository
 
-__all__ = ['IRepository', 'OrganisationRepository']
+__all__ = ['IRepository', 'CachedRepository', 'CacheStats', 'ConnectionPool', 'PoolStats', 'PoolTimeoutError', 'OrganisationRepository']
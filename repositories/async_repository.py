@@ -0,0 +1,195 @@
+import asyncio
+import contextvars
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Generator, Generic, List, Optional, Sequence, Tuple, TypeVar
+from observability.diagnostics import traced_call
+from repositories.base import IRepository, T
+from repositories.bulk import BulkResult, Changes
+from repositories.change_repository import CHANGE_KINDS, ChangeRepository
+from repositories.query import PageQuery
+from repositories.search_repository import SEARCH_KINDS, SearchRepository
+
+
+class IAsyncRepository(ABC, Generic[T]):
+    @abstractmethod
+    async def get_all(self) -> List[T]:
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, id: int) -> Optional[T]:
+        pass
+
+    @abstractmethod
+    async def query(self, query: PageQuery) -> List[T]:
+        pass
+
+    @abstractmethod
+    async def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        pass
+
+    @abstractmethod
+    def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[T]]:
+        pass
+
+    @abstractmethod
+    async def table_version(self) -> int:
+        pass
+
+    @abstractmethod
+    async def create(self, entity: T) -> T:
+        pass
+
+    @abstractmethod
+    async def update(self, id: int, entity: T) -> Optional[T]:
+        pass
+
+    @abstractmethod
+    async def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[T]:
+        pass
+
+    @abstractmethod
+    async def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        pass
+
+    @abstractmethod
+    async def create_many(self, entities: Sequence[T], chunk_size: int = 500) -> BulkResult:
+        pass
+
+    @abstractmethod
+    async def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        pass
+
+    @abstractmethod
+    async def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        pass
+
+
+async def run_on_executor(executor: Executor, function: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    # run_in_executor does not carry contextvars over, so run the call
+    # in a copy of this context to keep request diagnostics attached.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, context.run, traced_call, function, args, time.perf_counter())
+
+
+Item = TypeVar('Item')
+
+
+async def iterate_on_executor(executor: Executor, items: Generator[Item, None, None]) -> AsyncIterator[Item]:
+    """Drive a blocking generator on ``executor``, closing it however iteration ends."""
+    try:
+        while True:
+            item = await run_on_executor(executor, next, items, None)
+            if item is None:
+                break
+            yield item
+    finally:
+        await run_on_executor(executor, items.close)
+
+
+class ExecutorRepository(IAsyncRepository[T]):
+    """Async facade that runs a synchronous repository on a dedicated executor.
+
+    sqlite3 has no non-blocking API, so the blocking call still happens on a
+    thread, but on an executor sized to the connection pool rather than on
+    Starlette's shared request thread pool. The event loop only waits on the
+    database call itself; validation and serialisation stay on the loop.
+    """
+
+    def __init__(self, repository: IRepository[T], executor: Executor):
+        self._repository = repository
+        self._executor = executor
+
+    @property
+    def repository(self) -> IRepository[T]:
+        return self._repository
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        return await run_on_executor(self._executor, function, *args)
+
+    async def get_all(self) -> List[T]:
+        return await self._run(self._repository.get_all)
+
+    async def get_by_id(self, id: int) -> Optional[T]:
+        return await self._run(self._repository.get_by_id, id)
+
+    async def query(self, query: PageQuery) -> List[T]:
+        return await self._run(self._repository.query, query)
+
+    async def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return await self._run(self._repository.query_json, query)
+
+    def iter_batches(self, batch_size: int = 1000) -> AsyncIterator[List[T]]:
+        return iterate_on_executor(self._executor, self._repository.iter_batches(batch_size))
+
+    async def table_version(self) -> int:
+        return await self._run(self._repository.table_version)
+
+    async def create(self, entity: T) -> T:
+        return await self._run(self._repository.create, entity)
+
+    async def update(self, id: int, entity: T) -> Optional[T]:
+        return await self._run(self._repository.update, id, entity)
+
+    async def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[T]:
+        return await self._run(self._repository.update_partial, id, changes, expected_updated_at)
+
+    async def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        return await self._run(self._repository.delete, id, expected_updated_at)
+
+    async def create_many(self, entities: Sequence[T], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._repository.create_many, entities, chunk_size)
+
+    async def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._repository.update_many, changes, chunk_size)
+
+    async def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._repository.delete_many, ids, chunk_size)
+
+
+class AsyncSearchRepository:
+    def __init__(self, repository: SearchRepository, executor: Executor):
+        self._repository = repository
+        self._executor = executor
+
+    async def search_json(
+        self,
+        text: str,
+        kinds: Sequence[str] = SEARCH_KINDS,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[str]:
+        return await run_on_executor(self._executor, self._repository.search_json, text, kinds, limit, offset)
+
+    async def table_versions(self) -> str:
+        return await run_on_executor(self._executor, self._repository.table_versions)
+
+
+class AsyncChangeRepository:
+    def __init__(self, repository: ChangeRepository, executor: Executor):
+        self._repository = repository
+        self._executor = executor
+
+    async def changes_json(
+        self,
+        since: int = 0,
+        kinds: Sequence[str] = CHANGE_KINDS,
+        limit: int = 100
+    ) -> List[Tuple[int, str]]:
+        return await run_on_executor(self._executor, self._repository.changes_json, since, kinds, limit)
+
+    async def latest_seq(self) -> int:
+        return await run_on_executor(self._executor, self._repository.latest_seq)
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Generic, TypeVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Generic, Sequence, Tuple, TypeVar
+from repositories.bulk import BulkResult, Changes
+from repositories.query import PageQuery
 
 T = TypeVar('T')
 
@@ -12,6 +15,22 @@ class IRepository(ABC, Generic[T]):
     def get_by_id(self, id: int) -> Optional[T]:
         pass
     
+    @abstractmethod
+    def query(self, query: PageQuery) -> List[T]:
+        pass
+    
+    @abstractmethod
+    def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        pass
+    
+    @abstractmethod
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[T]]:
+        pass
+    
+    @abstractmethod
+    def table_version(self) -> int:
+        pass
+    
     @abstractmethod
     def create(self, entity: T) -> T:
         pass
@@ -21,5 +40,26 @@ class IRepository(ABC, Generic[T]):
         pass
     
     @abstractmethod
-    def delete(self, id: int) -> bool:
+    def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[T]:
+        pass
+    
+    @abstractmethod
+    def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        pass
+    
+    @abstractmethod
+    def create_many(self, entities: Sequence[T], chunk_size: int = 500) -> BulkResult:
+        pass
+    
+    @abstractmethod
+    def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        pass
+    
+    @abstractmethod
+    def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
         pass
@@ -0,0 +1,151 @@
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Changes = Tuple[int, Dict[str, Any]]
+
+
+@dataclass
+class BulkItemResult:
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkResult:
+    items: List[BulkItemResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[BulkItemResult]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> List[BulkItemResult]:
+        return [item for item in self.items if not item.ok]
+
+
+def _existing_ids(conn: sqlite3.Connection, table: str, ids: Sequence[int]) -> set:
+    placeholders = ", ".join("?" for _ in ids)
+    rows = conn.execute(f"SELECT id FROM {table} WHERE id IN ({placeholders})", list(ids)).fetchall()
+    return {row[0] for row in rows}
+
+
+def _begin(conn: sqlite3.Connection) -> None:
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def _execute_chunk(
+    conn: sqlite3.Connection,
+    sql: str,
+    indexed_params: List[Tuple[int, Sequence[Any]]],
+    ids: Sequence[int],
+    result: BulkResult
+) -> None:
+    # Fast path: one executemany per chunk. If any row fails, roll the chunk
+    # back and replay it row by row so every failure is reported against its
+    # own item while the rest of the chunk still goes through.
+    conn.execute("SAVEPOINT bulk_chunk")
+    try:
+        conn.executemany(sql, [params for _, params in indexed_params])
+        result.items.extend(
+            BulkItemResult(index=index, id=item_id)
+            for (index, _), item_id in zip(indexed_params, ids)
+        )
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO bulk_chunk")
+        for (index, params), item_id in zip(indexed_params, ids):
+            try:
+                conn.execute(sql, params)
+                result.items.append(BulkItemResult(index=index, id=item_id))
+            except sqlite3.Error as exc:
+                result.items.append(BulkItemResult(index=index, error=str(exc)))
+    conn.execute("RELEASE bulk_chunk")
+
+
+def insert_many(
+    conn: sqlite3.Connection,
+    sql: str,
+    rows: Sequence[Sequence[Any]]
+) -> BulkResult:
+    # One execute per row, so each id is that row's own lastrowid rather than
+    # a guess that ids are consecutive. A failed INSERT leaves nothing behind,
+    # so the row is reported and the rest continue without a savepoint.
+    _begin(conn)
+    result = BulkResult()
+    cursor = conn.cursor()
+    for index, params in enumerate(rows):
+        try:
+            cursor.execute(sql, params)
+        except sqlite3.Error as exc:
+            result.items.append(BulkItemResult(index=index, error=str(exc)))
+        else:
+            result.items.append(BulkItemResult(index=index, id=cursor.lastrowid))
+    return result
+
+
+def update_many(
+    conn: sqlite3.Connection,
+    table: str,
+    changes: Sequence[Changes],
+    updatable_columns: Sequence[str],
+    updated_at: str,
+    chunk_size: int
+) -> BulkResult:
+    _begin(conn)
+    result = BulkResult()
+    for start in range(0, len(changes), chunk_size):
+        chunk = list(enumerate(changes[start:start + chunk_size], start))
+        existing = _existing_ids(conn, table, [id for _, (id, _) in chunk])
+        groups: Dict[Tuple[str, ...], List[Tuple[int, int, Dict[str, Any]]]] = {}
+        for index, (id, values) in chunk:
+            unknown = set(values) - set(updatable_columns)
+            if unknown:
+                error = f"Cannot update columns: {', '.join(sorted(unknown))}"
+                result.items.append(BulkItemResult(index=index, id=id, error=error))
+                continue
+            if id not in existing:
+                result.items.append(BulkItemResult(index=index, id=id, error="Not found"))
+                continue
+            groups.setdefault(tuple(sorted(values)), []).append((index, id, values))
+        # Items touching the same set of columns share one UPDATE statement.
+        for columns, items in groups.items():
+            assignments = ", ".join(f"{column} = ?" for column in columns + ("updated_at",))
+            sql = f"UPDATE {table} SET {assignments} WHERE id = ?"
+            indexed_params = [
+                (index, [values[column] for column in columns] + [updated_at, id])
+                for index, id, values in items
+            ]
+            _execute_chunk(conn, sql, indexed_params, [id for _, id, _ in items], result)
+    result.items.sort(key=lambda item: item.index)
+    return result
+
+
+def delete_many(
+    conn: sqlite3.Connection,
+    table: str,
+    ids: Sequence[int],
+    chunk_size: int
+) -> BulkResult:
+    _begin(conn)
+    result = BulkResult()
+    deleted: set = set()
+    for start in range(0, len(ids), chunk_size):
+        chunk = list(ids[start:start + chunk_size])
+        existing = _existing_ids(conn, table, chunk)
+        if existing:
+            placeholders = ", ".join("?" for _ in existing)
+            conn.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", list(existing))
+        for index, id in enumerate(chunk, start):
+            # A repeated id finds its row already gone.
+            if id in existing and id not in deleted:
+                deleted.add(id)
+                result.items.append(BulkItemResult(index=index, id=id))
+            else:
+                result.items.append(BulkItemResult(index=index, id=id, error="Not found"))
+    return result
@@ -0,0 +1,389 @@
+import csv
+import gzip
+import io
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from repositories.migrations import migrate
+
+Record = Dict[str, Any]
+# PRAGMAs for the import connection only; they die with it.
+IMPORT_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA temp_store = MEMORY",
+)
+MAX_REPORTED_ERRORS = 20
+
+
+class BulkImportError(Exception):
+    pass
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.inserted / self.seconds if self.seconds else 0.0
+
+    def record_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _required(record: Record, name: str) -> Any:
+    value = record.get(name)
+    if value is None or value == "":
+        raise ValueError(f"{name} is required")
+    return value
+
+
+def _optional(record: Record, name: str) -> Optional[Any]:
+    value = record.get(name)
+    return None if value == "" else value
+
+
+def _timestamp(record: Record, name: str, now: str) -> str:
+    value = _optional(record, name)
+    if value is None:
+        return now
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    # Stored timestamps are compared as text, so every one must be UTC in
+    # exactly the form isoformat() writes elsewhere.
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _tags(value: Any) -> str:
+    if value is None or value == "":
+        return "[]"
+    tags = orjson.loads(value) if isinstance(value, str) else value
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError("tags must be a list of strings")
+    return orjson.dumps(tags).decode()
+
+
+def _id(record: Record) -> Optional[int]:
+    value = _optional(record, 'id')
+    return None if value is None else int(value)
+
+
+def organisation_row(record: Record, now: str) -> tuple:
+    return (
+        _id(record),
+        str(_required(record, 'name')),
+        _optional(record, 'details'),
+        _tags(record.get('tags')),
+        _optional(record, 'url'),
+        _timestamp(record, 'created_at', now),
+        _timestamp(record, 'updated_at', now),
+    )
+
+
+def employee_row(record: Record, now: str) -> tuple:
+    return (
+        _id(record),
+        str(_required(record, 'name')),
+        str(_required(record, 'last_name')),
+        int(_required(record, 'age')),
+        date.fromisoformat(_required(record, 'date_of_birth')).isoformat(),
+        str(_required(record, 'location')),
+        int(_required(record, 'organisation_id')),
+        _timestamp(record, 'created_at', now),
+        _timestamp(record, 'updated_at', now),
+    )
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    table: str
+    columns: Tuple[str, ...]
+    to_row: Callable[[Record, str], tuple]
+    # Tables whose secondary indexes are written while loading this one,
+    # e.g. organisation_tags via the tag trigger.
+    indexed_tables: Tuple[str, ...]
+    # External-content FTS table fed by the insert trigger trg_<table>_fts_insert.
+    search_index: str
+    # Type recorded in the change log by the insert trigger trg_<table>_changes_insert.
+    change_type: str
+
+    @property
+    def insert_sql(self) -> str:
+        placeholders = ", ".join("?" for _ in self.columns)
+        return f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES ({placeholders})"
+
+
+TARGETS: Dict[str, ImportTarget] = {
+    'organisations': ImportTarget(
+        'organisations',
+        ('id', 'name', 'details', 'tags', 'url', 'created_at', 'updated_at'),
+        organisation_row,
+        ('organisations', 'organisation_tags'),
+        'organisations_fts',
+        'organisation',
+    ),
+    'employees': ImportTarget(
+        'employees',
+        ('id', 'name', 'last_name', 'age', 'date_of_birth', 'location', 'organisation_id', 'created_at', 'updated_at'),
+        employee_row,
+        ('employees',),
+        'employees_fts',
+        'employee',
+    ),
+}
+
+
+def open_input(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    raise BulkImportError(f"Cannot tell the format of {path}; pass it explicitly")
+
+
+def read_records(handle: IO[str], input_format: str) -> Iterator[Tuple[int, Any]]:
+    """Stream ``(line number, record)`` pairs; undecodable NDJSON lines yield the exception."""
+    if input_format == "csv":
+        reader = csv.DictReader(handle)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(handle, start=1):
+        if line.strip():
+            try:
+                yield line_number, orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                yield line_number, exc
+
+
+class BulkImporter:
+    """Streams CSV or NDJSON records into a table in large transactions.
+
+    Records are converted and inserted ``chunk_size`` at a time with one
+    ``executemany`` per chunk, each chunk in its own transaction. While the
+    load runs, the secondary indexes of the affected tables and the search
+    index and change log insert triggers are dropped. Afterwards the indexes
+    are recreated, the search index is rebuilt and the imported rows are
+    logged in one pass each, even when the import fails. The connection also
+    runs with relaxed durability PRAGMAs. The other triggers stay in place,
+    so derived tables and version counters stay consistent. A chunk
+    that fails is retried row by row; failing rows are reported and skipped,
+    or abort the import when ``strict`` is set.
+
+    Meant for offline loads: running API processes do not see imported
+    rows in their entity caches until the entries expire.
+    """
+
+    def __init__(self, db_path: str, chunk_size: int = 50_000, drop_indexes: bool = True, strict: bool = False):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self._db_path = db_path
+        self._chunk_size = chunk_size
+        self._drop_indexes = drop_indexes
+        self._strict = strict
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, isolation_level=None)
+        migrate(conn)
+        for pragma in IMPORT_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bulk_import_pending (name TEXT PRIMARY KEY, sql TEXT NOT NULL)"
+        )
+        return conn
+
+    def _check_nothing_pending(self, conn: sqlite3.Connection) -> None:
+        # Pending work belongs to the import that deferred it: one that is
+        # still loading, or one that was killed and needs resume().
+        if conn.execute("SELECT 1 FROM bulk_import_pending LIMIT 1").fetchone() is not None:
+            raise BulkImportError(
+                "Another import is running, or an interrupted one left indexes and triggers dropped; "
+                "resume it once no import is running"
+            )
+
+    def _defer_maintenance(self, conn: sqlite3.Connection, target: ImportTarget) -> int:
+        """Drop the target's secondary indexes, search and change log triggers until the load is done.
+
+        The statements that undo this are stored in ``bulk_import_pending``
+        in the same transaction, so a crash can never lose them. The search
+        index is rebuilt in one pass instead of row by row, and the imported
+        rows are added to the change log in one statement.
+        """
+        placeholders = ", ".join("?" for _ in target.indexed_tables)
+        search_trigger = f"trg_{target.table}_fts_insert"
+        change_trigger = f"trg_{target.table}_changes_insert"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._check_nothing_pending(conn)
+        except BulkImportError:
+            conn.execute("ROLLBACK")
+            raise
+        objects = conn.execute(
+            f"SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL AND ("
+            f"(type = 'index' AND tbl_name IN ({placeholders})) OR (type = 'trigger' AND name IN (?, ?))"
+            f") ORDER BY type, name",
+            [*target.indexed_tables, search_trigger, change_trigger]
+        ).fetchall()
+        pending = [(name, sql) for _, name, sql in objects]
+        dropped = {name for _, name, _ in objects}
+        if search_trigger in dropped:
+            pending.append((target.search_index, (
+                f"INSERT INTO {target.search_index} ({target.search_index}) VALUES ('rebuild')"
+            )))
+        if change_trigger in dropped:
+            # Rows already logged as live are the ones that existed before;
+            # the rest were imported, possibly over a tombstone.
+            pending.append((f"changes_{target.table}", (
+                f"INSERT OR REPLACE INTO changes (entity_type, entity_id) "
+                f"SELECT '{target.change_type}', id FROM {target.table} WHERE NOT EXISTS ("
+                f"SELECT 1 FROM changes WHERE entity_type = '{target.change_type}' "
+                f"AND entity_id = {target.table}.id AND deleted = 0"
+                f") ORDER BY id"
+            )))
+        conn.executemany("INSERT INTO bulk_import_pending (name, sql) VALUES (?, ?)", pending)
+        for object_type, name, _ in objects:
+            conn.execute(f"DROP {object_type.upper()} {name}")
+        conn.execute("COMMIT")
+        return len(pending)
+
+    def resume(self) -> int:
+        """Restore what an interrupted import dropped; returns the number of statements run.
+
+        Only safe while no other import is running against the database.
+        """
+        conn = self._connect()
+        try:
+            pending = conn.execute("SELECT COUNT(*) FROM bulk_import_pending").fetchone()[0]
+            if pending:
+                self._finish_deferred(conn)
+                conn.execute("ANALYZE")
+            return pending
+        finally:
+            conn.close()
+
+    def _finish_deferred(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        conn.execute("BEGIN IMMEDIATE")
+        for (statement,) in conn.execute("SELECT sql FROM bulk_import_pending ORDER BY rowid").fetchall():
+            conn.execute(statement)
+        conn.execute("DELETE FROM bulk_import_pending")
+        conn.execute("COMMIT")
+
+    def _insert_chunk(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        chunk: List[Tuple[int, tuple]],
+        stats: ImportStats
+    ) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            try:
+                conn.executemany(sql, [row for _, row in chunk])
+                stats.inserted += len(chunk)
+            except sqlite3.Error:
+                # executemany is all or nothing per statement batch; find the bad rows one by one.
+                conn.execute("ROLLBACK")
+                conn.execute("BEGIN IMMEDIATE")
+                for line, row in chunk:
+                    try:
+                        conn.execute(sql, row)
+                        stats.inserted += 1
+                    except sqlite3.Error as exc:
+                        if self._strict:
+                            raise BulkImportError(f"line {line}: {exc}") from exc
+                        stats.record_error(line, str(exc))
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def import_records(
+        self,
+        table: str,
+        records: Iterator[Tuple[int, Any]],
+        progress: Optional[Callable[[ImportStats], None]] = None
+    ) -> ImportStats:
+        target = TARGETS.get(table)
+        if target is None:
+            raise BulkImportError(f"Unknown table {table!r}; expected one of {', '.join(TARGETS)}")
+        stats = ImportStats()
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc).isoformat()
+        sql = target.insert_sql
+        conn = self._connect()
+        try:
+            if self._drop_indexes:
+                deferred = self._defer_maintenance(conn, target)
+            else:
+                self._check_nothing_pending(conn)
+                deferred = 0
+        except BaseException:
+            conn.close()
+            raise
+        try:
+            chunk: List[Tuple[int, tuple]] = []
+            for line, record in records:
+                stats.read += 1
+                try:
+                    if isinstance(record, Exception):
+                        raise ValueError(f"invalid JSON: {record}")
+                    if not isinstance(record, dict):
+                        raise ValueError("expected an object")
+                    chunk.append((line, target.to_row(record, now)))
+                except (ValueError, TypeError) as exc:
+                    if self._strict:
+                        raise BulkImportError(f"line {line}: {exc}") from exc
+                    stats.record_error(line, str(exc))
+                if len(chunk) >= self._chunk_size:
+                    self._insert_chunk(conn, sql, chunk, stats)
+                    chunk = []
+                    stats.seconds = time.perf_counter() - started
+                    if progress is not None:
+                        progress(stats)
+            if chunk:
+                self._insert_chunk(conn, sql, chunk, stats)
+        finally:
+            try:
+                if deferred:
+                    self._finish_deferred(conn)
+                    conn.execute(f"ANALYZE {target.table}")
+            finally:
+                conn.close()
+        stats.seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(stats)
+        return stats
+
+    def import_file(
+        self,
+        table: str,
+        path: str,
+        input_format: Optional[str] = None,
+        progress: Optional[Callable[[ImportStats], None]] = None
+    ) -> ImportStats:
+        input_format = input_format or detect_format(path)
+        with open_input(path) as handle:
+            return self.import_records(table, read_records(handle, input_format), progress)
@@ -0,0 +1,176 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from repositories.base import IRepository, T
+from repositories.bulk import BulkResult, Changes
+from repositories.query import PageQuery
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+    max_entries: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class CachedRepository(IRepository[T]):
+    """Read-through ``get_by_id`` cache in front of another repository.
+
+    Entries are evicted least-recently-used once ``max_entries`` is reached
+    and expire ``ttl_seconds`` after they were loaded. Writes made through
+    this repository invalidate the affected ids; the TTL bounds staleness for
+    writes made elsewhere (other processes, bulk imports). Callers get deep
+    copies, so changing a returned entity (e.g. its tags list) never changes
+    the cached one.
+    """
+
+    def __init__(
+        self,
+        repository: IRepository[T],
+        max_entries: int = 1024,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._repository = repository
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[int, Tuple[T, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Entity-specific queries (e.g. tag_counts) pass straight through.
+        return getattr(self._repository, name)
+
+    @property
+    def repository(self) -> IRepository[T]:
+        return self._repository
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                max_entries=self._max_entries,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _invalidate(self, ids: Sequence[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            for id in ids:
+                if self._entries.pop(id, None) is not None:
+                    self._invalidations += 1
+
+    def get_by_id(self, id: int) -> Optional[T]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is not None:
+                entity, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(id)
+                    self._hits += 1
+                    return copy.deepcopy(entity)
+                del self._entries[id]
+                self._expirations += 1
+            self._misses += 1
+            generation = self._generation
+
+        entity = self._repository.get_by_id(id)
+        if entity is None:
+            return None
+
+        with self._lock:
+            # Skip the store if a write invalidated anything while we were
+            # loading; the value we read may already be stale.
+            if generation == self._generation:
+                self._entries[id] = (entity, self._clock() + self._ttl)
+                self._entries.move_to_end(id)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return copy.deepcopy(entity)
+
+    def get_all(self) -> List[T]:
+        return self._repository.get_all()
+
+    def query(self, query: PageQuery) -> List[T]:
+        return self._repository.query(query)
+
+    def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return self._repository.query_json(query)
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[T]]:
+        return self._repository.iter_batches(batch_size)
+
+    def table_version(self) -> int:
+        return self._repository.table_version()
+
+    def create(self, entity: T) -> T:
+        return self._repository.create(entity)
+
+    def update(self, id: int, entity: T) -> Optional[T]:
+        try:
+            return self._repository.update(id, entity)
+        finally:
+            self._invalidate([id])
+
+    def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[T]:
+        try:
+            return self._repository.update_partial(id, changes, expected_updated_at)
+        finally:
+            self._invalidate([id])
+
+    def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        try:
+            return self._repository.delete(id, expected_updated_at)
+        finally:
+            self._invalidate([id])
+
+    def create_many(self, entities: Sequence[T], chunk_size: int = 500) -> BulkResult:
+        return self._repository.create_many(entities, chunk_size)
+
+    def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        try:
+            return self._repository.update_many(changes, chunk_size)
+        finally:
+            self._invalidate([id for id, _ in changes])
+
+    def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        try:
+            return self._repository.delete_many(ids, chunk_size)
+        finally:
+            self._invalidate(ids)
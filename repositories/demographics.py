@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class DemographicsQuery:
+    """Parameters of an employee demographics request; also its cache key."""
+    age_bucket: int = 10
+    cohort_years: int = 10
+    top: int = 20
+    organisation_id: Optional[int] = None
+
+
+def buckets(counts: Dict[int, int], width: int) -> List[Dict[str, int]]:
+    """Group a value -> count distribution into ``width``-wide buckets."""
+    # Contiguous from the lowest to the highest bucket, empty ones included.
+    if not counts:
+        return []
+    totals: Dict[int, int] = {}
+    for value, count in counts.items():
+        start = value // width * width
+        totals[start] = totals.get(start, 0) + count
+    return [
+        {'start': start, 'end': start + width, 'count': totals.get(start, 0)}
+        for start in range(min(totals), max(totals) + 1, width)
+    ]
+
+
+def median(counts: Dict[int, int], total: int) -> Optional[float]:
+    """Median of a value -> count distribution holding ``total`` values."""
+    if not total:
+        return None
+    middle = [(total - 1) // 2, total // 2]
+    values = []
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        while middle and middle[0] < seen:
+            values.append(value)
+            middle.pop(0)
+    return sum(values) / 2
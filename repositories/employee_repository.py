@@ -1,51 +1,107 @@
 import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, date
-from typing import List, Optional
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
 from repositories.base import IRepository
+from repositories.bulk import BulkResult, Changes, insert_many, update_many, delete_many
+from repositories.connection_pool import ConnectionPool
+from repositories.demographics import DemographicsQuery, buckets, median
+from repositories.migrations import SUMMARY_REBUILD_SQL, SUMMARY_SELECT_SQL, migrate
+from repositories.query import PageQuery, build_page_select, equals_clause, prefix_clause, timestamp_clause, utc_z_expression, version_clause
 from models.employee import Employee
 
 class EmployeeRepository(IRepository[Employee]):
-    def __init__(self, db_path: str):
+    COLUMNS = (
+        'id', 'name', 'last_name', 'age', 'date_of_birth', 'location',
+        'organisation_id', 'created_at', 'updated_at'
+    )
+    UPDATABLE_COLUMNS = ('name', 'last_name', 'age', 'date_of_birth', 'location', 'organisation_id')
+    INSERT_SQL = """
+        INSERT INTO employees (name, last_name, age, date_of_birth, location, organisation_id, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    JSON_EXPRESSIONS = {
+        'created_at': utc_z_expression('created_at'),
+        'updated_at': utc_z_expression('updated_at'),
+    }
+    FILTERS = {
+        'name_prefix': prefix_clause('name'),
+        'last_name_prefix': prefix_clause('last_name'),
+        'location': equals_clause('location'),
+        'organisation_id': equals_clause('organisation_id'),
+        'created_after': timestamp_clause('created_at', '>='),
+        'created_before': timestamp_clause('created_at', '<'),
+        'updated_after': timestamp_clause('updated_at', '>='),
+        'updated_before': timestamp_clause('updated_at', '<'),
+    }
+    SUMMARIES_SQL = (
+        "SELECT organisation_id, employee_count, round(CAST(age_total AS REAL) / employee_count, 2) AS average_age, "
+        f"{utc_z_expression('last_updated_at')} AS last_updated_at "
+        "FROM organisation_summaries WHERE organisation_id IN ({placeholders})"
+    )
+    
+    DEMOGRAPHICS_CACHE_SIZE = 32
+    
+    def __init__(self, db_path: str, pool: Optional[ConnectionPool] = None):
         self._db_path = db_path
+        self._pool = pool or ConnectionPool(db_path)
+        self._demographics: "OrderedDict[DemographicsQuery, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._demographics_lock = threading.Lock()
         self._init_db()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.connection()
+    
+    def _get_write_connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.transaction()
+    
+    def _get_snapshot_connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.snapshot()
     
     def _init_db(self) -> None:
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS employees (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    last_name TEXT NOT NULL,
-                    age INTEGER NOT NULL,
-                    date_of_birth TEXT NOT NULL,
-                    location TEXT NOT NULL,
-                    organisation_id INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY (organisation_id) REFERENCES organisations(id)
-                )
-            """)
-            conn.commit()
+            migrate(conn)
     
     def _row_to_entity(self, row: sqlite3.Row) -> Employee:
-        return Employee(
+        return Employee.from_encoded(
             id=row['id'],
             name=row['name'],
             last_name=row['last_name'],
             age=row['age'],
-            date_of_birth=date.fromisoformat(row['date_of_birth']),
+            date_of_birth=row['date_of_birth'],
             location=row['location'],
             organisation_id=row['organisation_id'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at'])
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
         )
     
+    def _row_to_partial_entity(self, row: sqlite3.Row) -> Employee:
+        return Employee.from_encoded(**dict(row))
+    
+    def _insert_params(self, entity: Employee, now: datetime) -> tuple:
+        return (
+            entity.name,
+            entity.last_name,
+            entity.age,
+            entity.date_of_birth.isoformat(),
+            entity.location,
+            entity.organisation_id,
+            now.isoformat(),
+            now.isoformat()
+        )
+    
+    def _to_column_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = set(values) - set(self.UPDATABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot update columns: {', '.join(sorted(unknown))}")
+        return self._encode_values(values)
+    
+    def _encode_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        if 'date_of_birth' in values:
+            values = {**values, 'date_of_birth': values['date_of_birth'].isoformat()}
+        return values
+    
     def get_all(self) -> List[Employee]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -60,24 +116,181 @@ class EmployeeRepository(IRepository[Employee]):
             row = cursor.fetchone()
             return self._row_to_entity(row) if row else None
     
-    def create(self, entity: Employee) -> Employee:
+    def query(self, query: PageQuery) -> List[Employee]:
+        sql, params = build_page_select('employees', self.COLUMNS, self.FILTERS, query)
+        to_entity = self._row_to_entity if query.fields is None else self._row_to_partial_entity
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [to_entity(row) for row in cursor.fetchall()]
+    
+    def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        sql, params = build_page_select('employees', self.COLUMNS, self.FILTERS, query, self.JSON_EXPRESSIONS)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+    
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Employee]]:
+        # One keyset page per batch, so a slow consumer holds neither a pooled
+        # connection nor a read snapshot between batches.
+        after_id = None
+        while True:
+            batch = self.query(PageQuery(after_id=after_id, limit=batch_size))
+            if batch:
+                yield batch
+            if len(batch) < batch_size:
+                break
+            after_id = batch[-1].id
+    
+    def count_by_organisation(self, organisation_ids: Sequence[int]) -> Dict[int, int]:
+        """Employee counts for the given organisations from organisation_summaries; zero counts included."""
+        return {
+            organisation_id: summary['employee_count']
+            for organisation_id, summary in self.summaries_by_organisation(organisation_ids).items()
+        }
+    
+    def organisation_ids(self, ids: Sequence[int]) -> Dict[int, int]:
+        """Organisation of each existing employee in ``ids``."""
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" for _ in ids)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT id, organisation_id FROM employees WHERE id IN ({placeholders})", list(ids))
+            return {row['id']: row['organisation_id'] for row in cursor.fetchall()}
+    
+    def summaries_by_organisation(self, organisation_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """Employee count, average age and latest employee update per organisation.
+        
+        One primary key lookup per organisation in the trigger-maintained
+        organisation_summaries table; organisations without employees get
+        a zero count.
+        """
+        summaries = {
+            organisation_id: {'employee_count': 0, 'average_age': None, 'last_updated_at': None}
+            for organisation_id in organisation_ids
+        }
+        if not summaries:
+            return summaries
+        placeholders = ", ".join("?" for _ in summaries)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.SUMMARIES_SQL.format(placeholders=placeholders), list(summaries))
+            for row in cursor.fetchall():
+                summaries[row['organisation_id']] = {
+                    'employee_count': row['employee_count'],
+                    'average_age': row['average_age'],
+                    'last_updated_at': row['last_updated_at'],
+                }
+        return summaries
+    
+    def verify_summaries(self, rebuild: bool = False) -> List[int]:
+        """Compare organisation_summaries with a full recount of employees.
+        
+        Returns the organisations whose summary is wrong or missing. With
+        ``rebuild`` the table is recomputed in the same transaction and the
+        employees version is bumped so cached responses are revalidated.
+        """
+        with self._get_write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT organisation_id FROM (
+                    SELECT * FROM ({SUMMARY_SELECT_SQL})
+                    EXCEPT SELECT organisation_id, employee_count, age_total, last_updated_at FROM organisation_summaries
+                )
+                UNION
+                SELECT organisation_id FROM (
+                    SELECT organisation_id, employee_count, age_total, last_updated_at FROM organisation_summaries
+                    EXCEPT SELECT * FROM ({SUMMARY_SELECT_SQL})
+                )
+                ORDER BY organisation_id
+            """)
+            mismatched = [row[0] for row in cursor.fetchall()]
+            if mismatched and rebuild:
+                cursor.execute("DELETE FROM organisation_summaries")
+                cursor.execute(SUMMARY_REBUILD_SQL)
+                cursor.execute("UPDATE table_versions SET version = version + 1 WHERE table_name = 'employees'")
+        return mismatched
+    
+    def _compute_demographics(self, conn: sqlite3.Connection, query: DemographicsQuery) -> Dict[str, Any]:
+        where, params = ("WHERE organisation_id = ?", [query.organisation_id]) if query.organisation_id is not None else ("", [])
+        cursor = conn.cursor()
+        # Grouping on (age, date_of_birth) walks idx_employees_age_date_of_birth in
+        # order without a sort; every age and birth-year figure is rolled up from it.
+        cursor.execute(f"SELECT age, date_of_birth, COUNT(*) FROM employees {where} GROUP BY age, date_of_birth", params)
+        ages: Dict[int, int] = {}
+        birth_years: Dict[int, int] = {}
+        for age, date_of_birth, count in cursor.fetchall():
+            ages[age] = ages.get(age, 0) + count
+            year = int(date_of_birth[:4])
+            birth_years[year] = birth_years.get(year, 0) + count
+        total = sum(ages.values())
+        
+        cursor.execute(
+            f"SELECT location, COUNT(*) AS count FROM employees {where} "
+            f"GROUP BY location ORDER BY count DESC, location LIMIT ?",
+            params + [query.top]
+        )
+        by_location = [{'location': row[0], 'count': row[1]} for row in cursor.fetchall()]
+        cursor.execute(
+            f"SELECT organisation_id, COUNT(*) AS count FROM employees {where} "
+            f"GROUP BY organisation_id ORDER BY count DESC, organisation_id LIMIT ?",
+            params + [query.top]
+        )
+        by_organisation = [{'organisation_id': row[0], 'count': row[1]} for row in cursor.fetchall()]
+        
+        return {
+            'count': total,
+            'age': {
+                'min': min(ages) if ages else None,
+                'max': max(ages) if ages else None,
+                'mean': round(sum(age * count for age, count in ages.items()) / total, 2) if total else None,
+                'median': median(ages, total),
+                'histogram': buckets(ages, query.age_bucket),
+            },
+            'birth_cohorts': buckets(birth_years, query.cohort_years),
+            'by_location': by_location,
+            'by_organisation': by_organisation,
+        }
+    
+    def demographics(self, query: DemographicsQuery = DemographicsQuery()) -> Dict[str, Any]:
+        """Aggregate employee statistics, computed in SQL and cached per table version.
+        
+        The version and the aggregates are read in one transaction, so a
+        cached result always matches the version it is stored under, and a
+        repeat call costs one version lookup.
+        """
+        with self._get_snapshot_connection() as conn:
+            version = conn.execute(
+                "SELECT version FROM table_versions WHERE table_name = 'employees'"
+            ).fetchone()[0]
+            with self._demographics_lock:
+                cached = self._demographics.get(query)
+                if cached is not None and cached[0] == version:
+                    self._demographics.move_to_end(query)
+                    return cached[1]
+            result = self._compute_demographics(conn, query)
+        with self._demographics_lock:
+            self._demographics[query] = (version, result)
+            self._demographics.move_to_end(query)
+            while len(self._demographics) > self.DEMOGRAPHICS_CACHE_SIZE:
+                self._demographics.popitem(last=False)
+        return result
+    
+    def table_version(self) -> int:
         with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM table_versions WHERE table_name = 'employees'")
+            row = cursor.fetchone()
+            return row['version'] if row else 0
+    
+    def create(self, entity: Employee) -> Employee:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc)
             
-            cursor.execute("""
-                INSERT INTO employees (name, last_name, age, date_of_birth, location, organisation_id, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                entity.name,
-                entity.last_name,
-                entity.age,
-                entity.date_of_birth.isoformat(),
-                entity.location,
-                entity.organisation_id,
-                now.isoformat(),
-                now.isoformat()
-            ))
+            cursor.execute(self.INSERT_SQL, self._insert_params(entity, now))
             
             entity.id = cursor.lastrowid
             entity.created_at = now
@@ -87,37 +300,71 @@ class EmployeeRepository(IRepository[Employee]):
             return entity
     
     def update(self, id: int, entity: Employee) -> Optional[Employee]:
-        existing = self.get_by_id(id)
-        if not existing:
-            return None
+        return self.update_partial(id, {
+            'name': entity.name,
+            'last_name': entity.last_name,
+            'age': entity.age,
+            'date_of_birth': entity.date_of_birth,
+            'location': entity.location,
+            'organisation_id': entity.organisation_id
+        })
+    
+    def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[Employee]:
+        values = self._to_column_values(changes)
+        now = datetime.now(timezone.utc)
+        assignments = ", ".join(f"{column} = ?" for column in [*values, 'updated_at'])
+        sql = f"UPDATE employees SET {assignments} WHERE id = ?"
+        params = [*values.values(), now.isoformat(), id]
+        if expected_updated_at is not None:
+            clause, clause_params = version_clause(expected_updated_at)
+            sql += f" AND {clause}"
+            params.extend(clause_params)
         
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now(timezone.utc)
-            
-            cursor.execute("""
-                UPDATE employees
-                SET name = ?, last_name = ?, age = ?, date_of_birth = ?, location = ?, organisation_id = ?, updated_at = ?
-                WHERE id = ?
-            """, (
-                entity.name,
-                entity.last_name,
-                entity.age,
-                entity.date_of_birth.isoformat(),
-                entity.location,
-                entity.organisation_id,
-                now.isoformat(),
-                id
-            ))
-            
-            conn.commit()
-            
-        return self.get_by_id(id)
+            cursor.execute(sql + " RETURNING *", params)
+            row = cursor.fetchone()
+            return self._row_to_entity(row) if row else None
     
-    def delete(self, id: int) -> bool:
-        with self._get_connection() as conn:
+    def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        sql = "DELETE FROM employees WHERE id = ?"
+        params: List[Any] = [id]
+        if expected_updated_at is not None:
+            clause, clause_params = version_clause(expected_updated_at)
+            sql += f" AND {clause}"
+            params.extend(clause_params)
+        
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM employees WHERE id = ?", (id,))
+            cursor.execute(sql, params)
             deleted = cursor.rowcount > 0
             conn.commit()
             return deleted
+    
+    def create_many(self, entities: Sequence[Employee], chunk_size: int = 500) -> BulkResult:
+        now = datetime.now(timezone.utc)
+        rows = [self._insert_params(entity, now) for entity in entities]
+        with self._get_write_connection() as conn:
+            result = insert_many(conn, self.INSERT_SQL, rows)
+        for item in result.succeeded:
+            entity = entities[item.index]
+            entity.id = item.id
+            entity.created_at = now
+            entity.updated_at = now
+        return result
+    
+    def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        now = datetime.now(timezone.utc)
+        # Unknown columns fail their own item in update_many, not the whole batch.
+        rows = [(id, self._encode_values(values)) for id, values in changes]
+        with self._get_write_connection() as conn:
+            return update_many(conn, 'employees', rows, self.UPDATABLE_COLUMNS, now.isoformat(), chunk_size)
+    
+    def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        with self._get_write_connection() as conn:
+            return delete_many(conn, 'employees', ids, chunk_size)
@@ -0,0 +1,134 @@
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from observability.diagnostics import record_phase
+from observability.metrics import REGISTRY
+
+logger = logging.getLogger("repositories.slow_query")
+
+STATEMENT_SECONDS = REGISTRY.histogram(
+    "sqlite_statement_duration_seconds", "SQLite statement execution time.", ("operation",)
+)
+ROWS_READ = REGISTRY.counter("sqlite_rows_read_total", "Rows fetched from SQLite result sets.")
+CONNECTION_OPEN_SECONDS = REGISTRY.histogram(
+    "sqlite_connection_open_seconds", "Time to open a pooled SQLite connection and apply its PRAGMAs."
+)
+SLOW_QUERIES = REGISTRY.counter("sqlite_slow_queries_total", "Statements slower than the slow-query threshold.")
+
+OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "SAVEPOINT", "RELEASE", "PRAGMA"))
+_rows_read = ROWS_READ.labels()
+
+
+_timers: Dict[str, Any] = {}
+
+
+def _operation_timer(sql: str):
+    # Statement texts are nearly all constants, so the keyword lookup is
+    # cached per text; labelling by keyword keeps the label set fixed.
+    timer = _timers.get(sql)
+    if timer is None:
+        words = sql.split(None, 1)
+        operation = words[0].upper() if words else ""
+        timer = STATEMENT_SECONDS.labels(operation if operation in OPERATIONS else "OTHER")
+        if len(_timers) < 4096:
+            _timers[sql] = timer
+    return timer
+
+
+def parameter_shape(parameters: Any) -> str:
+    """Types of the bound parameters, never their values."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+
+
+def _log_slow_query(conn: sqlite3.Connection, sql: str, shape: str, seconds: float, parameters: Any) -> None:
+    SLOW_QUERIES.inc()
+    plan = "unavailable"
+    if parameters is not None:
+        try:
+            # A plain cursor, so the EXPLAIN is neither timed nor logged itself.
+            rows = conn.cursor(sqlite3.Cursor).execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+            plan = " | ".join(str(row[-1]) for row in rows) or "none"
+        except sqlite3.Error as exc:
+            plan = f"unavailable ({exc})"
+    logger.warning(
+        "Slow query %.1f ms: %s params=%s plan=%s",
+        seconds * 1000, " ".join(sql.split()), shape, plan
+    )
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times ``execute``/``executemany`` and counts fetched rows.
+
+    For SELECTs the timed part is preparing the statement and stepping to the
+    first row; rows stepped in ``fetch*`` are counted and added to the
+    request's ``db`` phase, but not to the statement histogram. Statements
+    slower than the connection's ``slow_query_seconds`` are logged with the
+    shape of their parameters and their query plan.
+    """
+
+    def execute(self, sql: str, parameters: Iterable[Any] = ()) -> "InstrumentedCursor":
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            _operation_timer(sql).observe(elapsed)
+            record_phase("db", elapsed)
+            if elapsed >= self.connection.slow_query_seconds:
+                _log_slow_query(self.connection, sql, parameter_shape(parameters), elapsed, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Iterable[Any]]) -> "InstrumentedCursor":
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            _operation_timer(sql).observe(elapsed)
+            record_phase("db", elapsed)
+            if elapsed >= self.connection.slow_query_seconds:
+                if isinstance(seq_of_parameters, (list, tuple)) and seq_of_parameters:
+                    shape = f"{len(seq_of_parameters)} x {parameter_shape(seq_of_parameters[0])}"
+                else:
+                    shape = "iterator"
+                _log_slow_query(self.connection, sql, shape, elapsed, None)
+
+    def fetchone(self) -> Optional[Any]:
+        started = time.perf_counter()
+        row = super().fetchone()
+        record_phase("db", time.perf_counter() - started)
+        if row is not None:
+            _rows_read.inc()
+        return row
+
+    def fetchmany(self, size: int = -1) -> List[Any]:
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size < 0 else size)
+        record_phase("db", time.perf_counter() - started)
+        _rows_read.inc(len(rows))
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        started = time.perf_counter()
+        rows = super().fetchall()
+        record_phase("db", time.perf_counter() - started)
+        _rows_read.inc(len(rows))
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the implicit ones, are instrumented."""
+
+    slow_query_seconds = float("inf")
+
+    def cursor(self, factory: type = InstrumentedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Iterable[Any] = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Iterable[Any]]) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
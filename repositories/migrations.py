@@ -0,0 +1,336 @@
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+# Recomputes organisation_summaries from employees; used by migration 7 and
+# EmployeeRepository.verify_summaries.
+SUMMARY_SELECT_SQL = """
+    SELECT organisation_id, COUNT(*), SUM(age), MAX(updated_at)
+    FROM employees GROUP BY organisation_id
+"""
+SUMMARY_REBUILD_SQL = f"""
+    INSERT INTO organisation_summaries (organisation_id, employee_count, age_total, last_updated_at)
+    {SUMMARY_SELECT_SQL}
+"""
+
+
+def _summary_add(row: str) -> str:
+    return f"""
+            INSERT INTO organisation_summaries (organisation_id, employee_count, age_total, last_updated_at)
+            VALUES ({row}.organisation_id, 1, {row}.age, {row}.updated_at)
+            ON CONFLICT (organisation_id) DO UPDATE SET
+                employee_count = employee_count + 1,
+                age_total = age_total + excluded.age_total,
+                last_updated_at = max(last_updated_at, excluded.last_updated_at);
+    """
+
+
+def _summary_remove(row: str) -> str:
+    return f"""
+            DELETE FROM organisation_summaries
+            WHERE organisation_id = {row}.organisation_id AND employee_count = 1;
+            UPDATE organisation_summaries SET
+                employee_count = employee_count - 1,
+                age_total = age_total - {row}.age,
+                last_updated_at = CASE
+                    WHEN last_updated_at = {row}.updated_at THEN (
+                        SELECT MAX(updated_at) FROM employees
+                        WHERE organisation_id = {row}.organisation_id AND id <> {row}.id
+                    )
+                    ELSE last_updated_at
+                END
+            WHERE organisation_id = {row}.organisation_id;
+    """
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create organisations and employees tables", (
+        """
+        CREATE TABLE IF NOT EXISTS organisations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            details TEXT,
+            name TEXT NOT NULL,
+            tags TEXT,
+            updated_at TEXT NOT NULL,
+            url TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS employees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            age INTEGER NOT NULL,
+            date_of_birth TEXT NOT NULL,
+            location TEXT NOT NULL,
+            organisation_id INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY (organisation_id) REFERENCES organisations(id)
+        )
+        """,
+    )),
+    Migration(2, "Add secondary indexes for lookups and range scans", (
+        "CREATE INDEX IF NOT EXISTS idx_employees_organisation_id ON employees(organisation_id)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_last_name_name ON employees(last_name, name)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_updated_at ON employees(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_organisations_name ON organisations(name)",
+        "CREATE INDEX IF NOT EXISTS idx_organisations_updated_at ON organisations(updated_at)",
+    )),
+    Migration(3, "Normalise organisation tags into an indexed organisation_tags table", (
+        """
+        CREATE TABLE IF NOT EXISTS organisation_tags (
+            org_id INTEGER NOT NULL REFERENCES organisations(id) ON DELETE CASCADE,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (org_id, tag)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_organisation_tags_tag ON organisation_tags(tag)",
+        """
+        INSERT OR IGNORE INTO organisation_tags (org_id, tag)
+        SELECT organisations.id, json_each.value
+        FROM organisations, json_each(organisations.tags)
+        WHERE json_valid(organisations.tags)
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_tags_insert
+        AFTER INSERT ON organisations
+        BEGIN
+            INSERT OR IGNORE INTO organisation_tags (org_id, tag)
+            SELECT NEW.id, value FROM json_each(COALESCE(NEW.tags, '[]'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_tags_update
+        AFTER UPDATE OF tags ON organisations
+        BEGIN
+            DELETE FROM organisation_tags WHERE org_id = OLD.id;
+            INSERT OR IGNORE INTO organisation_tags (org_id, tag)
+            SELECT NEW.id, value FROM json_each(COALESCE(NEW.tags, '[]'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_tags_delete
+        AFTER DELETE ON organisations
+        BEGIN
+            DELETE FROM organisation_tags WHERE org_id = OLD.id;
+        END
+        """,
+    )),
+    Migration(4, "Track per-table change versions for collection ETags", (
+        """
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        "INSERT OR IGNORE INTO table_versions (table_name, version) VALUES ('organisations', 0), ('employees', 0)",
+        *(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+            END
+            """
+            for table in ('organisations', 'employees')
+            for event in ('INSERT', 'UPDATE', 'DELETE')
+        ),
+    )),
+    Migration(5, "Add full-text search indexes over organisations and employees", tuple(
+        statement
+        for table, columns in (
+            ('organisations', ('name', 'details', 'tags')),
+            ('employees', ('name', 'last_name', 'location')),
+        )
+        for statement in (
+            # External-content tables: only the index is stored, column values
+            # are read back from the base table by rowid.
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                {', '.join(columns)},
+                content='{table}',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """,
+            f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')",
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {table}_fts (rowid, {', '.join(columns)})
+                VALUES (NEW.id, {', '.join(f'NEW.{column}' for column in columns)});
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update
+            AFTER UPDATE OF {', '.join(columns)} ON {table}
+            BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {', '.join(columns)})
+                VALUES ('delete', OLD.id, {', '.join(f'OLD.{column}' for column in columns)});
+                INSERT INTO {table}_fts (rowid, {', '.join(columns)})
+                VALUES (NEW.id, {', '.join(f'NEW.{column}' for column in columns)});
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {', '.join(columns)})
+                VALUES ('delete', OLD.id, {', '.join(f'OLD.{column}' for column in columns)});
+            END
+            """,
+        )
+    )),
+    Migration(6, "Add covering indexes for employee demographics and location filters", (
+        "CREATE INDEX IF NOT EXISTS idx_employees_location ON employees(location)",
+        "CREATE INDEX IF NOT EXISTS idx_employees_age_date_of_birth ON employees(age, date_of_birth)",
+    )),
+    Migration(7, "Maintain per-organisation employee summaries with triggers", (
+        """
+        CREATE TABLE IF NOT EXISTS organisation_summaries (
+            organisation_id INTEGER PRIMARY KEY,
+            employee_count INTEGER NOT NULL,
+            age_total INTEGER NOT NULL,
+            last_updated_at TEXT NOT NULL
+        )
+        """,
+        SUMMARY_REBUILD_SQL,
+        # Adding and removing one employee touch only its organisation's row.
+        # Only removing the most recently updated employee has to look for
+        # the next one, through idx_employees_organisation_id.
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_summaries_insert
+        AFTER INSERT ON employees
+        BEGIN
+            {_summary_add('NEW')}
+        END
+        """,
+        # The usual update keeps the organisation and moves updated_at
+        # forward, so it cannot retire the latest timestamp.
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_summaries_update
+        AFTER UPDATE OF age, organisation_id, updated_at ON employees
+        WHEN NEW.organisation_id = OLD.organisation_id AND NEW.updated_at >= OLD.updated_at
+        BEGIN
+            UPDATE organisation_summaries SET
+                age_total = age_total - OLD.age + NEW.age,
+                last_updated_at = max(last_updated_at, NEW.updated_at)
+            WHERE organisation_id = NEW.organisation_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_summaries_move
+        AFTER UPDATE OF age, organisation_id, updated_at ON employees
+        WHEN NEW.organisation_id <> OLD.organisation_id OR NEW.updated_at < OLD.updated_at
+        BEGIN
+            {_summary_remove('OLD')}
+            {_summary_add('NEW')}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_organisation_summaries_delete
+        AFTER DELETE ON employees
+        BEGIN
+            {_summary_remove('OLD')}
+        END
+        """,
+    )),
+    Migration(8, "Record a compacted change log for incremental sync", (
+        # One row per entity holding its latest change: REPLACE drops the
+        # previous row and AUTOINCREMENT hands out a sequence number that is
+        # never reused, so the log grows with entities, not with writes.
+        """
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_type TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (entity_type, entity_id)
+        )
+        """,
+        *(
+            statement
+            for table, entity_type in (('organisations', 'organisation'), ('employees', 'employee'))
+            for statement in (
+                f"INSERT OR IGNORE INTO changes (entity_type, entity_id) SELECT '{entity_type}', id FROM {table} ORDER BY id",
+                *(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        INSERT OR REPLACE INTO changes (entity_type, entity_id, deleted)
+                        VALUES ('{entity_type}', {row}.id, {int(event == 'DELETE')});
+                    END
+                    """
+                    for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD'))
+                ),
+            )
+        ),
+    )),
+]
+
+
+def _ensure_version_table(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+def _read_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()
+    return row[0]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    _ensure_version_table(conn)
+    return _read_version(conn)
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration] = MIGRATIONS) -> List[int]:
+    """Apply every migration newer than the recorded schema version.
+
+    Each migration runs in its own ``BEGIN IMMEDIATE`` transaction and the
+    version is re-read under the write lock, so concurrent processes starting
+    against the same file apply each migration exactly once.
+    """
+    applied: List[int] = []
+    if current_version(conn) >= max((m.version for m in migrations), default=0):
+        return applied
+
+    for migration in sorted(migrations, key=lambda m: m.version):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _read_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now(timezone.utc).isoformat())
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+    return applied
+
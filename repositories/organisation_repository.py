@@ -1,47 +1,95 @@
 import sqlite3
 import json
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
 from repositories.base import IRepository
+from repositories.bulk import BulkResult, Changes, insert_many, update_many, delete_many
+from repositories.connection_pool import ConnectionPool
+from repositories.migrations import migrate
+from repositories.query import PageQuery, build_page_select, in_clause, in_subquery_clause, prefix_clause, timestamp_clause, utc_z_expression, version_clause
 from models.entity import Organisation
 
 class OrganisationRepository(IRepository[Organisation]):
-    def __init__(self, db_path: str):
+    COLUMNS = ('id', 'name', 'created_at', 'updated_at', 'details', 'tags', 'url')
+    UPDATABLE_COLUMNS = ('name', 'details', 'tags', 'url')
+    INSERT_SQL = """
+        INSERT INTO organisations (created_at, details, name, tags, updated_at, url)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    JSON_EXPRESSIONS = {
+        'created_at': utc_z_expression('created_at'),
+        'updated_at': utc_z_expression('updated_at'),
+        'tags': "CASE WHEN json_valid(tags) THEN json(tags) ELSE json('[]') END",
+    }
+    FILTERS = {
+        'ids': in_clause('id'),
+        'name_prefix': prefix_clause('name'),
+        'tag': lambda tag: ("id IN (SELECT org_id FROM organisation_tags WHERE tag = ?)", [tag]),
+        'tags_any': in_subquery_clause(
+            'id',
+            "SELECT org_id FROM organisation_tags WHERE tag IN ({placeholders})"
+        ),
+        'tags_all': in_subquery_clause(
+            'id',
+            "SELECT org_id FROM organisation_tags WHERE tag IN ({placeholders}) "
+            "GROUP BY org_id HAVING COUNT(*) = {count}"
+        ),
+        'created_after': timestamp_clause('created_at', '>='),
+        'created_before': timestamp_clause('created_at', '<'),
+        'updated_after': timestamp_clause('updated_at', '>='),
+        'updated_before': timestamp_clause('updated_at', '<'),
+    }
+    
+    def __init__(self, db_path: str, pool: Optional[ConnectionPool] = None):
         self._db_path = db_path
+        self._pool = pool or ConnectionPool(db_path)
         self._init_db()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.connection()
+    
+    def _get_write_connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.transaction()
     
     def _init_db(self) -> None:
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS organisations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_at TEXT NOT NULL,
-                    details TEXT,
-                    name TEXT NOT NULL,
-                    tags TEXT,
-                    updated_at TEXT NOT NULL,
-                    url TEXT
-                )
-            """)
-            conn.commit()
+            migrate(conn)
     
     def _row_to_entity(self, row: sqlite3.Row) -> Organisation:
-        return Organisation(
+        return Organisation.from_encoded(
             id=row['id'],
             name=row['name'],
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']),
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
             details=row['details'],
-            tags=json.loads(row['tags']) if row['tags'] else [],
+            tags=row['tags'],
             url=row['url']
         )
     
+    def _row_to_partial_entity(self, row: sqlite3.Row) -> Organisation:
+        return Organisation.from_encoded(**dict(row))
+    
+    def _insert_params(self, entity: Organisation, now: datetime) -> tuple:
+        return (
+            now.isoformat(),
+            entity.details,
+            entity.name,
+            json.dumps(entity.tags),
+            now.isoformat(),
+            entity.url
+        )
+    
+    def _to_column_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = set(values) - set(self.UPDATABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot update columns: {', '.join(sorted(unknown))}")
+        return self._encode_values(values)
+    
+    def _encode_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        if 'tags' in values:
+            values = {**values, 'tags': json.dumps(values['tags'])}
+        return values
+    
     def get_all(self) -> List[Organisation]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -56,22 +104,57 @@ class OrganisationRepository(IRepository[Organisation]):
             row = cursor.fetchone()
             return self._row_to_entity(row) if row else None
     
-    def create(self, entity: Organisation) -> Organisation:
+    def query(self, query: PageQuery) -> List[Organisation]:
+        sql, params = build_page_select('organisations', self.COLUMNS, self.FILTERS, query)
+        to_entity = self._row_to_entity if query.fields is None else self._row_to_partial_entity
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [to_entity(row) for row in cursor.fetchall()]
+    
+    def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        sql, params = build_page_select('organisations', self.COLUMNS, self.FILTERS, query, self.JSON_EXPRESSIONS)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+    
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Organisation]]:
+        # One keyset page per batch, so a slow consumer holds neither a pooled
+        # connection nor a read snapshot between batches.
+        after_id = None
+        while True:
+            batch = self.query(PageQuery(after_id=after_id, limit=batch_size))
+            if batch:
+                yield batch
+            if len(batch) < batch_size:
+                break
+            after_id = batch[-1].id
+    
+    def tag_counts(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        sql = "SELECT tag, COUNT(*) AS count FROM organisation_tags GROUP BY tag ORDER BY count DESC, tag"
+        params: List[Any] = []
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [(row['tag'], row['count']) for row in cursor.fetchall()]
+    
+    def table_version(self) -> int:
         with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM table_versions WHERE table_name = 'organisations'")
+            row = cursor.fetchone()
+            return row['version'] if row else 0
+    
+    def create(self, entity: Organisation) -> Organisation:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now(timezone.utc)
             
-            cursor.execute("""
-                INSERT INTO organisations (created_at, details, name, tags, updated_at, url)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                now.isoformat(),
-                entity.details,
-                entity.name,
-                json.dumps(entity.tags),
-                now.isoformat(),
-                entity.url
-            ))
+            cursor.execute(self.INSERT_SQL, self._insert_params(entity, now))
             
             entity.id = cursor.lastrowid
             entity.created_at = now
@@ -81,35 +164,69 @@ class OrganisationRepository(IRepository[Organisation]):
             return entity
     
     def update(self, id: int, entity: Organisation) -> Optional[Organisation]:
-        existing = self.get_by_id(id)
-        if not existing:
-            return None
+        return self.update_partial(id, {
+            'name': entity.name,
+            'details': entity.details,
+            'tags': entity.tags,
+            'url': entity.url
+        })
+    
+    def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[Organisation]:
+        values = self._to_column_values(changes)
+        now = datetime.now(timezone.utc)
+        assignments = ", ".join(f"{column} = ?" for column in [*values, 'updated_at'])
+        sql = f"UPDATE organisations SET {assignments} WHERE id = ?"
+        params = [*values.values(), now.isoformat(), id]
+        if expected_updated_at is not None:
+            clause, clause_params = version_clause(expected_updated_at)
+            sql += f" AND {clause}"
+            params.extend(clause_params)
         
-        with self._get_connection() as conn:
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now(timezone.utc)
-            
-            cursor.execute("""
-                UPDATE organisations
-                SET name = ?, details = ?, tags = ?, url = ?, updated_at = ?
-                WHERE id = ?
-            """, (
-                entity.name,
-                entity.details,
-                json.dumps(entity.tags),
-                entity.url,
-                now.isoformat(),
-                id
-            ))
-            
-            conn.commit()
-            
-        return self.get_by_id(id)
+            cursor.execute(sql + " RETURNING *", params)
+            row = cursor.fetchone()
+            return self._row_to_entity(row) if row else None
     
-    def delete(self, id: int) -> bool:
-        with self._get_connection() as conn:
+    def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        sql = "DELETE FROM organisations WHERE id = ?"
+        params: List[Any] = [id]
+        if expected_updated_at is not None:
+            clause, clause_params = version_clause(expected_updated_at)
+            sql += f" AND {clause}"
+            params.extend(clause_params)
+        
+        with self._get_write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM organisations WHERE id = ?", (id,))
+            cursor.execute(sql, params)
             deleted = cursor.rowcount > 0
             conn.commit()
             return deleted
+    
+    def create_many(self, entities: Sequence[Organisation], chunk_size: int = 500) -> BulkResult:
+        now = datetime.now(timezone.utc)
+        rows = [self._insert_params(entity, now) for entity in entities]
+        with self._get_write_connection() as conn:
+            result = insert_many(conn, self.INSERT_SQL, rows)
+        for item in result.succeeded:
+            entity = entities[item.index]
+            entity.id = item.id
+            entity.created_at = now
+            entity.updated_at = now
+        return result
+    
+    def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        now = datetime.now(timezone.utc)
+        # Unknown columns fail their own item in update_many, not the whole batch.
+        rows = [(id, self._encode_values(values)) for id, values in changes]
+        with self._get_write_connection() as conn:
+            return update_many(conn, 'organisations', rows, self.UPDATABLE_COLUMNS, now.isoformat(), chunk_size)
+    
+    def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        with self._get_write_connection() as conn:
+            return delete_many(conn, 'organisations', ids, chunk_size)
@@ -0,0 +1,128 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Clause = Tuple[str, List[Any]]
+FilterBuilder = Callable[[Any], Clause]
+
+
+@dataclass
+class PageQuery:
+    after_id: Optional[int] = None
+    limit: Optional[int] = None
+    filters: Dict[str, Any] = field(default_factory=dict)
+    fields: Optional[Sequence[str]] = None
+
+
+def prefix_clause(column: str) -> FilterBuilder:
+    # A half-open range keeps the predicate sargable, unlike LIKE 'x%'.
+    def build(prefix: str) -> Clause:
+        if not prefix:
+            return "1 = 1", []
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return f"{column} >= ? AND {column} < ?", [prefix, upper]
+    return build
+
+
+def equals_clause(column: str) -> FilterBuilder:
+    def build(value: Any) -> Clause:
+        return f"{column} = ?", [value]
+    return build
+
+
+def in_clause(column: str) -> FilterBuilder:
+    def build(values: Sequence[Any]) -> Clause:
+        values = list(dict.fromkeys(values))
+        return f"{column} IN ({', '.join('?' for _ in values)})", values
+    return build
+
+
+def in_subquery_clause(column: str, subquery: str) -> FilterBuilder:
+    def build(values: Sequence[Any]) -> Clause:
+        values = list(dict.fromkeys(values))
+        placeholders = ", ".join("?" for _ in values)
+        return f"{column} IN ({subquery.format(placeholders=placeholders, count=len(values))})", values
+    return build
+
+
+def _utc_isoformat(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def timestamp_clause(column: str, operator: str) -> FilterBuilder:
+    def build(value: datetime) -> Clause:
+        return f"{column} {operator} ?", [_utc_isoformat(value)]
+    return build
+
+
+def version_clause(expected_updated_at: Sequence[datetime]) -> Clause:
+    # Optimistic-concurrency guard: the row must still carry one of the
+    # updated_at values the client last saw.
+    if not expected_updated_at:
+        return "0 = 1", []
+    placeholders = ", ".join("?" for _ in expected_updated_at)
+    return f"updated_at IN ({placeholders})", [_utc_isoformat(value) for value in expected_updated_at]
+
+
+def utc_z_expression(column: str) -> str:
+    # Timestamps are stored via isoformat(); JSON responses use the shorter
+    # RFC 3339 "Z" form for UTC, as Pydantic does.
+    return f"replace({column}, '+00:00', 'Z')"
+
+
+def json_object_expression(fields: Sequence[str], expressions: Dict[str, str]) -> str:
+    pairs = ", ".join(f"'{name}', {expressions.get(name, name)}" for name in fields)
+    return f"json_object({pairs})"
+
+
+def build_page_select(
+    table: str,
+    columns: Sequence[str],
+    filter_builders: Dict[str, FilterBuilder],
+    query: PageQuery,
+    json_expressions: Optional[Dict[str, str]] = None
+) -> Tuple[str, List[Any]]:
+    """Build a keyset-paginated SELECT for ``query``.
+
+    With ``json_expressions`` the statement returns ``(id, document)`` rows,
+    where ``document`` is the requested fields rendered as a JSON object by
+    SQLite; the mapping overrides how individual columns are encoded.
+    """
+    if query.fields is not None:
+        unknown = [name for name in query.fields if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    if json_expressions is not None:
+        fields = list(columns) if query.fields is None else list(query.fields)
+        selected = ['id', f"{json_object_expression(fields, json_expressions)} AS document"]
+    elif query.fields is None:
+        selected = list(columns)
+    else:
+        selected = ['id'] + [name for name in query.fields if name != 'id']
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    for name, value in query.filters.items():
+        if value is None:
+            continue
+        builder = filter_builders.get(name)
+        if builder is None:
+            raise ValueError(f"Unknown filter: {name}")
+        clause, clause_params = builder(value)
+        clauses.append(clause)
+        params.extend(clause_params)
+    if query.after_id is not None:
+        clauses.append("id > ?")
+        params.append(query.after_id)
+
+    sql = f"SELECT {', '.join(selected)} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(f"({clause})" for clause in clauses)
+    sql += " ORDER BY id"
+    if query.limit is not None:
+        sql += " LIMIT ?"
+        params.append(query.limit)
+    return sql, params
@@ -0,0 +1,168 @@
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import ContextManager, Dict, List, Optional, Sequence, Tuple
+from repositories.connection_pool import ConnectionPool
+from repositories.migrations import migrate
+
+MAX_TERMS = 10
+MIN_PREFIX_LENGTH = 2
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    kind: str
+    table: str
+    # bm25 weight per indexed column, in column order.
+    weights: Tuple[float, ...]
+    title_sql: str
+
+    @property
+    def fts(self) -> str:
+        return f"{self.table}_fts"
+
+    @property
+    def score_sql(self) -> str:
+        return f"bm25({self.fts}, {', '.join(str(weight) for weight in self.weights)})"
+
+
+SOURCES: Dict[str, SearchSource] = {
+    source.kind: source
+    for source in (
+        # name, details, tags
+        SearchSource('organisation', 'organisations', (10.0, 1.0, 5.0), "name"),
+        # name, last_name, location
+        SearchSource('employee', 'employees', (10.0, 10.0, 2.0), "name || ' ' || last_name"),
+    )
+}
+SEARCH_KINDS: Tuple[str, ...] = tuple(SOURCES)
+
+# snippet() wraps matches in these control characters; the stored text is
+# HTML-escaped before they are swapped for <mark> tags, so the snippet is
+# safe to render as HTML whatever the column contains.
+_MATCH_START = "char(2)"
+_MATCH_END = "char(3)"
+
+
+def snippet_html(fts: str) -> str:
+    """SQL for an HTML-escaped FTS5 snippet with matches in ``<mark>`` tags."""
+    sql = f"snippet({fts}, -1, {_MATCH_START}, {_MATCH_END}, '…', 12)"
+    for character, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        sql = f"replace({sql}, '{character}', '{entity}')"
+    return f"replace(replace({sql}, {_MATCH_START}, '<mark>'), {_MATCH_END}, '</mark>')"
+
+
+def match_expression(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Only word characters reach FTS5, so user input can never be parsed as
+    query syntax (``OR``, ``NEAR``, column filters, unbalanced quotes).
+    Single characters match whole words only; as prefixes they would match
+    most of the index and have no prefix index to use.
+    """
+    words = _WORD.findall(text)[:MAX_TERMS]
+    return " ".join(f'"{word}"*' if len(word) >= MIN_PREFIX_LENGTH else f'"{word}"' for word in words) or None
+
+
+class SearchRepository:
+    """Ranked full-text search over organisations and employees.
+
+    Backed by the external-content FTS5 tables from migration 5, which
+    triggers keep in step with the base tables. A page is found in two
+    steps: first only ids and bm25 scores are ranked, with each source cut
+    to ``offset + limit`` rows before merging, then titles and snippets are
+    rendered for the rows on the page alone.
+    """
+
+    def __init__(self, db_path: str, pool: Optional[ConnectionPool] = None):
+        self._db_path = db_path
+        self._pool = pool or ConnectionPool(db_path)
+        self._init_db()
+
+    def _get_connection(self) -> ContextManager[sqlite3.Connection]:
+        return self._pool.connection()
+
+    def _init_db(self) -> None:
+        with self._get_connection() as conn:
+            migrate(conn)
+
+    def _ranked(
+        self,
+        conn: sqlite3.Connection,
+        match: str,
+        sources: Sequence[SearchSource],
+        limit: int,
+        offset: int
+    ) -> List[Tuple[str, int]]:
+        branches = [
+            f"""
+            SELECT * FROM (
+                SELECT '{source.kind}' AS kind, rowid AS id, {source.score_sql} AS score
+                FROM {source.fts} WHERE {source.fts} MATCH ?
+                ORDER BY score, rowid LIMIT ?
+            )
+            """
+            for source in sources
+        ]
+        sql = " UNION ALL ".join(branches) + " ORDER BY score, kind, id LIMIT ? OFFSET ?"
+        params: List[object] = []
+        for _ in sources:
+            params += [match, offset + limit]
+        cursor = conn.execute(sql, params + [limit, offset])
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def _render(
+        self,
+        conn: sqlite3.Connection,
+        match: str,
+        source: SearchSource,
+        ids: Sequence[int]
+    ) -> Dict[int, str]:
+        placeholders = ", ".join("?" for _ in ids)
+        cursor = conn.execute(
+            f"""
+            SELECT rowid, json_object(
+                'type', '{source.kind}',
+                'id', rowid,
+                'title', {source.title_sql},
+                'snippet', {snippet_html(source.fts)},
+                'score', round(-{source.score_sql}, 4)
+            )
+            FROM {source.fts} WHERE {source.fts} MATCH ? AND rowid IN ({placeholders})
+            """,
+            [match, *ids]
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def search_json(
+        self,
+        text: str,
+        kinds: Sequence[str] = SEARCH_KINDS,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[str]:
+        """Return a page of hits, best first, as rendered JSON objects."""
+        match = match_expression(text)
+        if match is None:
+            raise ValueError("Search text must contain at least one word")
+        sources = [SOURCES[kind] for kind in kinds]
+        with self._get_connection() as conn:
+            page = self._ranked(conn, match, sources, limit, offset)
+            documents: Dict[Tuple[str, int], str] = {}
+            for source in sources:
+                ids = [id for kind, id in page if kind == source.kind]
+                if ids:
+                    documents.update(
+                        ((source.kind, id), document)
+                        for id, document in self._render(conn, match, source, ids).items()
+                    )
+        # A row deleted between the two statements simply drops out.
+        return [documents[hit] for hit in page if hit in documents]
+
+    def table_versions(self) -> str:
+        with self._get_connection() as conn:
+            rows = dict(conn.execute(
+                "SELECT table_name, version FROM table_versions WHERE table_name IN ('organisations', 'employees')"
+            ).fetchall())
+        return f"{rows.get('organisations', 0)}.{rows.get('employees', 0)}"
@@ -0,0 +1,45 @@
+import sqlite3
+from dataclasses import dataclass
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+
+@dataclass(frozen=True)
+class StorageSettings:
+    """PRAGMAs applied to every pooled SQLite connection.
+
+    ``cache_size`` follows SQLite's convention: negative values are KiB,
+    positive values are pages. ``busy_timeout`` is in milliseconds.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -20000
+    mmap_size: int = 268435456
+    busy_timeout: int = 5000
+    temp_store: str = "MEMORY"
+
+    def __post_init__(self):
+        # PRAGMA arguments cannot be bound as parameters, so only known
+        # keywords are allowed through.
+        _check_choice("journal_mode", self.journal_mode, JOURNAL_MODES)
+        _check_choice("synchronous", self.synchronous, SYNCHRONOUS_LEVELS)
+        _check_choice("temp_store", self.temp_store, TEMP_STORES)
+        for name in ("cache_size", "mmap_size", "busy_timeout"):
+            if not isinstance(getattr(self, name), int):
+                raise ValueError(f"{name} must be an integer")
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout}")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {self.cache_size}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+
+
+def _check_choice(name: str, value: str, choices: tuple) -> None:
+    if value.upper() not in choices:
+        raise ValueError(f"Invalid {name} {value!r}; expected one of {', '.join(choices)}")
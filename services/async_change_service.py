@@ -0,0 +1,18 @@
+from typing import List, Sequence, Tuple
+from repositories.async_repository import AsyncChangeRepository
+from repositories.change_repository import CHANGE_KINDS
+
+class AsyncChangeService:
+    def __init__(self, repository: AsyncChangeRepository):
+        self._repository = repository
+    
+    async def get_changes_json(
+        self,
+        since: int = 0,
+        kinds: Sequence[str] = CHANGE_KINDS,
+        limit: int = 100
+    ) -> List[Tuple[int, str]]:
+        return await self._repository.changes_json(since, kinds, limit)
+    
+    async def get_latest_seq(self) -> int:
+        return await self._repository.latest_seq()
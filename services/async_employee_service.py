@@ -0,0 +1,96 @@
+import functools
+from concurrent.futures import Executor
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from repositories.async_repository import iterate_on_executor, run_on_executor
+from repositories.bulk import BulkResult
+from repositories.demographics import DemographicsQuery
+from repositories.query import PageQuery
+from services.employee_service import EmployeeService
+from models.employee import Employee
+
+class AsyncEmployeeService:
+    """Awaitable EmployeeService for the async routers; see AsyncOrganisationService."""
+    
+    def __init__(self, service: EmployeeService, executor: Executor):
+        self._service = service
+        self._executor = executor
+    
+    async def _run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await run_on_executor(self._executor, functools.partial(function, *args, **kwargs))
+    
+    async def get_employee_by_id(self, id: int) -> Optional[Employee]:
+        return await self._run(self._service.get_employee_by_id, id)
+    
+    async def query_employees(self, query: PageQuery) -> List[Employee]:
+        return await self._run(self._service.query_employees, query)
+    
+    async def query_employees_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return await self._run(self._service.query_employees_json, query)
+    
+    def iter_employee_batches(self, batch_size: int = 1000) -> AsyncIterator[List[Employee]]:
+        return iterate_on_executor(self._executor, self._service.iter_employee_batches(batch_size))
+    
+    async def count_employees_by_organisation(self, organisation_ids: Sequence[int]) -> Dict[int, int]:
+        return await self._run(self._service.count_employees_by_organisation, organisation_ids)
+    
+    async def get_organisation_summaries(self, organisation_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        return await self._run(self._service.get_organisation_summaries, organisation_ids)
+    
+    async def get_employee_demographics(self, query: DemographicsQuery) -> Dict[str, Any]:
+        return await self._run(self._service.get_employee_demographics, query)
+    
+    async def get_employees_version(self) -> int:
+        return await self._run(self._service.get_employees_version)
+    
+    async def create_employee(
+        self,
+        name: str,
+        last_name: str,
+        age: int,
+        date_of_birth: date,
+        location: str,
+        organisation_id: int
+    ) -> Employee:
+        return await self._run(
+            self._service.create_employee, name, last_name, age, date_of_birth, location, organisation_id
+        )
+    
+    async def update_employee(
+        self,
+        id: int,
+        name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        age: Optional[int] = None,
+        date_of_birth: Optional[date] = None,
+        location: Optional[str] = None,
+        organisation_id: Optional[int] = None,
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[Employee]:
+        return await self._run(
+            self._service.update_employee,
+            id,
+            name=name,
+            last_name=last_name,
+            age=age,
+            date_of_birth=date_of_birth,
+            location=location,
+            organisation_id=organisation_id,
+            expected_updated_at=expected_updated_at
+        )
+    
+    async def delete_employee(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        return await self._run(self._service.delete_employee, id, expected_updated_at)
+    
+    async def create_employees(self, items: Sequence[Dict[str, Any]], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._service.create_employees, items, chunk_size)
+    
+    async def update_employees(
+        self,
+        updates: Sequence[Tuple[int, Dict[str, Any]]],
+        chunk_size: int = 500
+    ) -> BulkResult:
+        return await self._run(self._service.update_employees, updates, chunk_size)
+    
+    async def delete_employees(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._service.delete_employees, ids, chunk_size)
@@ -0,0 +1,77 @@
+import functools
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from repositories.async_repository import iterate_on_executor, run_on_executor
+from repositories.bulk import BulkResult
+from repositories.query import PageQuery
+from services.organisation_service import OrganisationService
+from models.entity import Organisation
+
+class AsyncOrganisationService:
+    """Awaitable OrganisationService for the async routers.
+    
+    Every call runs the synchronous service on the database executor, so the
+    service logic exists once and the event loop only waits for the result.
+    """
+    
+    def __init__(self, service: OrganisationService, executor: Executor):
+        self._service = service
+        self._executor = executor
+    
+    async def _run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await run_on_executor(self._executor, functools.partial(function, *args, **kwargs))
+    
+    async def get_organisation_by_id(self, id: int) -> Optional[Organisation]:
+        return await self._run(self._service.get_organisation_by_id, id)
+    
+    async def query_organisations(self, query: PageQuery) -> List[Organisation]:
+        return await self._run(self._service.query_organisations, query)
+    
+    async def query_organisations_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return await self._run(self._service.query_organisations_json, query)
+    
+    def iter_organisation_batches(self, batch_size: int = 1000) -> AsyncIterator[List[Organisation]]:
+        return iterate_on_executor(self._executor, self._service.iter_organisation_batches(batch_size))
+    
+    async def get_organisations_version(self) -> int:
+        return await self._run(self._service.get_organisations_version)
+    
+    async def get_tag_counts(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return await self._run(self._service.get_tag_counts, limit)
+    
+    async def create_organisation(
+        self,
+        name: str,
+        details: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        url: Optional[str] = None
+    ) -> Organisation:
+        return await self._run(self._service.create_organisation, name, details, tags, url)
+    
+    async def update_organisation(
+        self,
+        id: int,
+        name: Optional[str] = None,
+        details: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        url: Optional[str] = None,
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[Organisation]:
+        return await self._run(self._service.update_organisation, id, name, details, tags, url, expected_updated_at)
+    
+    async def delete_organisation(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        return await self._run(self._service.delete_organisation, id, expected_updated_at)
+    
+    async def create_organisations(self, items: Sequence[Dict[str, Any]], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._service.create_organisations, items, chunk_size)
+    
+    async def update_organisations(
+        self,
+        updates: Sequence[Tuple[int, Dict[str, Any]]],
+        chunk_size: int = 500
+    ) -> BulkResult:
+        return await self._run(self._service.update_organisations, updates, chunk_size)
+    
+    async def delete_organisations(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        return await self._run(self._service.delete_organisations, ids, chunk_size)
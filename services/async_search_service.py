@@ -0,0 +1,19 @@
+from typing import List, Sequence
+from repositories.async_repository import AsyncSearchRepository
+from repositories.search_repository import SEARCH_KINDS
+
+class AsyncSearchService:
+    def __init__(self, repository: AsyncSearchRepository):
+        self._repository = repository
+    
+    async def search_json(
+        self,
+        text: str,
+        kinds: Sequence[str] = SEARCH_KINDS,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[str]:
+        return await self._repository.search_json(text, kinds, limit, offset)
+    
+    async def get_search_version(self) -> str:
+        return await self._repository.table_versions()
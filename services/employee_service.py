@@ -1,6 +1,9 @@
-from typing import List, Optional
-from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import date, datetime
 from repositories.base import IRepository
+from repositories.bulk import BulkResult
+from repositories.demographics import DemographicsQuery
+from repositories.query import PageQuery
 from models.employee import Employee
 
 class EmployeeService:
@@ -13,6 +16,27 @@ class EmployeeService:
     def get_employee_by_id(self, id: int) -> Optional[Employee]:
         return self._repository.get_by_id(id)
     
+    def query_employees(self, query: PageQuery) -> List[Employee]:
+        return self._repository.query(query)
+    
+    def query_employees_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return self._repository.query_json(query)
+    
+    def iter_employee_batches(self, batch_size: int = 1000) -> Iterator[List[Employee]]:
+        return self._repository.iter_batches(batch_size)
+    
+    def count_employees_by_organisation(self, organisation_ids: Sequence[int]) -> Dict[int, int]:
+        return self._repository.count_by_organisation(organisation_ids)
+    
+    def get_organisation_summaries(self, organisation_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        return self._repository.summaries_by_organisation(organisation_ids)
+    
+    def get_employee_demographics(self, query: DemographicsQuery) -> Dict[str, Any]:
+        return self._repository.demographics(query)
+    
+    def get_employees_version(self) -> int:
+        return self._repository.table_version()
+    
     def create_employee(
         self,
         name: str,
@@ -40,22 +64,40 @@ class EmployeeService:
         age: Optional[int] = None,
         date_of_birth: Optional[date] = None,
         location: Optional[str] = None,
-        organisation_id: Optional[int] = None
+        organisation_id: Optional[int] = None,
+        expected_updated_at: Optional[Sequence[datetime]] = None
     ) -> Optional[Employee]:
-        existing = self._repository.get_by_id(id)
-        if not existing:
-            return None
-        
-        updated_employee = Employee(
-            name=name if name is not None else existing.name,
-            last_name=last_name if last_name is not None else existing.last_name,
-            age=age if age is not None else existing.age,
-            date_of_birth=date_of_birth if date_of_birth is not None else existing.date_of_birth,
-            location=location if location is not None else existing.location,
-            organisation_id=organisation_id if organisation_id is not None else existing.organisation_id
+        changes = {
+            'name': name,
+            'last_name': last_name,
+            'age': age,
+            'date_of_birth': date_of_birth,
+            'location': location,
+            'organisation_id': organisation_id
+        }
+        return self._repository.update_partial(
+            id,
+            {field: value for field, value in changes.items() if value is not None},
+            expected_updated_at
         )
-        
-        return self._repository.update(id, updated_employee)
     
-    def delete_employee(self, id: int) -> bool:
-        return self._repository.delete(id)
+    def delete_employee(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        return self._repository.delete(id, expected_updated_at)
+    
+    def create_employees(self, items: Sequence[Dict[str, Any]], chunk_size: int = 500) -> BulkResult:
+        employees = [Employee(**item) for item in items]
+        return self._repository.create_many(employees, chunk_size)
+    
+    def update_employees(
+        self,
+        updates: Sequence[Tuple[int, Dict[str, Any]]],
+        chunk_size: int = 500
+    ) -> BulkResult:
+        changes = [
+            (id, {name: value for name, value in values.items() if value is not None})
+            for id, values in updates
+        ]
+        return self._repository.update_many(changes, chunk_size)
+    
+    def delete_employees(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        return self._repository.delete_many(ids, chunk_size)
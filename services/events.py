@@ -0,0 +1,298 @@
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+from observability.metrics import REGISTRY, MetricsRegistry
+from repositories.base import IRepository, T
+from repositories.bulk import BulkResult, Changes
+from repositories.query import PageQuery
+
+EVENT_TYPES = ('organisation', 'employee')
+
+
+class TooManySubscribersError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class EntityEvent:
+    type: str
+    # created, updated or deleted
+    op: str
+    id: int
+    # The organisation itself for organisation events; None when unknown.
+    organisation_id: Optional[int] = None
+    # Set when an update moved an employee to another organisation.
+    previous_organisation_id: Optional[int] = None
+
+
+class Subscription:
+    """One subscriber's bounded queue of events.
+
+    Events are delivered on the subscriber's event loop. A subscriber that
+    falls more than ``max_queued`` events behind is closed with
+    ``overflowed`` set rather than allowed to grow without limit; it has to
+    catch up from the change feed and subscribe again.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        types: Sequence[str],
+        organisation_id: Optional[int],
+        max_queued: int
+    ):
+        self._loop = loop
+        self.types: FrozenSet[str] = frozenset(types)
+        self.organisation_id = organisation_id
+        self._max_queued = max_queued
+        self._pending: Deque[EntityEvent] = deque()
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.overflowed = False
+
+    def matches(self, event: EntityEvent) -> bool:
+        if event.type not in self.types:
+            return False
+        return self.organisation_id is None or self.organisation_id in (
+            event.organisation_id, event.previous_organisation_id
+        )
+
+    def _deliver(self, events: List[EntityEvent]) -> None:
+        if self.closed:
+            return
+        if len(self._pending) + len(events) > self._max_queued:
+            self._pending.clear()
+            self.overflowed = True
+            self.close()
+            return
+        self._pending.extend(events)
+        self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[EntityEvent]:
+        """Wait up to ``timeout`` seconds for events and return all that are queued."""
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._ready.clear()
+        events = list(self._pending)
+        self._pending.clear()
+        return events
+
+
+class EventBus:
+    """In-process publish/subscribe for entity writes.
+
+    Services publish after a write has committed. Publishing never blocks
+    on subscribers: it can be called from any thread, matches each
+    subscriber's filter, and hands every subscriber its events in one
+    callback on that subscriber's loop. Memory is bounded by
+    ``max_subscribers`` times ``max_queued`` events.
+    """
+
+    def __init__(self, max_queued: int = 1000, max_subscribers: int = 100, registry: MetricsRegistry = REGISTRY):
+        self.max_queued = max_queued
+        self.max_subscribers = max_subscribers
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._subscribers = registry.gauge("events_subscribers", "Open event stream subscriptions.")
+        self._published = registry.counter("events_published_total", "Entity events published.", ("type",))
+        self._overflows = registry.counter(
+            "events_subscriber_overflows_total", "Subscriptions closed for falling too far behind."
+        )
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    def subscribe(self, types: Sequence[str] = EVENT_TYPES, organisation_id: Optional[int] = None) -> Subscription:
+        """Subscribe on the running event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), types, organisation_id, self.max_queued)
+        with self._lock:
+            if len(self._subscriptions) >= self.max_subscribers:
+                raise TooManySubscribersError(f"At most {self.max_subscribers} subscribers")
+            self._subscriptions.append(subscription)
+        self._subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.remove(subscription)
+        self._subscribers.dec()
+        if subscription.overflowed:
+            self._overflows.inc()
+
+    def close(self) -> None:
+        """End every subscription, e.g. at shutdown so open streams finish."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription.close)
+            except RuntimeError:
+                subscription.close()
+
+    def publish(self, events: Iterable[EntityEvent]) -> None:
+        events = list(events)
+        if not events:
+            return
+        for type in EVENT_TYPES:
+            count = sum(1 for event in events if event.type == type)
+            if count:
+                self._published.labels(type).inc(count)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for subscription in subscriptions:
+            matched = [event for event in events if subscription.matches(event)]
+            if not matched:
+                continue
+            if subscription._loop is current:
+                subscription._deliver(matched)
+            else:
+                try:
+                    subscription._loop.call_soon_threadsafe(subscription._deliver, matched)
+                except RuntimeError:
+                    # The subscriber's loop has shut down.
+                    self.unsubscribe(subscription)
+
+
+OrganisationLookup = Callable[[Sequence[int]], Dict[int, int]]
+
+
+def _own_organisation(ids: Sequence[int]) -> Dict[int, int]:
+    return {id: id for id in ids}
+
+
+class PublishingRepository(IRepository[T]):
+    """Publishes an event for each successful write made through another repository.
+
+    The sync services use it directly and the async services reach it
+    through their executor, so every write is published once, from one
+    place, whichever path made it. ``organisation_ids`` maps entity ids to
+    their organisation (organisations are their own); it is only called
+    while someone is subscribed, before a write to learn where a moved or
+    deleted entity was and after it to learn where it is now.
+    """
+
+    def __init__(
+        self,
+        repository: IRepository[T],
+        events: EventBus,
+        type: str,
+        organisation_ids: OrganisationLookup = _own_organisation
+    ):
+        self._repository = repository
+        self._events = events
+        self._type = type
+        self._organisation_ids = organisation_ids
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    @property
+    def repository(self) -> IRepository[T]:
+        return self._repository
+
+    def _organisations(self, ids: Sequence[int]) -> Dict[int, int]:
+        if not ids or not self._events.has_subscribers:
+            return {}
+        return self._organisation_ids(ids)
+
+    def _publish(
+        self,
+        op: str,
+        ids: Sequence[int],
+        organisations: Dict[int, int],
+        previous: Optional[Dict[int, int]] = None
+    ) -> None:
+        events = []
+        for id in ids:
+            organisation_id = organisations.get(id)
+            moved_from = (previous or {}).get(id)
+            events.append(EntityEvent(
+                self._type, op, id, organisation_id, moved_from if moved_from != organisation_id else None
+            ))
+        self._events.publish(events)
+
+    def get_by_id(self, id: int) -> Optional[T]:
+        return self._repository.get_by_id(id)
+
+    def get_all(self) -> List[T]:
+        return self._repository.get_all()
+
+    def query(self, query: PageQuery) -> List[T]:
+        return self._repository.query(query)
+
+    def query_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return self._repository.query_json(query)
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[T]]:
+        return self._repository.iter_batches(batch_size)
+
+    def table_version(self) -> int:
+        return self._repository.table_version()
+
+    def create(self, entity: T) -> T:
+        created = self._repository.create(entity)
+        self._publish('created', [created.id], self._organisations([created.id]))
+        return created
+
+    def update(self, id: int, entity: T) -> Optional[T]:
+        previous = self._organisations([id])
+        updated = self._repository.update(id, entity)
+        if updated:
+            self._publish('updated', [id], self._organisations([id]), previous)
+        return updated
+
+    def update_partial(
+        self,
+        id: int,
+        changes: Dict[str, Any],
+        expected_updated_at: Optional[Sequence[datetime]] = None
+    ) -> Optional[T]:
+        previous = self._organisations([id])
+        updated = self._repository.update_partial(id, changes, expected_updated_at)
+        if updated:
+            self._publish('updated', [id], self._organisations([id]), previous)
+        return updated
+
+    def delete(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        previous = self._organisations([id])
+        deleted = self._repository.delete(id, expected_updated_at)
+        if deleted:
+            self._publish('deleted', [id], previous)
+        return deleted
+
+    def create_many(self, entities: Sequence[T], chunk_size: int = 500) -> BulkResult:
+        result = self._repository.create_many(entities, chunk_size)
+        ids = [item.id for item in result.succeeded]
+        self._publish('created', ids, self._organisations(ids))
+        return result
+
+    def update_many(self, changes: Sequence[Changes], chunk_size: int = 500) -> BulkResult:
+        previous = self._organisations([id for id, _ in changes])
+        result = self._repository.update_many(changes, chunk_size)
+        ids = [item.id for item in result.succeeded]
+        self._publish('updated', ids, self._organisations(ids), previous)
+        return result
+
+    def delete_many(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        previous = self._organisations(ids)
+        result = self._repository.delete_many(ids, chunk_size)
+        self._publish('deleted', [item.id for item in result.succeeded], previous)
+        return result
@@ -1,5 +1,8 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from repositories.base import IRepository
+from repositories.bulk import BulkResult
+from repositories.query import PageQuery
 from models.entity import Organisation
 
 class OrganisationService:
@@ -12,6 +15,21 @@ class OrganisationService:
     def get_organisation_by_id(self, id: int) -> Optional[Organisation]:
         return self._repository.get_by_id(id)
     
+    def query_organisations(self, query: PageQuery) -> List[Organisation]:
+        return self._repository.query(query)
+    
+    def query_organisations_json(self, query: PageQuery) -> List[Tuple[int, str]]:
+        return self._repository.query_json(query)
+    
+    def iter_organisation_batches(self, batch_size: int = 1000) -> Iterator[List[Organisation]]:
+        return self._repository.iter_batches(batch_size)
+    
+    def get_organisations_version(self) -> int:
+        return self._repository.table_version()
+    
+    def get_tag_counts(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self._repository.tag_counts(limit)
+    
     def create_organisation(
         self,
         name: str,
@@ -33,20 +51,41 @@ class OrganisationService:
         name: Optional[str] = None,
         details: Optional[str] = None,
         tags: Optional[List[str]] = None,
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        expected_updated_at: Optional[Sequence[datetime]] = None
     ) -> Optional[Organisation]:
-        existing = self._repository.get_by_id(id)
-        if not existing:
-            return None
-        
-        updated_org = Organisation(
-            name=name if name is not None else existing.name,
-            details=details if details is not None else existing.details,
-            tags=tags if tags is not None else existing.tags,
-            url=url if url is not None else existing.url
+        changes = {'name': name, 'details': details, 'tags': tags, 'url': url}
+        return self._repository.update_partial(
+            id,
+            {field: value for field, value in changes.items() if value is not None},
+            expected_updated_at
         )
-        
-        return self._repository.update(id, updated_org)
     
-    def delete_organisation(self, id: int) -> bool:
-        return self._repository.delete(id)
+    def delete_organisation(self, id: int, expected_updated_at: Optional[Sequence[datetime]] = None) -> bool:
+        return self._repository.delete(id, expected_updated_at)
+    
+    def create_organisations(self, items: Sequence[Dict[str, Any]], chunk_size: int = 500) -> BulkResult:
+        organisations = [
+            Organisation(
+                name=item['name'],
+                details=item.get('details'),
+                tags=item.get('tags') or [],
+                url=item.get('url')
+            )
+            for item in items
+        ]
+        return self._repository.create_many(organisations, chunk_size)
+    
+    def update_organisations(
+        self,
+        updates: Sequence[Tuple[int, Dict[str, Any]]],
+        chunk_size: int = 500
+    ) -> BulkResult:
+        changes = [
+            (id, {name: value for name, value in values.items() if value is not None})
+            for id, values in updates
+        ]
+        return self._repository.update_many(changes, chunk_size)
+    
+    def delete_organisations(self, ids: Sequence[int], chunk_size: int = 500) -> BulkResult:
+        return self._repository.delete_many(ids, chunk_size)
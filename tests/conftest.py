@@ -1,9 +1,13 @@
 import pytest
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from fastapi.testclient import TestClient
 from repositories.organisation_repository import OrganisationRepository
+from repositories.employee_repository import EmployeeRepository
 from services.organisation_service import OrganisationService
+from services.async_organisation_service import AsyncOrganisationService
 from main import app
 
 @pytest.fixture
@@ -12,18 +16,32 @@ def test_db_path():
     fd, path = tempfile.mkstemp(suffix='.db')
     os.close(fd)
     yield path
-    os.unlink(path)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
 
 @pytest.fixture
 def repository(test_db_path):
     """Create a test repository instance."""
     return OrganisationRepository(test_db_path)
 
+@pytest.fixture
+def employee_repository(test_db_path):
+    """Create a test employee repository instance."""
+    return EmployeeRepository(test_db_path)
+
 @pytest.fixture
 def service(repository):
     """Create a test service instance."""
     return OrganisationService(repository)
 
+@pytest.fixture
+def async_service(repository):
+    """Create an async service backed by a dedicated executor."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield AsyncOrganisationService(OrganisationService(repository), executor)
+    executor.shutdown(wait=True)
+
 @pytest.fixture
 def client():
     """Create a test client for API testing."""
@@ -39,6 +57,18 @@ def sample_org_data():
         "url": "https://testcompany.com"
     }
 
+@pytest.fixture
+def sample_employee_data():
+    """Sample employee data for testing."""
+    return {
+        "name": "Jane",
+        "last_name": "Doe",
+        "age": 30,
+        "date_of_birth": date(1994, 2, 1),
+        "location": "London",
+        "organisation_id": 1
+    }
+
 @pytest.fixture
 def sample_org_data_minimal():
     """Minimal organisation data for testing."""
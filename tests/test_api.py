@@ -1,11 +1,31 @@
 import pytest
+import asyncio
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import date
 from fastapi.testclient import TestClient
 from main import app
+from api.compression import negotiate
 from api.config import API_PREFIX
+from api.container import ServiceContainer
+from api import dependencies
+from api.dependencies import get_container, get_event_bus, get_organisation_service, get_employee_service
+from api.routers.events_router import KEEP_ALIVE, OVERFLOW, event_stream, sse_frame
+from observability.metrics import MetricsRegistry
+from repositories.cached_repository import CachedRepository
+from repositories.organisation_repository import OrganisationRepository
+from services.events import EntityEvent, EventBus
 
 client = TestClient(app)
 
 ORGANISATION_ENDPOINT = f"{API_PREFIX}/organisation"
+EMPLOYEE_ENDPOINT = f"{API_PREFIX}/employee"
+SEARCH_ENDPOINT = f"{API_PREFIX}/search"
+CHANGES_ENDPOINT = f"{API_PREFIX}/changes"
+EVENTS_ENDPOINT = f"{API_PREFIX}/events"
 
 
 class TestOrganisationAPI:
@@ -210,3 +230,785 @@ class TestOrganisationAPI:
         assert response.status_code == 201
         data = response.json()
         assert data["tags"] == []
+
+
+class TestListQueryAPI:
+    def test_limit_and_next_cursor(self):
+        """Test that a full page advertises the cursor for the next page."""
+        prefix = f"Paged {uuid.uuid4().hex}"
+        ids = [
+            client.put(ORGANISATION_ENDPOINT, json={"name": f"{prefix} {i}"}).json()["id"]
+            for i in range(3)
+        ]
+        
+        first = client.get(ORGANISATION_ENDPOINT, params={"name_prefix": prefix, "limit": 2})
+        assert [org["id"] for org in first.json()] == ids[:2]
+        cursor = first.headers["X-Next-After-Id"]
+        
+        second = client.get(ORGANISATION_ENDPOINT, params={
+            "name_prefix": prefix, "limit": 2, "after_id": cursor
+        })
+        assert [org["id"] for org in second.json()] == ids[2:]
+        assert "X-Next-After-Id" not in second.headers
+    
+    def test_tag_filter(self):
+        """Test filtering organisations by tag via query string."""
+        tag = uuid.uuid4().hex
+        client.put(ORGANISATION_ENDPOINT, json={"name": "Tagged", "tags": [tag]})
+        client.put(ORGANISATION_ENDPOINT, json={"name": "Untagged"})
+        
+        response = client.get(ORGANISATION_ENDPOINT, params={"tag": tag})
+        
+        assert response.status_code == 200
+        assert [org["name"] for org in response.json()] == ["Tagged"]
+    
+    def test_multiple_tags_all_and_any(self):
+        """Test AND/OR semantics for repeated tag parameters."""
+        first, second = uuid.uuid4().hex, uuid.uuid4().hex
+        both = client.put(ORGANISATION_ENDPOINT, json={"name": "Both", "tags": [first, second]}).json()["id"]
+        one = client.put(ORGANISATION_ENDPOINT, json={"name": "One", "tags": [first]}).json()["id"]
+        
+        all_response = client.get(ORGANISATION_ENDPOINT, params={"tag": [first, second]})
+        any_response = client.get(ORGANISATION_ENDPOINT, params={"tag": [first, second], "tag_mode": "any"})
+        
+        assert [org["id"] for org in all_response.json()] == [both]
+        assert [org["id"] for org in any_response.json()] == [both, one]
+    
+    def test_tag_counts(self):
+        """Test the tag cardinality endpoint."""
+        tag = uuid.uuid4().hex
+        client.put(ORGANISATION_ENDPOINT, json={"name": "Counted 1", "tags": [tag]})
+        client.put(ORGANISATION_ENDPOINT, json={"name": "Counted 2", "tags": [tag]})
+        
+        response = client.get(f"{ORGANISATION_ENDPOINT}/tags")
+        
+        assert response.status_code == 200
+        assert {"tag": tag, "count": 2} in response.json()
+    
+    def test_fields_projection(self):
+        """Test that only requested fields are serialised."""
+        prefix = f"Projected {uuid.uuid4().hex}"
+        client.put(ORGANISATION_ENDPOINT, json={"name": prefix, "url": "https://p.com"})
+        
+        response = client.get(ORGANISATION_ENDPOINT, params={
+            "name_prefix": prefix, "fields": "name,url"
+        })
+        
+        assert response.status_code == 200
+        assert response.json() == [{"name": prefix, "url": "https://p.com"}]
+    
+    def test_invalid_fields_rejected(self):
+        """Test that unknown projection fields return 400."""
+        response = client.get(ORGANISATION_ENDPOINT, params={"fields": "name,password"})
+        
+        assert response.status_code == 400
+    
+    def test_limit_out_of_range_rejected(self):
+        """Test that limits above the maximum page size are rejected."""
+        response = client.get(ORGANISATION_ENDPOINT, params={"limit": 100000})
+        
+        assert response.status_code == 422
+    
+    def test_employee_list_filters(self):
+        """Test filtering employees by organisation id."""
+        org_id = client.put(ORGANISATION_ENDPOINT, json={"name": "Employer"}).json()["id"]
+        get_employee_service().create_employee(
+            name="Ada", last_name="Lovelace", age=36, date_of_birth=date(1815, 12, 10),
+            location="London", organisation_id=org_id
+        )
+        
+        response = client.get(EMPLOYEE_ENDPOINT, params={
+            "organisation_id": org_id, "fields": "name,organisation_id"
+        })
+        
+        assert response.status_code == 200
+        assert response.json() == [{"name": "Ada", "organisation_id": org_id}]
+
+
+class TestExportAPI:
+    def test_export_organisations_ndjson(self):
+        """Test streaming organisations as NDJSON."""
+        name = f"Exported {uuid.uuid4().hex}"
+        created_id = client.put(ORGANISATION_ENDPOINT, json={"name": name, "tags": ["x"]}).json()["id"]
+        
+        response = client.get(f"{ORGANISATION_ENDPOINT}/export")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        exported = next(row for row in rows if row["id"] == created_id)
+        assert exported["name"] == name
+        assert exported["tags"] == ["x"]
+    
+    def test_export_organisations_csv(self):
+        """Test streaming organisations as CSV."""
+        name = f"Exported {uuid.uuid4().hex}"
+        client.put(ORGANISATION_ENDPOINT, json={"name": name, "tags": ["a", "b"]})
+        
+        response = client.get(f"{ORGANISATION_ENDPOINT}/export", params={"format": "csv"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        exported = next(row for row in rows if row["name"] == name)
+        assert json.loads(exported["tags"]) == ["a", "b"]
+    
+    def test_export_employees(self):
+        """Test streaming employees as NDJSON."""
+        response = client.get(f"{EMPLOYEE_ENDPOINT}/export")
+        
+        assert response.status_code == 200
+        for line in response.text.splitlines():
+            assert "organisation_id" in json.loads(line)
+    
+    def test_export_rejects_unknown_format(self):
+        """Test that unsupported export formats are rejected."""
+        response = client.get(f"{ORGANISATION_ENDPOINT}/export", params={"format": "xml"})
+        
+        assert response.status_code == 422
+
+
+class TestBulkAPI:
+    def test_bulk_create_and_update_organisations(self):
+        """Test bulk create and update in one request."""
+        existing_id = client.put(ORGANISATION_ENDPOINT, json={"name": "Before"}).json()["id"]
+        
+        response = client.put(f"{ORGANISATION_ENDPOINT}/bulk", params={"chunk_size": 1}, json={
+            "create": [{"name": "Bulk One"}, {"name": "Bulk Two", "tags": ["bulk"]}],
+            "update": [{"id": existing_id, "name": "After"}, {"id": 999999, "name": "Missing"}],
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["create"]["succeeded"] == 2
+        assert data["update"]["succeeded"] == 1
+        assert data["update"]["failed"] == 1
+        assert data["update"]["items"][1] == {"index": 1, "id": 999999, "error": "Not found"}
+        created_id = data["create"]["items"][1]["id"]
+        assert client.get(f"{ORGANISATION_ENDPOINT}/{created_id}").json()["tags"] == ["bulk"]
+        assert client.get(f"{ORGANISATION_ENDPOINT}/{existing_id}").json()["name"] == "After"
+    
+    def test_bulk_delete_organisations(self):
+        """Test bulk delete by id list."""
+        created_id = client.put(ORGANISATION_ENDPOINT, json={"name": "Bulk Delete"}).json()["id"]
+        
+        response = client.request("DELETE", f"{ORGANISATION_ENDPOINT}/bulk", json={
+            "ids": [created_id, 999999]
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["items"][1]["error"] == "Not found"
+        assert client.get(f"{ORGANISATION_ENDPOINT}/{created_id}").status_code == 404
+    
+    def test_bulk_employees(self):
+        """Test bulk create and delete of employees."""
+        employee = {
+            "name": "Grace", "last_name": "Hopper", "age": 85,
+            "date_of_birth": "1906-12-09", "location": "New York", "organisation_id": 1
+        }
+        
+        created = client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [employee, employee]}).json()
+        ids = [item["id"] for item in created["create"]["items"]]
+        deleted = client.request("DELETE", f"{EMPLOYEE_ENDPOINT}/bulk", json={"ids": ids}).json()
+        
+        assert created["create"]["succeeded"] == 2
+        assert deleted["succeeded"] == 2
+    
+    def test_bulk_validation_error(self):
+        """Test that invalid bulk items are rejected by request validation."""
+        response = client.put(f"{ORGANISATION_ENDPOINT}/bulk", json={"create": [{"details": "no name"}]})
+        
+        assert response.status_code == 422
+
+
+class TestApplicationContainer:
+    def test_services_are_application_scoped(self):
+        """Test that dependency providers hand out shared instances."""
+        assert get_organisation_service() is get_organisation_service()
+        assert get_employee_service() is get_employee_service()
+    
+    def test_requests_do_not_bootstrap_schema(self, monkeypatch):
+        """Test that handling requests does not re-run schema setup."""
+        get_container()
+        calls = []
+        monkeypatch.setattr(OrganisationRepository, "_init_db", lambda self: calls.append(self))
+        
+        client.put(ORGANISATION_ENDPOINT, json={"name": "No DDL"})
+        client.get(ORGANISATION_ENDPOINT)
+        
+        assert calls == []
+    
+    def test_lifespan_builds_and_closes_container(self):
+        """Test that the lifespan creates the container at startup and closes it at shutdown."""
+        with TestClient(app) as lifespan_client:
+            container = app.state.container
+            assert container is get_container()
+            assert lifespan_client.get(ORGANISATION_ENDPOINT).status_code == 200
+        
+        assert get_container() is not container
+    
+    def test_cache_is_enabled_from_config(self, test_db_path):
+        """Test that the container wraps repositories in the cache only when asked."""
+        plain = ServiceContainer(test_db_path)
+        cached = ServiceContainer(test_db_path, cache_enabled=True, cache_max_entries=10)
+        try:
+            assert not isinstance(plain.organisation_repository, CachedRepository)
+            assert isinstance(cached.organisation_repository, CachedRepository)
+            assert isinstance(cached.employee_repository, CachedRepository)
+            assert cached.organisation_service._repository.repository is cached.organisation_repository
+        finally:
+            plain.close()
+            cached.close()
+    
+    def test_writes_with_cache_enabled(self, test_db_path, monkeypatch):
+        """Test that guarded updates and deletes pass through the cache for both entities."""
+        container = ServiceContainer(test_db_path, cache_enabled=True)
+        monkeypatch.setattr(dependencies, "_container", container)
+        try:
+            org = client.put(ORGANISATION_ENDPOINT, json={"name": "Cached"})
+            org_url = f"{ORGANISATION_ENDPOINT}/{org.json()['id']}"
+            created = client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [{
+                "name": "Jane", "last_name": "Doe", "age": 30, "date_of_birth": "1994-02-01",
+                "location": "London", "organisation_id": org.json()["id"]
+            }]}).json()
+            employee_url = f"{EMPLOYEE_ENDPOINT}/{created['create']['items'][0]['id']}"
+            client.get(org_url)
+            employee = client.get(employee_url)
+            
+            renamed = client.put(org_url, json={"name": "Renamed"}, headers={"If-Match": org.headers["etag"]})
+            older = client.put(employee_url, json={"age": 31}, headers={"If-Match": employee.headers["etag"]})
+            
+            assert renamed.status_code == 200 and client.get(org_url).json()["name"] == "Renamed"
+            assert older.status_code == 200 and client.get(employee_url).json()["age"] == 31
+            assert container.employee_service.delete_employee(created["create"]["items"][0]["id"])
+            assert client.get(employee_url).status_code == 404
+            assert client.delete(org_url).status_code == 200
+            assert client.get(org_url).status_code == 404
+        finally:
+            container.close()
+
+
+class TestConditionalRequestsAPI:
+    def _create(self, name="Conditional Org"):
+        return client.put(ORGANISATION_ENDPOINT, json={"name": f"{name} {uuid.uuid4().hex}"})
+    
+    def test_get_returns_validators(self):
+        """Test that single-entity responses carry a strong ETag and Last-Modified."""
+        created = self._create()
+        
+        response = client.get(f"{ORGANISATION_ENDPOINT}/{created.json()['id']}")
+        
+        assert response.headers["etag"] == created.headers["etag"]
+        assert response.headers["etag"].startswith(f'"{created.json()["id"]}-')
+        assert "last-modified" in response.headers
+    
+    def test_if_none_match_returns_304(self):
+        """Test that a matching If-None-Match yields an empty 304."""
+        created = self._create()
+        url = f"{ORGANISATION_ENDPOINT}/{created.json()['id']}"
+        etag = created.headers["etag"]
+        
+        response = client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    
+    def test_if_none_match_misses_after_update(self):
+        """Test that an update changes the ETag so stale validators get a full body."""
+        created = self._create()
+        url = f"{ORGANISATION_ENDPOINT}/{created.json()['id']}"
+        client.put(url, json={"details": "changed"})
+        
+        response = client.get(url, headers={"If-None-Match": created.headers["etag"]})
+        
+        assert response.status_code == 200
+        assert response.json()["details"] == "changed"
+    
+    def test_if_modified_since(self):
+        """Test that If-Modified-Since compares against Last-Modified."""
+        created = self._create()
+        url = f"{ORGANISATION_ENDPOINT}/{created.json()['id']}"
+        
+        fresh = client.get(url, headers={"If-Modified-Since": created.headers["last-modified"]})
+        stale = client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        
+        assert fresh.status_code == 304
+        assert stale.status_code == 200
+    
+    def test_collection_etag_changes_with_writes_and_query(self):
+        """Test that list ETags follow the table version and the query string."""
+        first = client.get(ORGANISATION_ENDPOINT, params={"limit": 5})
+        etag = first.headers["etag"]
+        
+        assert client.get(ORGANISATION_ENDPOINT, params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 304
+        assert client.get(ORGANISATION_ENDPOINT, params={"limit": 6}, headers={"If-None-Match": etag}).status_code == 200
+        self._create()
+        assert client.get(ORGANISATION_ENDPOINT, params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 200
+    
+    def test_if_match_update(self):
+        """Test that If-Match guards updates with 412 on a stale ETag."""
+        created = self._create()
+        url = f"{ORGANISATION_ENDPOINT}/{created.json()['id']}"
+        etag = created.headers["etag"]
+        
+        first = client.put(url, json={"details": "first"}, headers={"If-Match": etag})
+        second = client.put(url, json={"details": "second"}, headers={"If-Match": etag})
+        
+        assert first.status_code == 200
+        assert first.headers["etag"] != etag
+        assert second.status_code == 412
+        assert client.get(url).json()["details"] == "first"
+    
+    def test_if_match_delete(self):
+        """Test that If-Match guards deletes."""
+        created = self._create()
+        url = f"{ORGANISATION_ENDPOINT}/{created.json()['id']}"
+        
+        assert client.delete(url, headers={"If-Match": '"0-0"'}).status_code == 412
+        assert client.delete(url, headers={"If-Match": created.headers["etag"]}).status_code == 200
+    
+    def test_if_match_on_missing_entity_is_404(self):
+        """Test that a conditional update of a missing entity is still a 404."""
+        response = client.put(f"{ORGANISATION_ENDPOINT}/999999999", json={"name": "x"}, headers={"If-Match": '"999999999-1"'})
+        
+        assert response.status_code == 404
+    
+    def test_employee_conditional_get_and_update(self):
+        """Test that employee routes support the same validators."""
+        org = self._create().json()
+        created = client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [{
+            "name": "Jane", "last_name": "Doe", "age": 30, "date_of_birth": "1994-02-01",
+            "location": "London", "organisation_id": org["id"]
+        }]}).json()
+        url = f"{EMPLOYEE_ENDPOINT}/{created['create']['items'][0]['id']}"
+        etag = client.get(url).headers["etag"]
+        
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        assert client.put(url, json={"age": 31}, headers={"If-Match": etag}).json()["age"] == 31
+        assert client.put(url, json={"age": 32}, headers={"If-Match": etag}).status_code == 412
+
+
+class TestSerialisationAPI:
+    def test_list_documents_match_single_entity_responses(self):
+        """Test that SQL-rendered list items equal the single-entity representation."""
+        created = client.put(ORGANISATION_ENDPOINT, json={
+            "name": f"Serialised {uuid.uuid4().hex}", "tags": ["a", "b"], "details": None
+        }).json()
+        
+        page = client.get(ORGANISATION_ENDPOINT, params={"after_id": created["id"] - 1, "limit": 1})
+        
+        assert page.headers["content-type"] == "application/json"
+        assert page.json() == [client.get(f"{ORGANISATION_ENDPOINT}/{created['id']}").json()]
+        assert page.json()[0] == created
+        assert created["created_at"].endswith("Z")
+    
+    def test_create_keeps_201_status(self):
+        """Test that returning a pre-rendered response keeps the declared status code."""
+        response = client.put(ORGANISATION_ENDPOINT, json={"name": f"Status {uuid.uuid4().hex}"})
+        
+        assert response.status_code == 201
+    
+    def test_openapi_still_documents_response_models(self):
+        """Test that response_model is still used for the OpenAPI schema."""
+        schema = client.get("/openapi.json").json()
+        list_schema = schema["paths"][ORGANISATION_ENDPOINT]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        
+        assert list_schema["items"]["$ref"].endswith("/OrganisationListResponse")
+
+
+class TestOrganisationEmployeesAPI:
+    def _organisation_with_employees(self, count):
+        org_id = client.put(ORGANISATION_ENDPOINT, json={"name": f"Staffed {uuid.uuid4().hex}"}).json()["id"]
+        employee = {
+            "name": "Jane", "last_name": "Doe", "age": 30,
+            "date_of_birth": "1994-01-01", "location": "London", "organisation_id": org_id
+        }
+        created = client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [employee] * count}).json()
+        return org_id, [item["id"] for item in created["create"]["items"]]
+    
+    def test_nested_employees_are_paginated(self):
+        """Test that /organisation/{id}/employees pages through that organisation only."""
+        org_id, ids = self._organisation_with_employees(3)
+        self._organisation_with_employees(1)
+        
+        first = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}/employees", params={"limit": 2})
+        second = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}/employees", params={
+            "limit": 2, "after_id": first.headers["X-Next-After-Id"]
+        })
+        
+        assert [employee["id"] for employee in first.json() + second.json()] == ids
+        assert "ETag" in first.headers
+    
+    def test_nested_employees_for_missing_organisation(self):
+        """Test that nested employee routes 404 for an unknown organisation."""
+        assert client.get(f"{ORGANISATION_ENDPOINT}/999999/employees").status_code == 404
+        assert client.get(f"{ORGANISATION_ENDPOINT}/999999/employee-count").status_code == 404
+    
+    def test_employee_count(self):
+        """Test the single organisation employee count endpoint."""
+        org_id, _ = self._organisation_with_employees(2)
+        
+        response = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}/employee-count")
+        
+        assert response.json() == {"organisation_id": org_id, "employee_count": 2}
+    
+    def test_list_with_ids_and_employee_count(self):
+        """Test batch lookup by ids with employee counts included."""
+        staffed, _ = self._organisation_with_employees(2)
+        empty = client.put(ORGANISATION_ENDPOINT, json={"name": "Empty"}).json()["id"]
+        
+        response = client.get(ORGANISATION_ENDPOINT, params={
+            "ids": f"{empty},{staffed}", "include": "employee_count", "fields": "id,name"
+        })
+        
+        assert response.status_code == 200
+        assert {org["id"]: org["employee_count"] for org in response.json()} == {staffed: 2, empty: 0}
+    
+    def test_employee_count_changes_list_etag(self):
+        """Test that the included counts invalidate the list ETag when employees change."""
+        org_id, _ = self._organisation_with_employees(1)
+        params = {"ids": str(org_id), "include": "employee_count"}
+        etag = client.get(ORGANISATION_ENDPOINT, params=params).headers["ETag"]
+        
+        self._organisation_with_employees(1)
+        
+        assert client.get(ORGANISATION_ENDPOINT, params=params, headers={"If-None-Match": etag}).status_code == 200
+    
+    def test_summary_include(self):
+        """Test the summary expansion on the list and single organisation routes."""
+        org_id, ids = self._organisation_with_employees(2)
+        client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"update": [{"id": ids[0], "age": 40}]})
+        
+        listed = client.get(ORGANISATION_ENDPOINT, params={"ids": str(org_id), "include": "summary,employee_count"}).json()[0]
+        single = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}", params={"include": "summary"})
+        
+        assert listed["employee_count"] == 2
+        assert listed["summary"]["employee_count"] == 2
+        assert listed["summary"]["average_age"] == 35
+        assert listed["summary"]["last_updated_at"].endswith("Z")
+        assert single.json()["summary"] == listed["summary"]
+        assert single.json()["name"].startswith("Staffed")
+        assert "summary" not in client.get(f"{ORGANISATION_ENDPOINT}/{org_id}").json()
+    
+    def test_summary_changes_entity_etag(self):
+        """Test that an included summary revalidates when the organisation's employees change."""
+        org_id, _ = self._organisation_with_employees(1)
+        url = f"{ORGANISATION_ENDPOINT}/{org_id}"
+        etag = client.get(url, params={"include": "summary"}).headers["ETag"]
+        
+        assert client.get(url, params={"include": "summary"}, headers={"If-None-Match": etag}).status_code == 304
+        client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [{
+            "name": "Jo", "last_name": "Roe", "age": 50,
+            "date_of_birth": "1974-01-01", "location": "Leeds", "organisation_id": org_id
+        }]})
+        response = client.get(url, params={"include": "summary"}, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["summary"]["employee_count"] == 2
+    
+    def test_invalid_ids_and_include(self):
+        """Test that malformed ids and unknown includes are rejected with 400."""
+        assert client.get(ORGANISATION_ENDPOINT, params={"ids": "1,x"}).status_code == 400
+        assert client.get(ORGANISATION_ENDPOINT, params={"include": "payroll"}).status_code == 400
+
+
+class TestMetricsAPI:
+    def test_metrics_in_prometheus_format(self):
+        """Test that /metrics exposes request, SQL and pool metrics as Prometheus text."""
+        client.get(f"{ORGANISATION_ENDPOINT}/1")
+        
+        response = client.get(f"{API_PREFIX}/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert f'route="{ORGANISATION_ENDPOINT}/{{id}}"' in response.text
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "sqlite_statement_duration_seconds_count" in response.text
+        assert "# TYPE sqlite_pool_checkouts_total counter" in response.text
+    
+    def test_cache_stats_are_exported(self, test_db_path):
+        """Test that entity cache stats appear per table when the cache is enabled."""
+        container = ServiceContainer(test_db_path, cache_enabled=True)
+        app.dependency_overrides[get_container] = lambda: container
+        try:
+            container.organisation_repository.get_by_id(1)
+            
+            text = client.get(f"{API_PREFIX}/metrics").text
+        finally:
+            app.dependency_overrides.clear()
+            container.close()
+        
+        assert 'entity_cache_misses_total{table="organisations"} 1' in text
+        assert 'entity_cache_entries{table="employees"} 0' in text
+    
+    def test_server_timing_on_request(self):
+        """Test that X-Debug: timing returns a per-phase Server-Timing header."""
+        org_id = client.put(ORGANISATION_ENDPOINT, json={"name": "Timed"}).json()["id"]
+        
+        plain = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}")
+        timed = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}", headers={"X-Debug": "timing"})
+        
+        assert "server-timing" not in plain.headers
+        phases = [entry.split(";")[0] for entry in timed.headers["server-timing"].split(", ")]
+        assert phases == ["queue", "db", "decode", "serialise", "total"]
+
+
+class TestSearchAPI:
+    def _word(self):
+        return f"w{uuid.uuid4().hex[:12]}"
+    
+    def test_search_ranks_and_mixes_types(self):
+        """Test that one query finds organisations and employees, best match first."""
+        word = self._word()
+        named = client.put(ORGANISATION_ENDPOINT, json={"name": f"{word} Labs"}).json()["id"]
+        described = client.put(ORGANISATION_ENDPOINT, json={"name": "Other", "details": f"partners of {word}"}).json()["id"]
+        client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [{
+            "name": "Jane", "last_name": word, "age": 30,
+            "date_of_birth": "1994-01-01", "location": "London", "organisation_id": named
+        }]})
+        
+        response = client.get(SEARCH_ENDPOINT, params={"q": word[:8]})
+        
+        assert response.status_code == 200
+        hits = response.json()
+        assert {(hit["type"], hit["title"]) for hit in hits} == {
+            ("organisation", f"{word} Labs"), ("organisation", "Other"), ("employee", f"Jane {word}")
+        }
+        assert [hit["id"] for hit in hits if hit["type"] == "organisation"] == [named, described]
+        assert hits[0]["score"] >= hits[-1]["score"]
+        assert "<mark>" in hits[0]["snippet"]
+    
+    def test_search_pages_with_offset(self):
+        """Test that X-Next-Offset pages through all hits without repeats."""
+        word = self._word()
+        client.put(f"{ORGANISATION_ENDPOINT}/bulk", json={"create": [{"name": f"{word} {i}"} for i in range(5)]})
+        
+        first = client.get(SEARCH_ENDPOINT, params={"q": word, "limit": 3})
+        second = client.get(SEARCH_ENDPOINT, params={"q": word, "limit": 3, "offset": first.headers["X-Next-Offset"]})
+        
+        ids = [hit["id"] for hit in first.json() + second.json()]
+        assert len(ids) == len(set(ids)) == 5
+        assert "X-Next-Offset" not in second.headers
+    
+    def test_search_by_type_and_after_update(self):
+        """Test type filtering and that updates and deletes reach the index."""
+        word, renamed = self._word(), self._word()
+        org_id = client.put(ORGANISATION_ENDPOINT, json={"name": word}).json()["id"]
+        
+        assert client.get(SEARCH_ENDPOINT, params={"q": word, "type": "employee"}).json() == []
+        client.put(f"{ORGANISATION_ENDPOINT}/{org_id}", json={"name": renamed})
+        assert client.get(SEARCH_ENDPOINT, params={"q": word}).json() == []
+        assert [hit["id"] for hit in client.get(SEARCH_ENDPOINT, params={"q": renamed}).json()] == [org_id]
+        client.delete(f"{ORGANISATION_ENDPOINT}/{org_id}")
+        assert client.get(SEARCH_ENDPOINT, params={"q": renamed}).json() == []
+    
+    def test_search_rejects_queries_without_words(self):
+        """Test that punctuation-only queries and unknown types are rejected."""
+        assert client.get(SEARCH_ENDPOINT, params={"q": '"*"'}).status_code == 400
+        assert client.get(SEARCH_ENDPOINT, params={"q": "x", "type": "invoice"}).status_code == 400
+        assert client.get(SEARCH_ENDPOINT, params={"q": ""}).status_code == 422
+    
+    def test_search_is_conditional(self):
+        """Test that search results carry an ETag that changes with the data."""
+        word = self._word()
+        first = client.get(SEARCH_ENDPOINT, params={"q": word})
+        
+        assert client.get(SEARCH_ENDPOINT, params={"q": word}, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+        client.put(ORGANISATION_ENDPOINT, json={"name": word})
+        assert client.get(SEARCH_ENDPOINT, params={"q": word}, headers={"If-None-Match": first.headers["ETag"]}).status_code == 200
+
+
+class TestCompressionAPI:
+    def _organisations(self, count):
+        client.put(f"{ORGANISATION_ENDPOINT}/bulk", json={"create": [
+            {"name": f"Compressed {i}", "details": "A long and repetitive description " * 4} for i in range(count)
+        ]})
+    
+    def test_event_stream_is_not_compressed(self):
+        """Test that server-sent events go out unencoded even when gzip is accepted."""
+        class ClosingBus(EventBus):
+            def subscribe(self, *args, **kwargs):
+                subscription = super().subscribe(*args, **kwargs)
+                subscription.close()
+                return subscription
+        
+        app.dependency_overrides[get_event_bus] = lambda: ClosingBus(registry=MetricsRegistry())
+        try:
+            with client.stream("GET", EVENTS_ENDPOINT, headers={"Accept-Encoding": "gzip"}) as response:
+                raw = b"".join(response.iter_raw())
+        finally:
+            app.dependency_overrides.pop(get_event_bus)
+        
+        assert "content-encoding" not in response.headers
+        assert raw.startswith(b"retry:")
+    
+    def test_large_list_is_gzipped(self):
+        """Test that a list over the size threshold is gzip-encoded and decodes to the same JSON."""
+        self._organisations(20)
+        
+        plain = client.get(ORGANISATION_ENDPOINT, params={"limit": 20}, headers={"Accept-Encoding": "identity"})
+        with client.stream("GET", ORGANISATION_ENDPOINT, params={"limit": 20}, headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+        
+        assert "content-encoding" not in plain.headers
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) == len(raw) < len(plain.content) / 3
+        assert json.loads(gzip.decompress(raw)) == plain.json()
+        assert response.headers["etag"] == plain.headers["etag"]
+    
+    def test_small_responses_are_not_compressed(self):
+        """Test that bodies under the threshold are sent as they are."""
+        org_id = client.put(ORGANISATION_ENDPOINT, json={"name": "Tiny"}).json()["id"]
+        
+        response = client.get(f"{ORGANISATION_ENDPOINT}/{org_id}", headers={"Accept-Encoding": "gzip"})
+        
+        assert "content-encoding" not in response.headers
+    
+    def test_streamed_export_is_compressed_chunk_by_chunk(self):
+        """Test that the streaming export stays streamed and decodes to every row."""
+        self._organisations(5)
+        
+        with client.stream("GET", f"{ORGANISATION_ENDPOINT}/export", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+        
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = gzip.decompress(raw).decode().splitlines()
+        assert len(lines) == len(client.get(f"{ORGANISATION_ENDPOINT}/export").text.splitlines())
+    
+    def test_negotiation_honours_quality_values(self):
+        """Test Accept-Encoding parsing, q-values and server preference on ties."""
+        codecs = ["zstd", "br", "gzip"]
+        
+        assert negotiate("gzip, br", codecs) == "br"
+        assert negotiate("gzip;q=1, br;q=0.5", codecs) == "gzip"
+        assert negotiate("*", codecs) == "zstd"
+        assert negotiate("*, zstd;q=0", codecs) == "br"
+        assert negotiate("identity", codecs) is None
+        assert negotiate("gzip;q=0", codecs) is None
+        assert negotiate("", codecs) is None
+
+
+class TestEmployeeStatsAPI:
+    def test_stats_for_an_organisation(self):
+        """Test the aggregates for one organisation's employees."""
+        org_id = client.put(ORGANISATION_ENDPOINT, json={"name": "Stats Org"}).json()["id"]
+        client.put(f"{EMPLOYEE_ENDPOINT}/bulk", json={"create": [
+            {"name": "A", "last_name": "B", "age": age, "date_of_birth": f"{2024 - age}-01-01",
+             "location": location, "organisation_id": org_id}
+            for age, location in ((22, "Leeds"), (27, "Leeds"), (41, "York"))
+        ]})
+        
+        response = client.get(f"{EMPLOYEE_ENDPOINT}/stats", params={"organisation_id": org_id, "age_bucket": 20})
+        
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["count"] == 3
+        assert stats["age"]["median"] == 27
+        assert stats["age"]["histogram"] == [{"start": 20, "end": 40, "count": 2}, {"start": 40, "end": 60, "count": 1}]
+        assert stats["by_location"] == [{"location": "Leeds", "count": 2}, {"location": "York", "count": 1}]
+        assert stats["by_organisation"] == [{"organisation_id": org_id, "count": 3}]
+    
+    def test_stats_are_conditional_and_validated(self):
+        """Test the ETag round trip and parameter bounds."""
+        first = client.get(f"{EMPLOYEE_ENDPOINT}/stats")
+        
+        assert client.get(f"{EMPLOYEE_ENDPOINT}/stats", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+        assert client.get(f"{EMPLOYEE_ENDPOINT}/stats", params={"age_bucket": 0}).status_code == 422
+
+
+class TestChangesAPI:
+    def _latest(self):
+        return int(client.get(CHANGES_ENDPOINT, params={"since": 2**62}).headers["X-Next-Since"])
+    
+    def test_mirror_stays_in_sync(self):
+        """Test that replaying the feed from a cursor reproduces creates, updates and deletes."""
+        since = self._latest()
+        kept = client.put(ORGANISATION_ENDPOINT, json={"name": "Mirrored"}).json()["id"]
+        gone = client.put(ORGANISATION_ENDPOINT, json={"name": "Short-lived"}).json()["id"]
+        client.put(f"{ORGANISATION_ENDPOINT}/{kept}", json={"name": "Mirrored v2"})
+        client.delete(f"{ORGANISATION_ENDPOINT}/{gone}")
+        
+        mirror = {}
+        while True:
+            response = client.get(CHANGES_ENDPOINT, params={"since": since, "limit": 1, "type": "organisation"})
+            for change in response.json():
+                if change["op"] == "delete":
+                    mirror.pop(change["id"], None)
+                else:
+                    mirror[change["id"]] = change["data"]
+            if since == int(response.headers["X-Next-Since"]):
+                break
+            since = int(response.headers["X-Next-Since"])
+        
+        assert {id: data["name"] for id, data in mirror.items()} == {kept: "Mirrored v2"}
+        assert mirror[kept] == client.get(f"{ORGANISATION_ENDPOINT}/{kept}").json()
+    
+    def test_feed_is_conditional(self):
+        """Test that polling without new changes is answered with 304."""
+        since = self._latest()
+        first = client.get(CHANGES_ENDPOINT, params={"since": since})
+        
+        assert first.json() == []
+        assert client.get(CHANGES_ENDPOINT, params={"since": since}, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+        client.put(ORGANISATION_ENDPOINT, json={"name": "Poll"})
+        assert len(client.get(CHANGES_ENDPOINT, params={"since": since}, headers={"If-None-Match": first.headers["ETag"]}).json()) == 1
+        assert client.get(CHANGES_ENDPOINT, params={"type": "invoice"}).status_code == 400
+
+
+class TestEventsAPI:
+    def test_writes_stream_as_server_sent_events(self):
+        """Test that API writes reach a subscribed stream as SSE frames, filtered by type."""
+        bus = get_container().event_bus
+        async def scenario():
+            subscription = bus.subscribe(["organisation"])
+            stream = event_stream(subscription, heartbeat=5)
+            try:
+                preamble = await stream.__anext__()
+                created = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: client.put(ORGANISATION_ENDPOINT, json={"name": "Streamed"}).json()
+                )
+                return preamble, created, await stream.__anext__()
+            finally:
+                bus.unsubscribe(subscription)
+        
+        preamble, created, frame = asyncio.run(scenario())
+        
+        assert preamble.startswith("retry:")
+        assert frame == sse_frame(EntityEvent("organisation", "created", created["id"], created["id"]))
+        assert json.loads(frame[len("data: "):]) == {
+            "type": "organisation", "op": "created", "id": created["id"],
+            "organisation_id": created["id"], "previous_organisation_id": None
+        }
+    
+    def test_stream_keeps_alive_and_ends_on_overflow(self):
+        """Test the keep-alive comment while idle and the overflow event once the client falls behind."""
+        bus = EventBus(max_queued=1, registry=MetricsRegistry())
+        async def scenario():
+            subscription = bus.subscribe()
+            stream = event_stream(subscription, heartbeat=0)
+            frames = [await stream.__anext__(), await stream.__anext__()]
+            bus.publish([EntityEvent("organisation", "created", id, id) for id in (1, 2)])
+            frames.extend([frame async for frame in stream])
+            return frames
+        
+        assert asyncio.run(scenario())[1:] == [KEEP_ALIVE, OVERFLOW]
+    
+    def test_invalid_type(self):
+        """Test that an unknown event type is rejected."""
+        response = client.get(EVENTS_ENDPOINT, params={"type": "invoice"})
+        
+        assert response.status_code == 400
+    
+    def test_subscriber_limit(self):
+        """Test that streams beyond the subscriber limit are refused with 503."""
+        app.dependency_overrides[get_event_bus] = lambda: EventBus(max_subscribers=0, registry=MetricsRegistry())
+        try:
+            response = client.get(EVENTS_ENDPOINT)
+        finally:
+            app.dependency_overrides.pop(get_event_bus)
+        
+        assert response.status_code == 503
@@ -1,5 +1,6 @@
 import pytest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from models.employee import Employee
 from models.entity import Organisation
 
 class TestOrganisation:
@@ -82,3 +83,86 @@ class TestOrganisation:
         assert org_dict["url"] is None
         assert org_dict["created_at"] is None
         assert org_dict["updated_at"] is None
+    
+    def test_organisation_is_slotted(self):
+        """Test that organisations carry no per-instance __dict__."""
+        org = Organisation(name="Slotted")
+        
+        assert not hasattr(org, "__dict__")
+        with pytest.raises(AttributeError):
+            org.unknown = 1
+    
+    def test_encoded_fields_are_decoded_lazily(self):
+        """Test that timestamps and tags stay encoded until first read."""
+        org = Organisation.from_encoded(
+            id=1,
+            name="Lazy",
+            created_at="2025-10-13T10:30:00.123456+00:00",
+            updated_at="2025-10-13T10:30:00.123456+00:00",
+            tags='["a", "b"]'
+        )
+        
+        assert org._created_at == "2025-10-13T10:30:00.123456+00:00"
+        assert org._tags == '["a", "b"]'
+        assert org.created_at == datetime(2025, 10, 13, 10, 30, 0, 123456, tzinfo=timezone.utc)
+        assert org.tags == ["a", "b"]
+        assert org.tags is org.tags
+    
+    def test_to_dict_does_not_decode_timestamps(self):
+        """Test that to_dict passes undecoded timestamps through unchanged."""
+        org = Organisation.from_encoded(
+            id=1,
+            name="Lazy",
+            created_at="2025-10-13T10:30:00+00:00",
+            updated_at="2025-10-13T10:30:00.5+00:00",
+            tags=None
+        )
+        
+        org_dict = org.to_dict()
+        
+        assert org_dict["created_at"] == "2025-10-13T10:30:00+00:00"
+        assert org_dict["tags"] == []
+        assert org._updated_at.__class__ is str
+    
+    def test_encoded_and_decoded_organisations_are_equal(self):
+        """Test that equality compares decoded values."""
+        now = datetime(2025, 10, 13, tzinfo=timezone.utc)
+        decoded = Organisation(id=1, name="Same", created_at=now, updated_at=now, tags=["x"])
+        encoded = Organisation.from_encoded(
+            id=1, name="Same", created_at=now.isoformat(), updated_at=now.isoformat(), tags='["x"]'
+        )
+        
+        assert decoded == encoded
+        assert decoded.to_dict() == encoded.to_dict()
+
+
+class TestEmployee:
+    def test_date_of_birth_is_decoded_lazily(self):
+        """Test that employee dates decode on first access and to_dict matches."""
+        employee = Employee.from_encoded(
+            id=1,
+            name="Jane",
+            last_name="Doe",
+            age=30,
+            date_of_birth="1994-02-01",
+            location="London",
+            organisation_id=1,
+            created_at="2025-10-13T10:30:00+00:00",
+            updated_at="2025-10-13T10:30:00+00:00"
+        )
+        
+        assert employee.to_dict()["date_of_birth"] == "1994-02-01"
+        assert employee._date_of_birth == "1994-02-01"
+        assert employee.date_of_birth == date(1994, 2, 1)
+        assert employee.to_dict()["date_of_birth"] == "1994-02-01"
+    
+    def test_setters_replace_encoded_values(self):
+        """Test that assigning a decoded value overrides the stored encoding."""
+        employee = Employee("Jane", "Doe", 30, date(1994, 2, 1), "London", 1)
+        now = datetime.now(timezone.utc)
+        
+        employee.created_at = now
+        
+        assert employee.created_at is now
+        assert employee.to_dict()["created_at"] == now.isoformat()
+        assert not hasattr(employee, "__dict__")
@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from observability.diagnostics import RequestTimings, record_phase, request_diagnostics, timed_phase
+from observability.metrics import MetricsRegistry
+from observability.middleware import DiagnosticsMiddleware, MetricsMiddleware, UNMATCHED_ROUTE
+from repositories.async_repository import ExecutorRepository
+
+class TestMetricsRegistry:
+    def test_counter_and_gauge_render(self):
+        """Test the text exposition of labelled counters and gauges."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("status",))
+        in_flight = registry.gauge("in_flight", "In flight.")
+        
+        requests.labels("200").inc()
+        requests.labels("200").inc(2)
+        in_flight.set(3)
+        in_flight.dec()
+        
+        rendered = registry.render()
+        assert "# TYPE requests_total counter" in rendered
+        assert 'requests_total{status="200"} 3' in rendered
+        assert "in_flight 2" in rendered
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets, count and sum follow the Prometheus format."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+        
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{le="1"} 2' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+        assert "latency_seconds_count 3" in lines
+        assert "latency_seconds_sum 5.55" in lines
+    
+    def test_label_values_are_escaped(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        registry = MetricsRegistry()
+        registry.counter("odd_total", "Odd.", ("value",)).labels('a"b\\c\nd').inc()
+        
+        assert 'odd_total{value="a\\"b\\\\c\\nd"} 1' in registry.render()
+    
+    def test_register_returns_existing_metric(self):
+        """Test that registering the same metric twice shares it and shape mismatches fail."""
+        registry = MetricsRegistry()
+        first = registry.counter("shared_total", "Shared.")
+        
+        assert registry.counter("shared_total", "Shared.") is first
+        with pytest.raises(ValueError):
+            registry.gauge("shared_total", "Shared.")
+    
+    def test_wrong_label_count(self):
+        """Test that labels() rejects the wrong number of label values."""
+        counter = MetricsRegistry().counter("labelled_total", "Labelled.", ("a", "b"))
+        
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+
+class TestMetricsMiddleware:
+    def _call(self, middleware, scope):
+        sent = []
+        
+        async def receive():
+            return {"type": "http.request", "body": b""}
+        
+        async def send(message):
+            sent.append(message)
+        
+        asyncio.run(middleware(scope, receive, send))
+        return sent
+    
+    def test_records_status_size_and_latency(self):
+        """Test that a request is recorded under its status, size and route."""
+        registry = MetricsRegistry()
+        
+        async def app(scope, receive, send):
+            scope["route"] = type("Route", (), {"path": "/items/{id}"})()
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b"12345"})
+        
+        middleware = MetricsMiddleware(app, registry)
+        self._call(middleware, {"type": "http", "method": "POST", "path": "/items/7"})
+        
+        rendered = registry.render()
+        assert 'http_requests_total{method="POST",route="/items/{id}",status="201"} 1' in rendered
+        assert 'http_response_size_bytes_sum{method="POST",route="/items/{id}"} 5' in rendered
+        assert 'http_request_duration_seconds_count{method="POST",route="/items/{id}"} 1' in rendered
+        assert "http_requests_in_flight 0" in rendered
+    
+    def test_unmatched_and_failing_requests(self):
+        """Test that unrouted paths share one label and exceptions count as 500."""
+        registry = MetricsRegistry()
+        
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+        
+        middleware = MetricsMiddleware(app, registry)
+        with pytest.raises(RuntimeError):
+            self._call(middleware, {"type": "http", "method": "GET", "path": "/random/123"})
+        
+        assert f'route="{UNMATCHED_ROUTE}",status="500"}} 1' in registry.render()
+        assert "http_requests_in_flight 0" in registry.render()
+
+
+class TestRequestDiagnostics:
+    def test_phases_outside_a_request_are_ignored(self):
+        """Test that recording without an active request is a no-op."""
+        record_phase("db", 1.0)
+        with timed_phase("serialise"):
+            pass
+    
+    def test_server_timing_derives_decode_from_repository_time(self):
+        """Test that decode time is the repository call minus its SQL time."""
+        timings = RequestTimings()
+        timings.add("db", 0.002)
+        timings.add("db", 0.001)
+        timings.add("repository", 0.005)
+        timings.add("serialise", 0.0005)
+        
+        assert timings.server_timing(0.01) == (
+            "db;dur=3.00, decode;dur=2.00, serialise;dur=0.50, total;dur=10.00"
+        )
+    
+    def test_executor_calls_report_to_the_submitting_request(self, repository):
+        """Test that contextvars reach executor threads so their time is attributed."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        async_repository = ExecutorRepository(repository, executor)
+        
+        async def run():
+            with request_diagnostics() as timings:
+                await async_repository.get_all()
+            return timings
+        
+        try:
+            timings = asyncio.run(run())
+        finally:
+            executor.shutdown()
+        
+        assert {"queue", "repository"} <= set(timings.durations)
+    
+    def _call(self, middleware, headers=(), query_string=b""):
+        sent = []
+        
+        async def receive():
+            return {"type": "http.request", "body": b""}
+        
+        async def send(message):
+            sent.append(message)
+        
+        scope = {"type": "http", "method": "GET", "path": "/items", "headers": list(headers), "query_string": query_string}
+        asyncio.run(middleware(scope, receive, send))
+        return dict(sent[0]["headers"])
+    
+    async def _app(self, scope, receive, send):
+        record_phase("db", 0.001)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    
+    def test_server_timing_is_opt_in(self):
+        """Test that Server-Timing is only added when the request asks for it."""
+        middleware = DiagnosticsMiddleware(self._app)
+        
+        assert b"server-timing" not in self._call(middleware)
+        assert self._call(middleware, [(b"x-debug", b"timing")])[b"server-timing"].startswith(b"db;dur=1.00")
+        assert b"server-timing" in self._call(middleware, query_string=b"_debug=timing")
+    
+    def test_profile_requires_profiling_enabled(self, tmp_path):
+        """Test that profile requests are ignored unless profiling is configured."""
+        middleware = DiagnosticsMiddleware(self._app, profile_dir=str(tmp_path))
+        
+        headers = self._call(middleware, [(b"x-debug", b"profile")])
+        
+        assert b"x-profile-file" not in headers
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_profile_is_written(self, tmp_path):
+        """Test that a profiled request writes a loadable pstats file."""
+        import pstats
+        middleware = DiagnosticsMiddleware(self._app, profiling=True, profile_dir=str(tmp_path))
+        
+        headers = self._call(middleware, [(b"x-debug", b"profile")])
+        
+        path = tmp_path / headers[b"x-profile-file"].decode()
+        assert b"server-timing" in headers
+        assert pstats.Stats(str(path)).total_calls > 0
+
@@ -1,6 +1,27 @@
+import gzip
+import json
 import pytest
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from models.employee import Employee
 from models.entity import Organisation
+from repositories.bulk_import import TARGETS, BulkImporter, BulkImportError
+from repositories.cached_repository import CachedRepository
+from repositories.change_repository import ChangeRepository
+from repositories.connection_pool import ConnectionPool, PoolTimeoutError, WriteQueue
+from repositories.instrumentation import CONNECTION_OPEN_SECONDS, ROWS_READ, STATEMENT_SECONDS, InstrumentedCursor
+from repositories.demographics import DemographicsQuery
+from repositories.employee_repository import EmployeeRepository
 from repositories.organisation_repository import OrganisationRepository
+from repositories.migrations import MIGRATIONS, current_version, migrate
+from repositories.query import PageQuery, build_page_select
+from repositories.search_repository import SearchRepository, match_expression
+from repositories.sqlite_settings import StorageSettings
+from api.employee_schemas import EmployeeResponse
+from api.schemas import OrganisationResponse
 
 class TestOrganisationRepository:
     def test_create_organisation(self, repository, sample_org_data):
@@ -131,3 +152,1203 @@ class TestOrganisationRepository:
         retrieved_org = repository.get_by_id(created_org.id)
         
         assert retrieved_org.tags == []
+
+
+class TestConnectionPool:
+    def test_connections_are_reused(self, test_db_path):
+        """Test that sequential checkouts reuse the same connection."""
+        pool = ConnectionPool(test_db_path, size=2)
+        
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        
+        assert first is second
+        stats = pool.stats()
+        assert stats.open_connections == 1
+        assert stats.checkouts == 2
+        pool.close()
+    
+    def test_repositories_share_pool(self, test_db_path):
+        """Test that both repositories draw from the same pool."""
+        pool = ConnectionPool(test_db_path, size=1)
+        org_repository = OrganisationRepository(test_db_path, pool=pool)
+        employee_repository = EmployeeRepository(test_db_path, pool=pool)
+        
+        org_repository.create(Organisation(name="Pooled"))
+        employee_repository.get_all()
+        
+        assert pool.stats().open_connections == 1
+        pool.close()
+    
+    def test_snapshot_is_consistent_and_always_ended(self, test_db_path, repository):
+        """Test that a snapshot ignores concurrent writes and ends its transaction on error."""
+        pool = ConnectionPool(test_db_path, size=2)
+        
+        with pytest.raises(RuntimeError):
+            with pool.snapshot() as conn:
+                before = conn.execute("SELECT COUNT(*) FROM organisations").fetchone()[0]
+                repository.create(Organisation(name="Concurrent"))
+                during = conn.execute("SELECT COUNT(*) FROM organisations").fetchone()[0]
+                raise RuntimeError("failed while reading")
+        
+        assert before == during
+        with pool.connection() as reused:
+            assert reused is conn and not reused.in_transaction
+            assert reused.execute("SELECT COUNT(*) FROM organisations").fetchone()[0] == before + 1
+        pool.close()
+    
+    def test_exhausted_pool_times_out(self, test_db_path):
+        """Test that checkout fails once the pool is exhausted past the timeout."""
+        pool = ConnectionPool(test_db_path, size=1, timeout=0.05)
+        conn = pool.acquire()
+        
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        
+        pool.release(conn)
+        stats = pool.stats()
+        assert stats.exhausted == 1
+        assert stats.timeouts == 1
+        pool.close()
+    
+    def test_wait_time_is_recorded(self, test_db_path):
+        """Test that waiting for a connection is measured."""
+        pool = ConnectionPool(test_db_path, size=1, timeout=5)
+        conn = pool.acquire()
+        releaser = threading.Timer(0.05, pool.release, args=(conn,))
+        releaser.start()
+        
+        with pool.connection():
+            pass
+        
+        releaser.join()
+        stats = pool.stats()
+        assert stats.exhausted == 1
+        assert stats.timeouts == 0
+        assert stats.max_wait_seconds > 0
+        assert stats.total_wait_seconds >= stats.max_wait_seconds
+        pool.close()
+    
+    def test_rollback_on_error(self, test_db_path, repository):
+        """Test that a failed unit of work is rolled back before checkin."""
+        pool = ConnectionPool(test_db_path)
+        
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                conn.execute(
+                    "INSERT INTO organisations (created_at, name, updated_at) VALUES ('', 'Ghost', '')"
+                )
+                raise RuntimeError("boom")
+        
+        assert repository.get_all() == []
+        pool.close()
+    
+    def test_unhealthy_connection_is_replaced(self, test_db_path):
+        """Test that a broken idle connection is discarded on checkout."""
+        pool = ConnectionPool(test_db_path, health_check_interval=0)
+        with pool.connection() as conn:
+            pass
+        conn.close()
+        
+        with pool.connection() as replacement:
+            assert replacement.execute("SELECT 1").fetchone()[0] == 1
+        
+        assert replacement is not conn
+        assert pool.stats().discarded == 1
+        pool.close()
+
+
+class TestRepositoryQuery:
+    def test_keyset_pagination(self, repository):
+        """Test paging through organisations with after_id and limit."""
+        created = [repository.create(Organisation(name=f"Company {i}")) for i in range(5)]
+        
+        first_page = repository.query(PageQuery(limit=2))
+        second_page = repository.query(PageQuery(after_id=first_page[-1].id, limit=2))
+        last_page = repository.query(PageQuery(after_id=second_page[-1].id, limit=2))
+        
+        assert [org.id for org in first_page] == [created[0].id, created[1].id]
+        assert [org.id for org in second_page] == [created[2].id, created[3].id]
+        assert [org.id for org in last_page] == [created[4].id]
+    
+    def test_name_prefix_filter(self, repository):
+        """Test filtering organisations by name prefix."""
+        repository.create(Organisation(name="Acme Labs"))
+        repository.create(Organisation(name="Acme Foods"))
+        repository.create(Organisation(name="Globex"))
+        
+        orgs = repository.query(PageQuery(filters={"name_prefix": "Acme"}))
+        
+        assert sorted(org.name for org in orgs) == ["Acme Foods", "Acme Labs"]
+    
+    def test_tag_filter(self, repository):
+        """Test filtering organisations by tag."""
+        repository.create(Organisation(name="A", tags=["ai", "startup"]))
+        repository.create(Organisation(name="B", tags=["startup"]))
+        repository.create(Organisation(name="C", tags=[]))
+        
+        orgs = repository.query(PageQuery(filters={"tag": "ai"}))
+        
+        assert [org.name for org in orgs] == ["A"]
+    
+    def test_created_at_range_filter(self, repository):
+        """Test filtering organisations by creation time."""
+        first = repository.create(Organisation(name="First"))
+        second = repository.create(Organisation(name="Second"))
+        
+        orgs = repository.query(PageQuery(filters={
+            "created_after": second.created_at,
+            "created_before": second.created_at + timedelta(seconds=1),
+        }))
+        
+        assert [org.id for org in orgs] == [second.id]
+        assert first.id not in [org.id for org in orgs]
+    
+    def test_field_projection(self, repository, sample_org_data):
+        """Test that projection only reads the requested columns."""
+        created = repository.create(Organisation(**sample_org_data))
+        
+        orgs = repository.query(PageQuery(fields=["name", "tags"]))
+        
+        assert orgs[0].id == created.id
+        assert orgs[0].name == sample_org_data["name"]
+        assert orgs[0].tags == sample_org_data["tags"]
+        assert orgs[0].details is None
+        assert orgs[0].created_at is None
+    
+    def test_unknown_filter_and_field_rejected(self, repository):
+        """Test that unsupported filters and fields raise ValueError."""
+        with pytest.raises(ValueError):
+            repository.query(PageQuery(filters={"colour": "red"}))
+        with pytest.raises(ValueError):
+            repository.query(PageQuery(fields=["colour"]))
+    
+    def test_employee_filters(self, employee_repository, sample_employee_data):
+        """Test filtering employees by organisation and location."""
+        employee_repository.create(Employee(**sample_employee_data))
+        employee_repository.create(Employee(**{**sample_employee_data, "organisation_id": 2}))
+        employee_repository.create(Employee(**{**sample_employee_data, "location": "Paris"}))
+        
+        employees = employee_repository.query(PageQuery(filters={
+            "organisation_id": 1,
+            "location": "London",
+        }))
+        
+        assert len(employees) == 1
+        assert employees[0].organisation_id == 1
+        assert employees[0].location == "London"
+    
+    def test_employee_projection(self, employee_repository, sample_employee_data):
+        """Test employee projection decodes only the selected columns."""
+        employee_repository.create(Employee(**sample_employee_data))
+        
+        employees = employee_repository.query(PageQuery(fields=["date_of_birth"]))
+        
+        assert employees[0].date_of_birth == sample_employee_data["date_of_birth"]
+        assert employees[0].name is None
+    
+    def test_iter_batches(self, repository):
+        """Test streaming organisations in keyset-paged batches."""
+        for i in range(5):
+            repository.create(Organisation(name=f"Company {i}"))
+        
+        batches = list(repository.iter_batches(batch_size=2))
+        
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [org.name for batch in batches for org in batch] == [f"Company {i}" for i in range(5)]
+    
+    def test_iter_batches_holds_no_connection_between_batches(self, test_db_path):
+        """Test that a paused stream leaves the pool free and still sees later writes."""
+        pool = ConnectionPool(test_db_path, size=1, timeout=0.1)
+        repository = OrganisationRepository(test_db_path, pool=pool)
+        for i in range(3):
+            repository.create(Organisation(name=f"Company {i}"))
+        
+        batches = repository.iter_batches(batch_size=2)
+        first = next(batches)
+        repository.create(Organisation(name="Company 3"))
+        rest = list(batches)
+        
+        assert [org.name for batch in [first, *rest] for org in batch] == [f"Company {i}" for i in range(4)]
+        pool.close()
+
+
+class TestBulkOperations:
+    def test_create_many_assigns_ids(self, repository):
+        """Test that bulk inserts assign ids that match the stored rows."""
+        orgs = [Organisation(name=f"Bulk {i}", tags=[str(i)]) for i in range(5)]
+        
+        result = repository.create_many(orgs, chunk_size=2)
+        
+        assert len(result.succeeded) == 5
+        assert result.failed == []
+        for org in orgs:
+            stored = repository.get_by_id(org.id)
+            assert stored.name == org.name
+            assert stored.tags == org.tags
+    
+    def test_create_many_reports_item_errors(self, repository):
+        """Test that a failing row is reported without losing the rest of its chunk."""
+        orgs = [Organisation(name="Good 1"), Organisation(name=None), Organisation(name="Good 2")]
+        
+        result = repository.create_many(orgs)
+        
+        assert [item.index for item in result.failed] == [1]
+        assert "NOT NULL" in result.failed[0].error
+        assert [org.name for org in repository.get_all()] == ["Good 1", "Good 2"]
+        assert repository.get_by_id(orgs[2].id).name == "Good 2"
+    
+    def test_update_many(self, repository):
+        """Test bulk partial updates and not-found reporting."""
+        first = repository.create(Organisation(name="First", details="keep"))
+        second = repository.create(Organisation(name="Second", tags=["old"]))
+        
+        result = repository.update_many([
+            (first.id, {"name": "First Updated"}),
+            (999, {"name": "Missing"}),
+            (second.id, {"tags": ["new"]}),
+        ])
+        
+        assert [item.index for item in result.succeeded] == [0, 2]
+        assert result.failed[0].index == 1
+        assert result.failed[0].error == "Not found"
+        updated_first = repository.get_by_id(first.id)
+        assert updated_first.name == "First Updated"
+        assert updated_first.details == "keep"
+        assert repository.get_by_id(second.id).tags == ["new"]
+    
+    def test_update_many_rejects_unknown_columns_per_item(self, repository):
+        """Test that an item writing a non-updatable column fails alone."""
+        org = repository.create(Organisation(name="Before"))
+        
+        result = repository.update_many([(org.id, {"id": 5}), (org.id, {"name": "After"})])
+        
+        assert [item.index for item in result.failed] == [0]
+        assert result.failed[0].error == "Cannot update columns: id"
+        assert [item.index for item in result.succeeded] == [1]
+        assert repository.get_by_id(org.id).name == "After"
+    
+    def test_delete_many(self, repository):
+        """Test bulk delete by id list."""
+        orgs = [repository.create(Organisation(name=f"Delete {i}")) for i in range(3)]
+        
+        result = repository.delete_many([orgs[0].id, 999, orgs[2].id])
+        
+        assert [item.index for item in result.succeeded] == [0, 2]
+        assert [item.index for item in result.failed] == [1]
+        assert [org.id for org in repository.get_all()] == [orgs[1].id]
+    
+    def test_delete_many_reports_repeated_ids_once(self, repository):
+        """Test that a repeated id succeeds once and is not found the second time."""
+        org = repository.create(Organisation(name="Twice"))
+        
+        result = repository.delete_many([org.id, org.id])
+        
+        assert [item.index for item in result.succeeded] == [0]
+        assert [(item.index, item.error) for item in result.failed] == [(1, "Not found")]
+    
+    def test_create_many_ids_come_from_each_insert(self, repository):
+        """Test that returned ids match the stored rows when ids are not consecutive."""
+        orgs = [Organisation(name="Before gap"), Organisation(name=None), Organisation(name="After gap")]
+        with repository._get_write_connection() as conn:
+            conn.execute("INSERT INTO organisations (id, name, tags, created_at, updated_at) VALUES (1000, 'Far', '[]', '', '')")
+        
+        result = repository.create_many(orgs)
+        
+        assert [item.id for item in result.succeeded] == [orgs[0].id, orgs[2].id]
+        assert orgs[2].id == orgs[0].id + 1
+        assert [repository.get_by_id(org.id).name for org in (orgs[0], orgs[2])] == ["Before gap", "After gap"]
+    
+    def test_employee_bulk_roundtrip(self, employee_repository, sample_employee_data):
+        """Test bulk create, update and delete of employees."""
+        employees = [Employee(**sample_employee_data) for _ in range(3)]
+        employee_repository.create_many(employees)
+        
+        employee_repository.update_many([(employees[0].id, {"date_of_birth": date(1990, 1, 1)})])
+        employee_repository.delete_many([employees[1].id])
+        
+        remaining = employee_repository.get_all()
+        assert [employee.id for employee in remaining] == [employees[0].id, employees[2].id]
+        assert remaining[0].date_of_birth == date(1990, 1, 1)
+
+
+class TestMigrations:
+    def test_migrations_recorded_once(self, test_db_path, repository, employee_repository):
+        """Test that migrations are applied once and recorded by version."""
+        conn = sqlite3.connect(test_db_path)
+        
+        assert migrate(conn) == []
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+        assert versions == [migration.version for migration in MIGRATIONS]
+        assert current_version(conn) == MIGRATIONS[-1].version
+        conn.close()
+    
+    def test_migrates_legacy_database(self, test_db_path):
+        """Test that a database created before versioning is upgraded in place."""
+        conn = sqlite3.connect(test_db_path)
+        conn.execute("""
+            CREATE TABLE organisations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL, details TEXT,
+                name TEXT NOT NULL, tags TEXT, updated_at TEXT NOT NULL, url TEXT
+            )
+        """)
+        conn.execute("INSERT INTO organisations (created_at, name, tags, updated_at) VALUES ('2025-01-01T00:00:00', 'Legacy', '[\"old\"]', '2025-01-01T00:00:00')")
+        conn.commit()
+        
+        applied = migrate(conn)
+        
+        assert applied == [migration.version for migration in MIGRATIONS]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_organisations_name" in indexes
+        assert conn.execute("SELECT name FROM organisations").fetchone()[0] == "Legacy"
+        assert conn.execute("SELECT org_id, tag FROM organisation_tags").fetchall() == [(1, "old")]
+        conn.close()
+
+
+class TestQueryPlans:
+    def _plan(self, test_db_path, table, repository_class, query):
+        sql, params = build_page_select(table, repository_class.COLUMNS, repository_class.FILTERS, query)
+        conn = sqlite3.connect(test_db_path)
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        conn.close()
+        return " | ".join(row[-1] for row in rows)
+    
+    def test_get_by_id_uses_primary_key(self, test_db_path, repository):
+        """Test that lookups by id are primary key searches."""
+        conn = sqlite3.connect(test_db_path)
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM organisations WHERE id = ?", (1,)).fetchall()
+        conn.close()
+        
+        assert "INTEGER PRIMARY KEY" in plan[0][-1]
+    
+    def test_employees_by_organisation_uses_index(self, test_db_path, employee_repository):
+        """Test that organisation-scoped employee pages use the organisation_id index."""
+        plan = self._plan(test_db_path, "employees", EmployeeRepository, PageQuery(
+            after_id=10, limit=50, filters={"organisation_id": 1}
+        ))
+        
+        assert "idx_employees_organisation_id" in plan
+        assert "SCAN" not in plan
+    
+    def test_organisation_summaries_use_primary_key(self, test_db_path, employee_repository):
+        """Test that employee counts and summaries are primary key lookups, not employee scans."""
+        conn = sqlite3.connect(test_db_path)
+        rows = conn.execute(
+            "EXPLAIN QUERY PLAN " + EmployeeRepository.SUMMARIES_SQL.format(placeholders="?, ?"), (1, 2)
+        ).fetchall()
+        conn.close()
+        plan = " | ".join(row[-1] for row in rows)
+        
+        assert "SEARCH organisation_summaries USING INTEGER PRIMARY KEY" in plan
+        assert "employees" not in plan
+    
+    def test_employee_last_name_prefix_uses_index(self, test_db_path, employee_repository):
+        """Test that last name prefix filters use the (last_name, name) index."""
+        plan = self._plan(test_db_path, "employees", EmployeeRepository, PageQuery(
+            limit=50, filters={"last_name_prefix": "Do"}
+        ))
+        
+        assert "idx_employees_last_name_name" in plan
+    
+    def test_organisation_name_prefix_uses_index(self, test_db_path, repository):
+        """Test that organisation name prefix filters use the name index."""
+        plan = self._plan(test_db_path, "organisations", OrganisationRepository, PageQuery(
+            limit=50, filters={"name_prefix": "Acme"}
+        ))
+        
+        assert "idx_organisations_name" in plan
+    
+    def test_tag_filters_use_tag_index(self, test_db_path, repository):
+        """Test that tag filters are answered from the organisation_tags index."""
+        for filters in ({"tag": "ai"}, {"tags_any": ["ai", "ml"]}, {"tags_all": ["ai", "ml"]}):
+            plan = self._plan(test_db_path, "organisations", OrganisationRepository, PageQuery(filters=filters))
+            
+            assert "idx_organisation_tags_tag" in plan
+            assert "SCAN organisations" not in plan
+    
+    def test_updated_at_range_uses_index(self, test_db_path, repository, employee_repository):
+        """Test that updated_at windows use the updated_at indexes."""
+        window = {"updated_after": datetime(2025, 1, 1), "updated_before": datetime(2025, 2, 1)}
+        
+        org_plan = self._plan(test_db_path, "organisations", OrganisationRepository, PageQuery(filters=window))
+        employee_plan = self._plan(test_db_path, "employees", EmployeeRepository, PageQuery(filters=window))
+        
+        assert "idx_organisations_updated_at" in org_plan
+        assert "idx_employees_updated_at" in employee_plan
+
+
+class TestOrganisationTags:
+    def _stored_tags(self, test_db_path, org_id):
+        conn = sqlite3.connect(test_db_path)
+        rows = conn.execute("SELECT tag FROM organisation_tags WHERE org_id = ? ORDER BY tag", (org_id,)).fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+    
+    def test_tag_table_follows_writes(self, test_db_path, repository):
+        """Test that organisation_tags is maintained on create, update and delete."""
+        org = repository.create(Organisation(name="Tagged", tags=["b", "a", "a"]))
+        assert self._stored_tags(test_db_path, org.id) == ["a", "b"]
+        
+        repository.update_partial(org.id, {"tags": ["c"]})
+        assert self._stored_tags(test_db_path, org.id) == ["c"]
+        
+        repository.update_partial(org.id, {"name": "Renamed"})
+        assert self._stored_tags(test_db_path, org.id) == ["c"]
+        
+        repository.delete(org.id)
+        assert self._stored_tags(test_db_path, org.id) == []
+    
+    def test_tag_order_is_preserved_on_read(self, repository):
+        """Test that tags read back in the order they were written."""
+        org = repository.create(Organisation(name="Ordered", tags=["z", "a", "m"]))
+        
+        assert repository.get_by_id(org.id).tags == ["z", "a", "m"]
+    
+    def test_all_and_any_semantics(self, repository):
+        """Test AND and OR tag matching."""
+        both = repository.create(Organisation(name="Both", tags=["ai", "ml"]))
+        ai_only = repository.create(Organisation(name="AI", tags=["ai"]))
+        repository.create(Organisation(name="None", tags=["web"]))
+        
+        all_ids = [org.id for org in repository.query(PageQuery(filters={"tags_all": ["ai", "ml"]}))]
+        any_ids = [org.id for org in repository.query(PageQuery(filters={"tags_any": ["ai", "ml"]}))]
+        
+        assert all_ids == [both.id]
+        assert any_ids == [both.id, ai_only.id]
+    
+    def test_tag_counts(self, repository):
+        """Test tag cardinality ordering."""
+        repository.create_many([
+            Organisation(name="A", tags=["ai", "ml"]),
+            Organisation(name="B", tags=["ai"]),
+            Organisation(name="C", tags=["web"]),
+        ])
+        
+        assert repository.tag_counts() == [("ai", 2), ("ml", 1), ("web", 1)]
+        assert repository.tag_counts(limit=1) == [("ai", 2)]
+
+
+class TestStorageSettings:
+    def test_pragmas_applied_to_pooled_connections(self, test_db_path):
+        """Test that every pooled connection is configured from StorageSettings."""
+        settings = StorageSettings(synchronous="FULL", cache_size=-4096, busy_timeout=1234, temp_store="MEMORY")
+        pool = ConnectionPool(test_db_path, settings=settings)
+        
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        pool.close()
+    
+    def test_invalid_settings_rejected(self):
+        """Test that unknown PRAGMA keywords are rejected before reaching SQL."""
+        with pytest.raises(ValueError):
+            StorageSettings(journal_mode="WAL; DROP TABLE organisations")
+        with pytest.raises(ValueError):
+            StorageSettings(synchronous="SOMETIMES")
+
+
+class TestWriteQueue:
+    def test_writers_are_serialised(self):
+        """Test that only one writer holds the queue at a time."""
+        queue = WriteQueue()
+        active = []
+        overlaps = []
+        
+        def writer():
+            for _ in range(50):
+                queue.acquire(timeout=5)
+                active.append(1)
+                if len(active) > 1:
+                    overlaps.append(len(active))
+                time.sleep(0)
+                active.pop()
+                queue.release()
+        
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert overlaps == []
+        assert queue.writes == 200
+        assert queue.depth == 0
+    
+    def test_acquire_times_out(self):
+        """Test that a writer gives up after the timeout."""
+        queue = WriteQueue()
+        queue.acquire(timeout=1)
+        
+        with pytest.raises(PoolTimeoutError):
+            queue.acquire(timeout=0.01)
+        
+        assert queue.depth == 0
+        queue.release()
+    
+    def test_concurrent_writers_and_readers(self, test_db_path):
+        """Test that concurrent writes and reads complete without lock errors."""
+        pool = ConnectionPool(test_db_path, size=4)
+        repository = OrganisationRepository(test_db_path, pool=pool)
+        errors = []
+        
+        def write(worker):
+            try:
+                for i in range(20):
+                    repository.create(Organisation(name=f"Writer {worker}-{i}"))
+            except Exception as exc:
+                errors.append(exc)
+        
+        def read():
+            try:
+                for _ in range(20):
+                    repository.query(PageQuery(limit=10))
+            except Exception as exc:
+                errors.append(exc)
+        
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(repository.get_all()) == 80
+        assert pool.stats().writes >= 80
+        pool.close()
+
+
+class TestCachedRepository:
+    def test_repeat_reads_are_served_from_cache(self, repository, sample_org_data):
+        """Test that a second get_by_id is a hit and skips the database."""
+        cached = CachedRepository(repository)
+        created = cached.create(Organisation(**sample_org_data))
+        
+        first = cached.get_by_id(created.id)
+        with repository._get_write_connection() as conn:
+            conn.execute("UPDATE organisations SET name = 'Behind the cache' WHERE id = ?", (created.id,))
+        second = cached.get_by_id(created.id)
+        
+        assert first.name == second.name == sample_org_data["name"]
+        stats = cached.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    
+    def test_returned_entities_do_not_share_tags_with_the_cache(self, repository, monkeypatch):
+        """Test that changing a returned entity's tags leaves the cached entity unchanged."""
+        cached = CachedRepository(repository)
+        monkeypatch.setattr(repository, "get_by_id", lambda id: Organisation(name="Tagged", tags=["a"], id=id))
+        
+        cached.get_by_id(1).tags.append("changed")
+        cached.get_by_id(1).tags.append("again")
+        
+        assert cached.get_by_id(1).tags == ["a"]
+    
+    def test_writes_invalidate_entries(self, repository, sample_org_data):
+        """Test that update, update_partial, delete and bulk writes drop cached ids."""
+        cached = CachedRepository(repository)
+        created = cached.create(Organisation(**sample_org_data))
+        cached.get_by_id(created.id)
+        
+        cached.update_partial(created.id, {"name": "Renamed"})
+        assert cached.get_by_id(created.id).name == "Renamed"
+        
+        cached.update_many([(created.id, {"name": "Bulk renamed"})])
+        assert cached.get_by_id(created.id).name == "Bulk renamed"
+        
+        cached.delete(created.id)
+        assert cached.get_by_id(created.id) is None
+        assert cached.stats().invalidations == 3
+    
+    def test_least_recently_used_entry_is_evicted(self, repository):
+        """Test that the cache stays bounded and evicts the coldest entry."""
+        cached = CachedRepository(repository, max_entries=2)
+        ids = [cached.create(Organisation(name=f"Org {i}")).id for i in range(3)]
+        
+        cached.get_by_id(ids[0])
+        cached.get_by_id(ids[1])
+        cached.get_by_id(ids[0])
+        cached.get_by_id(ids[2])
+        
+        stats = cached.stats()
+        assert stats.size == 2
+        assert stats.evictions == 1
+        cached.get_by_id(ids[0])
+        assert cached.stats().hits == 2
+    
+    def test_entries_expire_after_ttl(self, repository, sample_org_data):
+        """Test that entries older than the TTL are reloaded."""
+        now = [0.0]
+        cached = CachedRepository(repository, ttl_seconds=10, clock=lambda: now[0])
+        created = cached.create(Organisation(**sample_org_data))
+        
+        cached.get_by_id(created.id)
+        now[0] = 11.0
+        cached.get_by_id(created.id)
+        
+        stats = cached.stats()
+        assert stats.expirations == 1
+        assert stats.misses == 2
+    
+    def test_returned_entities_are_copies(self, repository, sample_org_data):
+        """Test that callers mutating a result do not corrupt the cached entry."""
+        cached = CachedRepository(repository)
+        created = cached.create(Organisation(**sample_org_data))
+        
+        cached.get_by_id(created.id).name = "Mutated"
+        
+        assert cached.get_by_id(created.id).name == sample_org_data["name"]
+    
+    def test_forwards_repository_specific_methods(self, repository, sample_org_data):
+        """Test that methods outside IRepository reach the wrapped repository."""
+        cached = CachedRepository(repository)
+        cached.create(Organisation(**sample_org_data))
+        
+        assert cached.tag_counts() == repository.tag_counts()
+
+
+class TestOptimisticConcurrency:
+    def test_table_version_changes_on_every_write(self, repository, sample_org_data):
+        """Test that inserts, updates and deletes each bump the table version."""
+        versions = [repository.table_version()]
+        created = repository.create(Organisation(**sample_org_data))
+        versions.append(repository.table_version())
+        repository.update_partial(created.id, {"name": "Renamed"})
+        versions.append(repository.table_version())
+        repository.delete(created.id)
+        versions.append(repository.table_version())
+        
+        assert versions == sorted(set(versions))
+    
+    def test_update_with_current_version_succeeds(self, repository, sample_org_data):
+        """Test that a conditional update applies when updated_at still matches."""
+        created = repository.create(Organisation(**sample_org_data))
+        
+        updated = repository.update_partial(created.id, {"name": "Renamed"}, [created.updated_at])
+        
+        assert updated.name == "Renamed"
+        assert updated.updated_at > created.updated_at
+    
+    def test_update_with_stale_version_is_rejected(self, repository, sample_org_data):
+        """Test that a conditional update or delete is skipped once the row has moved on."""
+        created = repository.create(Organisation(**sample_org_data))
+        repository.update_partial(created.id, {"name": "Someone else"})
+        
+        assert repository.update_partial(created.id, {"name": "Mine"}, [created.updated_at]) is None
+        assert repository.delete(created.id, [created.updated_at]) is False
+        assert repository.delete(created.id, []) is False
+        assert repository.get_by_id(created.id).name == "Someone else"
+
+
+class TestJsonQuery:
+    def test_documents_match_response_models(self, repository, sample_org_data):
+        """Test that SQL-rendered documents equal the response_model serialisation."""
+        repository.create(Organisation(**sample_org_data))
+        repository.create(Organisation(name="Bare \"quoted\" \u00e9", tags=[]))
+        
+        rows = repository.query_json(PageQuery())
+        
+        assert [id for id, _ in rows] == [org.id for org in repository.query(PageQuery())]
+        assert [json.loads(document) for _, document in rows] == [
+            OrganisationResponse.model_validate(org.to_dict()).model_dump(mode="json")
+            for org in repository.query(PageQuery())
+        ]
+    
+    def test_projection_renders_only_requested_fields(self, repository, sample_org_data):
+        """Test that fields limits the document while the id is still returned for the cursor."""
+        created = repository.create(Organisation(**sample_org_data))
+        
+        rows = repository.query_json(PageQuery(fields=["name", "tags"]))
+        
+        assert rows[0][0] == created.id
+        assert json.loads(rows[0][1]) == {"name": sample_org_data["name"], "tags": sample_org_data["tags"]}
+    
+    def test_employee_documents_match_response_models(self, employee_repository, sample_employee_data):
+        """Test that employee documents render dates and integers like the response model."""
+        employee_repository.create(Employee(**sample_employee_data))
+        
+        rows = employee_repository.query_json(PageQuery())
+        employee = employee_repository.query(PageQuery())[0]
+        
+        assert json.loads(rows[0][1]) == EmployeeResponse.model_validate(employee.to_dict()).model_dump(mode="json")
+
+
+class TestOrganisationScopedQueries:
+    def test_count_by_organisation_includes_zero_counts(self, employee_repository, sample_employee_data):
+        """Test that every requested organisation gets a count, even with no employees."""
+        for organisation_id in (1, 1, 2):
+            employee_repository.create(Employee(**{**sample_employee_data, "organisation_id": organisation_id}))
+        
+        assert employee_repository.count_by_organisation([1, 2, 3]) == {1: 2, 2: 1, 3: 0}
+        assert employee_repository.count_by_organisation([]) == {}
+    
+    def test_ids_filter(self, repository):
+        """Test that the ids filter returns only the listed organisations in id order."""
+        ids = [repository.create(Organisation(name=f"Org {i}")).id for i in range(4)]
+        
+        page = repository.query(PageQuery(filters={"ids": [ids[3], ids[1]]}))
+        
+        assert [org.id for org in page] == [ids[1], ids[3]]
+
+
+class TestInstrumentation:
+    def _count(self, operation):
+        return sum(STATEMENT_SECONDS.labels(operation).counts)
+    
+    def test_instrumented_pool_times_statements_and_counts_rows(self, test_db_path):
+        """Test that statements are timed per operation and fetched rows counted."""
+        repository = OrganisationRepository(test_db_path, pool=ConnectionPool(test_db_path, instrumented=True))
+        repository.create_many([Organisation(name=f"Org {i}") for i in range(3)])
+        selects, inserts = self._count("SELECT"), self._count("INSERT")
+        rows_read = ROWS_READ.labels().value
+        
+        repository.get_all()
+        repository.create(Organisation(name="Timed"))
+        
+        assert self._count("SELECT") == selects + 1
+        assert self._count("INSERT") == inserts + 1
+        assert ROWS_READ.labels().value == rows_read + 3
+    
+    def test_connection_open_is_timed(self, test_db_path):
+        """Test that opening a pooled connection is recorded."""
+        opened = sum(CONNECTION_OPEN_SECONDS.labels().counts)
+        pool = ConnectionPool(test_db_path, instrumented=True)
+        
+        with pool.connection() as conn:
+            assert isinstance(conn.cursor(), InstrumentedCursor)
+        
+        assert sum(CONNECTION_OPEN_SECONDS.labels().counts) == opened + 1
+        pool.close()
+    
+    def test_uninstrumented_pool_uses_plain_connections(self, test_db_path):
+        """Test that pools are uninstrumented unless asked."""
+        pool = ConnectionPool(test_db_path)
+        
+        with pool.connection() as conn:
+            assert type(conn) is sqlite3.Connection
+        pool.close()
+    
+    def test_slow_queries_are_logged_with_plan(self, test_db_path, caplog):
+        """Test that statements over the threshold are logged with parameter types and plan."""
+        pool = ConnectionPool(test_db_path, slow_query_seconds=0)
+        repository = OrganisationRepository(test_db_path, pool=pool)
+        caplog.clear()
+        
+        with caplog.at_level("WARNING", logger="repositories.slow_query"):
+            repository.get_by_id(42)
+        
+        message = next(record.getMessage() for record in caplog.records if "organisations WHERE id" in record.getMessage())
+        assert "params=(int)" in message
+        assert "42" not in message
+        assert "INTEGER PRIMARY KEY" in message
+        pool.close()
+    
+    def test_fast_queries_are_not_logged(self, test_db_path, caplog):
+        """Test that nothing is logged below the threshold."""
+        pool = ConnectionPool(test_db_path, slow_query_seconds=60)
+        repository = OrganisationRepository(test_db_path, pool=pool)
+        
+        with caplog.at_level("WARNING", logger="repositories.slow_query"):
+            repository.get_by_id(1)
+        
+        assert caplog.records == []
+        pool.close()
+
+class TestBulkImport:
+    EMPLOYEE_CSV = (
+        "name,last_name,age,date_of_birth,location,organisation_id\n"
+        "Ada,Lovelace,36,1815-12-10,London,1\n"
+        "Alan,Turing,41,1912-06-23,Wilmslow,1\n"
+        "Grace,Hopper,,1906-12-09,Arlington,1\n"
+    )
+    
+    def _indexes(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL ORDER BY name").fetchall()
+        finally:
+            conn.close()
+    
+    def test_imports_ndjson_gzip_and_populates_tag_index(self, test_db_path, tmp_path, repository):
+        """Test that gzipped NDJSON is loaded, the tag trigger fires and the search index is rebuilt."""
+        path = tmp_path / "organisations.ndjson.gz"
+        with gzip.open(path, "wt") as handle:
+            for i in range(5):
+                handle.write(json.dumps({"name": f"Org {i}", "tags": ["bulk", f"t{i}"]}) + "\n")
+        
+        stats = BulkImporter(test_db_path, chunk_size=2).import_file('organisations', str(path))
+        
+        assert (stats.read, stats.inserted, stats.failed) == (5, 5, 0)
+        assert len(repository.query(PageQuery(filters={"tags_all": ["bulk"]}))) == 5
+        assert [org.name for org in repository.query(PageQuery(filters={"tags_all": ["t3"]}))] == ["Org 3"]
+        assert len(SearchRepository(test_db_path).search_json("org")) == 5
+    
+    def test_invalid_rows_are_reported_and_skipped(self, test_db_path, tmp_path, employee_repository):
+        """Test that bad rows are counted with their line numbers and the rest imported."""
+        path = tmp_path / "employees.csv"
+        path.write_text(self.EMPLOYEE_CSV + "Bad,Date,30,yesterday,Nowhere,1\n")
+        
+        stats = BulkImporter(test_db_path).import_file('employees', str(path))
+        
+        assert (stats.read, stats.inserted, stats.failed) == (4, 2, 2)
+        assert [line for line, _ in stats.errors] == [4, 5]
+        assert "age is required" in stats.errors[0][1]
+        assert {employee.last_name for employee in employee_repository.get_all()} == {"Lovelace", "Turing"}
+    
+    def test_constraint_failures_fall_back_to_single_rows(self, test_db_path, tmp_path, repository):
+        """Test that a duplicate id only loses its own row, not the whole chunk."""
+        repository.create(Organisation(name="Existing"))
+        path = tmp_path / "organisations.ndjson"
+        path.write_text("\n".join(json.dumps({"id": i, "name": f"Org {i}"}) for i in (1, 2, 3)))
+        
+        stats = BulkImporter(test_db_path).import_file('organisations', str(path))
+        
+        assert (stats.inserted, stats.failed) == (2, 1)
+        assert "UNIQUE" in stats.errors[0][1]
+        assert repository.get_by_id(1).name == "Existing"
+    
+    def test_strict_import_aborts_and_restores_indexes(self, test_db_path, tmp_path, repository):
+        """Test that strict mode raises on a bad row and still rebuilds the dropped indexes."""
+        before = self._indexes(test_db_path)
+        path = tmp_path / "employees.csv"
+        path.write_text(self.EMPLOYEE_CSV)
+        
+        with pytest.raises(BulkImportError, match="line 4"):
+            BulkImporter(test_db_path, strict=True).import_file('employees', str(path))
+        
+        assert self._indexes(test_db_path) == before
+    
+    def test_other_imports_leave_a_running_load_alone(self, test_db_path, repository):
+        """Test that a second import refuses to start instead of restoring another import's indexes."""
+        before = self._indexes(test_db_path)
+        running = BulkImporter(test_db_path)
+        conn = running._connect()
+        running._defer_maintenance(conn, TARGETS['employees'])
+        dropped = self._indexes(test_db_path)
+        
+        for importer in (BulkImporter(test_db_path), BulkImporter(test_db_path, drop_indexes=False)):
+            with pytest.raises(BulkImportError, match="Another import is running"):
+                importer.import_records('organisations', iter([]))
+        
+        assert len(dropped) < len(before)
+        assert self._indexes(test_db_path) == dropped
+        running._finish_deferred(conn)
+        conn.close()
+        assert self._indexes(test_db_path) == before
+    
+    def test_interrupted_import_is_resumed_explicitly(self, test_db_path, repository):
+        """Test that resume() recreates what a killed import dropped."""
+        before = self._indexes(test_db_path)
+        importer = BulkImporter(test_db_path)
+        conn = importer._connect()
+        importer._defer_maintenance(conn, TARGETS['employees'])
+        conn.close()
+        
+        assert importer.resume() > 0
+        assert self._indexes(test_db_path) == before
+        assert importer.resume() == 0
+        importer.import_records('employees', iter([]))
+    
+    def test_imported_rows_are_logged_as_changes(self, test_db_path, tmp_path, repository):
+        """Test that the deferred change log picks up imported rows, including ones over a tombstone."""
+        existing = repository.create(Organisation(name="Existing"))
+        deleted = repository.create(Organisation(name="Deleted"))
+        repository.delete(deleted.id)
+        path = tmp_path / "organisations.ndjson"
+        path.write_text("\n".join(json.dumps(record) for record in ({"id": deleted.id, "name": "Back"}, {"name": "New"})))
+        
+        BulkImporter(test_db_path).import_file('organisations', str(path))
+        
+        changes = [json.loads(document) for _, document in ChangeRepository(test_db_path).changes_json()]
+        assert [(change["data"]["name"], change["op"]) for change in changes] == [
+            ("Existing", "upsert"), ("Back", "upsert"), ("New", "upsert")
+        ]
+        assert changes[0]["id"] == existing.id
+    
+    def test_timestamps_are_normalised_to_utc(self, test_db_path, tmp_path, repository):
+        """Test that offsets and fractional UTC stamps are stored as isoformat() UTC."""
+        path = tmp_path / "organisations.ndjson"
+        path.write_text("\n".join(json.dumps(record) for record in (
+            {"id": 1, "name": "Offset", "updated_at": "2024-05-01T10:00:00+02:00"},
+            {"id": 2, "name": "Padded", "updated_at": "2024-05-01T09:00:00.000000+00:00"},
+            {"id": 3, "name": "Naive", "updated_at": "2024-05-01T08:30:00"},
+        )))
+        
+        BulkImporter(test_db_path).import_file('organisations', str(path))
+        
+        with repository._get_connection() as conn:
+            stored = conn.execute("SELECT updated_at FROM organisations ORDER BY updated_at").fetchall()
+        assert [row[0] for row in stored] == [
+            "2024-05-01T08:00:00+00:00", "2024-05-01T08:30:00+00:00", "2024-05-01T09:00:00+00:00"
+        ]
+    
+    def test_export_round_trip_preserves_ids_and_timestamps(self, test_db_path, tmp_path, repository):
+        """Test that organisations written out as NDJSON import into another database unchanged."""
+        repository.create_many([Organisation(name=f"Org {i}", tags=["x"]) for i in range(3)])
+        originals = repository.get_all()
+        path = tmp_path / "export.ndjson"
+        path.write_text("\n".join(json.dumps(OrganisationResponse.model_validate(org).model_dump(mode="json")) for org in originals))
+        target = str(tmp_path / "copy.db")
+        
+        BulkImporter(target).import_file('organisations', str(path))
+        
+        copies = OrganisationRepository(target).get_all()
+        assert [(org.id, org.name, org.tags, org.created_at) for org in copies] == [
+            (org.id, org.name, org.tags, org.created_at) for org in originals
+        ]
+
+
+class TestSearchRepository:
+    def _titles(self, documents):
+        return [json.loads(document)["title"] for document in documents]
+    
+    def test_match_expression_neutralises_query_syntax(self):
+        """Test that user text becomes quoted prefix terms with FTS5 operators stripped."""
+        assert match_expression('acme OR "lon*" NEAR(x') == '"acme"* "OR"* "lon"* "NEAR"* "x"'
+        assert match_expression("name:café") == '"name"* "café"*'
+        assert match_expression("  -- ") is None
+    
+    def test_prefix_and_accent_insensitive_matching(self, test_db_path, repository):
+        """Test that words match as prefixes and without diacritics."""
+        repository.create(Organisation(name="Société Générale", details="Banking"))
+        repository.create(Organisation(name="Acme", details="Generic widgets"))
+        search = SearchRepository(test_db_path)
+        
+        assert self._titles(search.search_json("societe gen")) == ["Société Générale"]
+        assert self._titles(search.search_json("bank")) == ["Société Générale"]
+    
+    def test_name_matches_rank_above_details(self, test_db_path, repository):
+        """Test that the column weights favour names over free-text details."""
+        repository.create(Organisation(name="Other", details="We resell Zephyr parts"))
+        repository.create(Organisation(name="Zephyr", details="Parts"))
+        
+        assert self._titles(SearchRepository(test_db_path).search_json("zephyr")) == ["Zephyr", "Other"]
+    
+    def test_snippet_escapes_stored_markup(self, test_db_path, repository):
+        """Test that markup in a column is escaped and only matches are wrapped in mark tags."""
+        repository.create(Organisation(name="Markup", details="hello <img src=x onerror=alert(1)> & world"))
+        
+        [document] = SearchRepository(test_db_path).search_json("hello")
+        
+        assert json.loads(document)["snippet"] == "<mark>hello</mark> &lt;img src=x onerror=alert(1)&gt; &amp; world"
+    
+    def test_existing_rows_are_indexed_by_the_migration(self, test_db_path):
+        """Test that migrating a database with data backfills the search index."""
+        conn = sqlite3.connect(test_db_path)
+        migrate(conn, [m for m in MIGRATIONS if m.version < 5])
+        conn.execute(
+            "INSERT INTO employees (name, last_name, age, date_of_birth, location, organisation_id, created_at, updated_at) "
+            "VALUES ('Grace', 'Hopper', 85, '1906-12-09', 'Arlington', 1, '2024-01-01', '2024-01-01')"
+        )
+        conn.commit()
+        conn.close()
+        
+        assert self._titles(SearchRepository(test_db_path).search_json("hopper", ["employee"])) == ["Grace Hopper"]
+    
+    def test_search_uses_the_full_text_index(self, test_db_path):
+        """Test that ranking reads the FTS index, not a scan of the base tables."""
+        search = SearchRepository(test_db_path)
+        statements = []
+        with search._pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+        
+        search.search_json("acme")
+        
+        ranked = next(sql for sql in statements if "UNION ALL" in sql)
+        with search._pool.connection() as conn:
+            conn.set_trace_callback(None)
+            plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {ranked}"))
+        assert "VIRTUAL TABLE INDEX" in plan
+        assert re.search(r"SCAN (organisations|employees)\b(?!_fts)", plan) is None
+
+
+class TestDemographics:
+    def _employees(self, employee_repository, rows):
+        for age, location, organisation_id in rows:
+            employee_repository.create(Employee(
+                name="E", last_name="Mployee", age=age, date_of_birth=date(2024 - age, 6, 1),
+                location=location, organisation_id=organisation_id
+            ))
+    
+    def test_aggregates(self, employee_repository):
+        """Test counts, age statistics, contiguous histogram buckets and top-N groupings."""
+        self._employees(employee_repository, [
+            (21, "London", 1), (25, "London", 1), (38, "Paris", 2), (44, "London", 2)
+        ])
+        
+        stats = employee_repository.demographics(DemographicsQuery(age_bucket=10, cohort_years=20, top=1))
+        
+        assert stats["count"] == 4
+        assert stats["age"] == {
+            "min": 21, "max": 44, "mean": 32.0, "median": 31.5,
+            "histogram": [
+                {"start": 20, "end": 30, "count": 2},
+                {"start": 30, "end": 40, "count": 1},
+                {"start": 40, "end": 50, "count": 1},
+            ],
+        }
+        assert stats["birth_cohorts"] == [
+            {"start": 1980, "end": 2000, "count": 3},
+            {"start": 2000, "end": 2020, "count": 1},
+        ]
+        assert stats["by_location"] == [{"location": "London", "count": 3}]
+        assert stats["by_organisation"] == [{"organisation_id": 1, "count": 2}]
+    
+    def test_empty_and_organisation_filter(self, employee_repository):
+        """Test an empty result and scoping to one organisation."""
+        assert employee_repository.demographics()["age"]["median"] is None
+        self._employees(employee_repository, [(30, "London", 1), (50, "Paris", 2)])
+        
+        stats = employee_repository.demographics(DemographicsQuery(organisation_id=2))
+        
+        assert stats["count"] == 1
+        assert stats["age"]["histogram"] == [{"start": 50, "end": 60, "count": 1}]
+        assert stats["by_location"] == [{"location": "Paris", "count": 1}]
+    
+    def test_cached_until_the_table_changes(self, employee_repository):
+        """Test that repeat calls are served from cache and a write invalidates it."""
+        self._employees(employee_repository, [(30, "London", 1)])
+        first = employee_repository.demographics()
+        
+        assert employee_repository.demographics() is first
+        self._employees(employee_repository, [(40, "London", 1)])
+        assert employee_repository.demographics()["count"] == 2
+    
+    def test_age_rollup_uses_covering_index(self, test_db_path, employee_repository):
+        """Test that the age and birth-year grouping reads only the covering index."""
+        conn = sqlite3.connect(test_db_path)
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT age, date_of_birth, COUNT(*) FROM employees GROUP BY age, date_of_birth"
+        ))
+        conn.close()
+        
+        assert "COVERING INDEX idx_employees_age_date_of_birth" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestOrganisationSummaries:
+    def _create(self, employee_repository, sample_employee_data, **values):
+        return employee_repository.create(Employee(**{**sample_employee_data, **values}))
+    
+    def test_summaries_follow_writes(self, employee_repository, sample_employee_data):
+        """Test that inserts, updates, moves and deletes keep the summaries exact."""
+        first = self._create(employee_repository, sample_employee_data, age=30, organisation_id=1)
+        second = self._create(employee_repository, sample_employee_data, age=50, organisation_id=1)
+        third = self._create(employee_repository, sample_employee_data, age=20, organisation_id=2)
+        
+        employee_repository.update_partial(first.id, {'age': 40})
+        employee_repository.update_partial(third.id, {'organisation_id': 1})
+        employee_repository.delete(second.id)
+        summaries = employee_repository.summaries_by_organisation([1, 2])
+        
+        assert summaries[1]["employee_count"] == 2
+        assert summaries[1]["average_age"] == 30
+        moved = employee_repository.get_by_id(third.id)
+        assert summaries[1]["last_updated_at"] == moved.updated_at.isoformat().replace("+00:00", "Z")
+        assert summaries[2] == {"employee_count": 0, "average_age": None, "last_updated_at": None}
+        assert employee_repository.verify_summaries() == []
+    
+    def test_bulk_writes_keep_summaries_consistent(self, employee_repository, sample_employee_data):
+        """Test the summaries after bulk create, update and delete."""
+        created = employee_repository.create_many([
+            Employee(**{**sample_employee_data, "organisation_id": organisation_id}) for organisation_id in (1, 2, 2, 3)
+        ])
+        ids = [item.id for item in created.succeeded]
+        employee_repository.update_many([(ids[0], {'organisation_id': 3}), (ids[1], {'age': 60})])
+        employee_repository.delete_many([ids[2]])
+        
+        assert employee_repository.count_by_organisation([1, 2, 3]) == {1: 0, 2: 1, 3: 2}
+        assert employee_repository.verify_summaries() == []
+    
+    def test_verify_detects_and_rebuilds(self, test_db_path, employee_repository, sample_employee_data):
+        """Test that drift is reported and that a rebuild repairs it and bumps the table version."""
+        self._create(employee_repository, sample_employee_data, organisation_id=1)
+        self._create(employee_repository, sample_employee_data, organisation_id=2)
+        conn = sqlite3.connect(test_db_path)
+        conn.execute("UPDATE organisation_summaries SET employee_count = 5 WHERE organisation_id = 1")
+        conn.execute("DELETE FROM organisation_summaries WHERE organisation_id = 2")
+        conn.commit()
+        conn.close()
+        version = employee_repository.table_version()
+        
+        assert employee_repository.verify_summaries() == [1, 2]
+        assert employee_repository.verify_summaries(rebuild=True) == [1, 2]
+        assert employee_repository.verify_summaries() == []
+        assert employee_repository.count_by_organisation([1, 2]) == {1: 1, 2: 1}
+        assert employee_repository.table_version() == version + 1
+    
+    def test_summary_lookup_uses_primary_key(self, test_db_path, employee_repository):
+        """Test that reading summaries is a primary key search, not a scan of employees."""
+        conn = sqlite3.connect(test_db_path)
+        plan = " | ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM organisation_summaries WHERE organisation_id IN (?, ?)", (1, 2)
+        ))
+        conn.close()
+        
+        assert "INTEGER PRIMARY KEY" in plan
+        assert "employees" not in plan
+
+
+class TestChangeRepository:
+    def _changes(self, test_db_path, since=0, kinds=("organisation", "employee"), limit=100):
+        return [json.loads(document) for _, document in ChangeRepository(test_db_path).changes_json(since, kinds, limit)]
+    
+    def test_log_keeps_the_latest_change_per_entity(self, test_db_path, repository, employee_repository, sample_employee_data):
+        """Test that each entity appears once, at its latest write, with deletes as tombstones."""
+        kept = repository.create(Organisation(name="Kept"))
+        gone = repository.create(Organisation(name="Gone"))
+        employee = employee_repository.create(Employee(**sample_employee_data))
+        repository.update_partial(kept.id, {"name": "Renamed"})
+        repository.delete(gone.id)
+        
+        changes = self._changes(test_db_path)
+        
+        assert [(change["type"], change["id"], change["op"]) for change in changes] == [
+            ("employee", employee.id, "upsert"), ("organisation", kept.id, "upsert"), ("organisation", gone.id, "delete")
+        ]
+        assert changes[1]["data"] == json.loads(repository.query_json(PageQuery(filters={"ids": [kept.id]}))[0][1])
+        assert changes[2]["data"] is None
+        assert [change["seq"] for change in changes] == sorted(change["seq"] for change in changes)
+    
+    def test_paging_by_sequence(self, test_db_path, repository, employee_repository, sample_employee_data):
+        """Test that since and limit page through the log and that types can be filtered."""
+        repository.create_many([Organisation(name=f"Org {i}") for i in range(5)])
+        employee_repository.create(Employee(**sample_employee_data))
+        
+        first = self._changes(test_db_path, limit=3)
+        rest = self._changes(test_db_path, since=first[-1]["seq"])
+        
+        assert [change["data"]["name"] for change in first + rest[:2]] == [f"Org {i}" for i in range(5)]
+        assert rest[-1]["type"] == "employee"
+        assert [change["type"] for change in self._changes(test_db_path, kinds=("employee",))] == ["employee"]
+        assert self._changes(test_db_path, since=rest[-1]["seq"]) == []
+        assert ChangeRepository(test_db_path).latest_seq() == rest[-1]["seq"]
+    
+    def test_migration_logs_existing_rows(self, test_db_path):
+        """Test that migrating a database with data records every existing entity."""
+        conn = sqlite3.connect(test_db_path)
+        migrate(conn, [m for m in MIGRATIONS if m.version < 8])
+        conn.execute("INSERT INTO organisations (name, created_at, updated_at) VALUES ('Before', '2024-01-01', '2024-01-01')")
+        conn.commit()
+        conn.close()
+        
+        assert [change["data"]["name"] for change in self._changes(test_db_path)] == ["Before"]
+    
+    def test_reads_walk_the_sequence(self, test_db_path):
+        """Test that a filtered page is read in sequence order without a sort."""
+        repository = ChangeRepository(test_db_path)
+        statements = []
+        with repository._pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+        
+        repository.changes_json(10, ("organisation",), 5)
+        
+        with repository._pool.connection() as conn:
+            conn.set_trace_callback(None)
+            plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}"))
+        assert "SEARCH changes USING INTEGER PRIMARY KEY (rowid>?)" in plan
+        assert "TEMP B-TREE" not in plan
@@ -1,5 +1,12 @@
+import asyncio
 import pytest
 from models.entity import Organisation
+from observability.metrics import MetricsRegistry
+from repositories.connection_pool import ConnectionPool
+from repositories.employee_repository import EmployeeRepository
+from repositories.organisation_repository import OrganisationRepository
+from services.employee_service import EmployeeService
+from services.events import EntityEvent, EventBus, PublishingRepository, TooManySubscribersError
 from services.organisation_service import OrganisationService
 
 class TestOrganisationService:
@@ -136,3 +143,225 @@ class TestOrganisationService:
         
         retrieved_org2 = service.get_organisation_by_id(org2.id)
         assert retrieved_org2.tags == ["tag2"]
+    
+    def test_bulk_update_ignores_unset_fields(self, service):
+        """Test that bulk updates only write the fields that were provided."""
+        created_org = service.create_organisation(name="Original", details="Keep me")
+        
+        result = service.update_organisations([
+            (created_org.id, {"name": "Renamed", "details": None, "tags": None, "url": None})
+        ])
+        
+        assert result.failed == []
+        updated_org = service.get_organisation_by_id(created_org.id)
+        assert updated_org.name == "Renamed"
+        assert updated_org.details == "Keep me"
+    
+    def test_bulk_create_and_delete(self, service):
+        """Test bulk create followed by bulk delete through the service."""
+        created = service.create_organisations([{"name": "Bulk A"}, {"name": "Bulk B", "tags": ["b"]}])
+        ids = [item.id for item in created.succeeded]
+        
+        deleted = service.delete_organisations(ids)
+        
+        assert len(deleted.succeeded) == 2
+        assert service.get_all_organisations() == []
+    
+    def test_update_is_a_single_statement(self, test_db_path):
+        """Test that an update issues one UPDATE ... RETURNING on one connection."""
+        pool = ConnectionPool(test_db_path, size=1)
+        service = OrganisationService(OrganisationRepository(test_db_path, pool=pool))
+        created_org = service.create_organisation(name="Original", tags=["keep"])
+        statements = []
+        with pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+        checkouts = pool.stats().checkouts
+        
+        updated_org = service.update_organisation(id=created_org.id, name="Updated")
+        
+        # Trigger programs are traced under the text of the statement that fired them;
+        # FTS5 traces its own index maintenance as "-- " comments.
+        queries = {sql for sql in statements if sql.split()[0] not in ("BEGIN", "COMMIT", "--")}
+        assert len(queries) == 1
+        queries = list(queries)
+        assert queries[0].startswith("UPDATE organisations SET name = 'Updated'")
+        assert queries[0].endswith("RETURNING *")
+        assert pool.stats().checkouts == checkouts + 1
+        assert updated_org.name == "Updated"
+        assert updated_org.tags == ["keep"]
+        pool.close()
+
+
+class TestAsyncOrganisationService:
+    def test_crud_round_trip(self, async_service, sample_org_data):
+        """Test create, read, update and delete through the async service."""
+        async def scenario():
+            created = await async_service.create_organisation(**sample_org_data)
+            fetched = await async_service.get_organisation_by_id(created.id)
+            updated = await async_service.update_organisation(id=created.id, name="Renamed")
+            deleted = await async_service.delete_organisation(created.id)
+            missing = await async_service.get_organisation_by_id(created.id)
+            return created, fetched, updated, deleted, missing
+        
+        created, fetched, updated, deleted, missing = asyncio.run(scenario())
+        
+        assert fetched.name == sample_org_data["name"]
+        assert updated.name == "Renamed"
+        assert updated.tags == sample_org_data["tags"]
+        assert deleted is True
+        assert missing is None
+    
+    def test_concurrent_calls_share_the_executor(self, async_service):
+        """Test that many concurrent awaits complete on a small executor."""
+        async def scenario():
+            created = await asyncio.gather(*(
+                async_service.create_organisation(name=f"Concurrent {i}") for i in range(20)
+            ))
+            return await asyncio.gather(*(
+                async_service.get_organisation_by_id(org.id) for org in created
+            ))
+        
+        fetched = asyncio.run(scenario())
+        
+        assert sorted(org.name for org in fetched) == sorted(f"Concurrent {i}" for i in range(20))
+    
+    def test_iter_batches_releases_connection(self, repository, async_service):
+        """Test that abandoning an async batch iterator returns its connection to the pool."""
+        async def scenario():
+            await async_service.create_organisations([{"name": f"Batch {i}"} for i in range(5)])
+            batches = async_service.iter_organisation_batches(2)
+            first = await batches.__anext__()
+            await batches.aclose()
+            return first
+        
+        first = asyncio.run(scenario())
+        
+        assert len(first) == 2
+        assert repository._pool.stats().in_use == 0
+
+
+class TestEventBus:
+    def _bus(self, **options):
+        return EventBus(registry=MetricsRegistry(), **options)
+    
+    def test_subscriptions_are_filtered(self):
+        """Test that subscribers only receive the types and organisation they asked for."""
+        bus = self._bus()
+        async def scenario():
+            everything = bus.subscribe()
+            employees = bus.subscribe(["employee"])
+            one_organisation = bus.subscribe(organisation_id=1)
+            bus.publish([
+                EntityEvent("organisation", "created", 1, 1),
+                EntityEvent("employee", "created", 7, 1),
+                EntityEvent("employee", "deleted", 8, 2),
+            ])
+            return [[event.id for event in await s.next_batch(0)] for s in (everything, employees, one_organisation)]
+        
+        assert asyncio.run(scenario()) == [[1, 7, 8], [7, 8], [1, 7]]
+    
+    def test_slow_subscriber_overflows_alone(self):
+        """Test that a subscriber past its queue bound is closed while others keep receiving."""
+        bus = self._bus(max_queued=2)
+        async def scenario():
+            slow = bus.subscribe(["organisation"])
+            fast = bus.subscribe(["organisation"])
+            bus.publish([EntityEvent("organisation", "created", 1, 1)])
+            await fast.next_batch(0)
+            bus.publish([EntityEvent("organisation", "created", id, id) for id in (2, 3)])
+            return slow, await slow.next_batch(0), await fast.next_batch(0)
+        
+        slow, slow_events, fast_events = asyncio.run(scenario())
+        
+        assert slow.overflowed and slow.closed and slow_events == []
+        assert [event.id for event in fast_events] == [2, 3]
+    
+    def test_subscriber_limit(self):
+        """Test that subscriptions beyond the limit are refused and freed slots are reused."""
+        bus = self._bus(max_subscribers=1)
+        async def scenario():
+            first = bus.subscribe()
+            with pytest.raises(TooManySubscribersError):
+                bus.subscribe()
+            bus.unsubscribe(first)
+            bus.subscribe()
+            return bus.has_subscribers
+        
+        assert asyncio.run(scenario()) is True
+    
+    def test_sync_service_publishes_from_a_worker_thread(self, repository):
+        """Test that writes made off the event loop reach subscribers on it."""
+        bus = self._bus()
+        service = OrganisationService(PublishingRepository(repository, bus, "organisation"))
+        async def scenario():
+            subscription = bus.subscribe()
+            created = await asyncio.get_running_loop().run_in_executor(None, service.create_organisation, "Threaded")
+            return created, await subscription.next_batch(5)
+        
+        created, events = asyncio.run(scenario())
+        
+        assert events == [EntityEvent("organisation", "created", created.id, created.id)]
+    
+    def test_successful_writes_are_published(self, test_db_path, repository, sample_employee_data):
+        """Test the events for single and bulk writes, with employee organisations resolved."""
+        bus = self._bus()
+        employee_repository = EmployeeRepository(test_db_path)
+        organisations = OrganisationService(PublishingRepository(repository, bus, "organisation"))
+        employees = EmployeeService(
+            PublishingRepository(employee_repository, bus, "employee", employee_repository.organisation_ids)
+        )
+        async def scenario():
+            subscription = bus.subscribe()
+            org = organisations.create_organisation("Publisher")
+            organisations.update_organisation(999, name="Missing")
+            created = employees.create_employees([{**sample_employee_data, "organisation_id": org.id}] * 2)
+            ids = [item.id for item in created.succeeded]
+            employees.update_employees([(ids[0], {"age": 41}), (999, {"age": 1})])
+            employees.delete_employee(ids[1])
+            organisations.delete_organisations([org.id, 999])
+            return org, ids, await subscription.next_batch(0)
+        
+        org, ids, events = asyncio.run(scenario())
+        
+        assert events == [
+            EntityEvent("organisation", "created", org.id, org.id),
+            EntityEvent("employee", "created", ids[0], org.id),
+            EntityEvent("employee", "created", ids[1], org.id),
+            EntityEvent("employee", "updated", ids[0], org.id),
+            EntityEvent("employee", "deleted", ids[1], org.id),
+            EntityEvent("organisation", "deleted", org.id, org.id),
+        ]
+    
+    def test_moved_employee_reaches_both_organisations(self, test_db_path, sample_employee_data):
+        """Test that moving an employee is published to subscribers of the old and the new organisation."""
+        bus = self._bus()
+        employee_repository = EmployeeRepository(test_db_path)
+        employees = EmployeeService(
+            PublishingRepository(employee_repository, bus, "employee", employee_repository.organisation_ids)
+        )
+        created = employees.create_employee(**{**sample_employee_data, "organisation_id": 1})
+        async def scenario():
+            left = bus.subscribe(organisation_id=1)
+            joined = bus.subscribe(organisation_id=2)
+            employees.update_employee(created.id, organisation_id=2)
+            employees.update_employees([(created.id, {"organisation_id": 3})])
+            return await left.next_batch(0), await joined.next_batch(0)
+        
+        left, joined = asyncio.run(scenario())
+        
+        assert left == [EntityEvent("employee", "updated", created.id, 2, previous_organisation_id=1)]
+        assert joined == left + [EntityEvent("employee", "updated", created.id, 3, previous_organisation_id=2)]
+    
+    def test_no_organisation_lookups_without_subscribers(self, test_db_path, sample_employee_data):
+        """Test that writes do not look up organisations while nobody is listening."""
+        lookups = []
+        employee_repository = EmployeeRepository(test_db_path)
+        employees = EmployeeService(
+            PublishingRepository(employee_repository, self._bus(), "employee", lookups.append)
+        )
+        
+        created = employees.create_employee(**sample_employee_data)
+        employees.update_employee(created.id, organisation_id=2)
+        employees.delete_employee(created.id)
+        
+        assert lookups == []